@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from math import ceil, floor
+import os
+import threading
+
+from crawl_scheduler.utils.loghandler import logger
+
+
+HIGH_CHURN = 0.3
+LOW_CHURN = 0.05
+SHRINK_FACTOR = 0.75
+STRETCH_FACTOR = 1.5
+DEFAULT_MIN_FACTOR = 0.5
+DEFAULT_MAX_FACTOR = 4.0
+
+
+class AdaptiveCrawlIntervals:
+    """Shrink or stretch each site's crawl interval from observed feed churn.
+
+    Churn is reported per completed crawl as a value in ``[0, 1]``: the share
+    of feed entries that were not stored yet, or the average relative change
+    of native metrics, whichever is larger.  A busy feed moves the interval
+    toward ``base * min_factor`` and a quiet one toward ``base * max_factor``.
+
+    ``observe`` may run on crawler worker threads.  Schedule changes are only
+    queued there and applied by ``apply`` on the scheduler thread.
+    """
+
+    def __init__(
+        self,
+        base_intervals: dict[str, int],
+        *,
+        min_factor: float = DEFAULT_MIN_FACTOR,
+        max_factor: float = DEFAULT_MAX_FACTOR,
+    ):
+        if not 0 < min_factor <= 1 <= max_factor:
+            raise ValueError("adaptive interval factors must satisfy 0 < min <= 1 <= max")
+        self.intervals = dict(base_intervals)
+        self.bounds = {
+            site: (
+                max(floor(minutes * min_factor), 1),
+                max(ceil(minutes * max_factor), 1),
+            )
+            for site, minutes in base_intervals.items()
+        }
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, base_intervals: dict[str, int]) -> "AdaptiveCrawlIntervals":
+        return cls(
+            base_intervals,
+            min_factor=_env_factor("CRAWLER_ADAPTIVE_MIN_FACTOR", DEFAULT_MIN_FACTOR),
+            max_factor=_env_factor("CRAWLER_ADAPTIVE_MAX_FACTOR", DEFAULT_MAX_FACTOR),
+        )
+
+    def observe(self, site: str, churn: float) -> int:
+        """Record one crawl's churn and return the site's next interval in minutes."""
+        with self._lock:
+            current = self.intervals[site]
+            lower, upper = self.bounds[site]
+            if churn >= HIGH_CHURN:
+                proposed = floor(current * SHRINK_FACTOR)
+            elif churn <= LOW_CHURN:
+                proposed = ceil(current * STRETCH_FACTOR)
+            else:
+                proposed = current
+            next_interval = min(max(proposed, lower), upper)
+            if next_interval != current:
+                self.intervals[site] = next_interval
+                self._pending[site] = next_interval
+                logger.info(
+                    "Adaptive interval for %s: %d -> %d minutes (churn %.2f)",
+                    site,
+                    current,
+                    next_interval,
+                    churn,
+                )
+            return next_interval
+
+    def apply(self, scheduler) -> None:
+        """Reschedule the site jobs whose interval changed since the last call."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for site, minutes in pending.items():
+            for job in scheduler.get_jobs(f"crawler:{site}"):
+                job.interval = minutes
+                job.next_run = (job.last_run or datetime.now()) + timedelta(
+                    minutes=minutes
+                )
+
+
+def _env_factor(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
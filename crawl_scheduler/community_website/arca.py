@@ -22,13 +22,15 @@ class Arca(PopularCommunityCrawler):
 
     def get_board_entries(self):
         try:
-            soup = self.soup_from_url(self.list_url)
+            return self.feed_entries(self.list_url, self.parse_board_entries)
         except CrawlerThrottledError:
             raise
         except Exception as exc:
             logger.error("Get Arca Live list error: %s", exc)
             return []
 
+    def parse_board_entries(self, response):
+        soup = self.soup_from_response(response)
         entries = []
         crawled_at = self.utc_now()
         for row in soup.select("div.vrow:not(.notice)"):
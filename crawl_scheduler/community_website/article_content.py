@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 import os
 import re
 from typing import Callable, Literal, Mapping
@@ -14,10 +16,17 @@ from crawl_scheduler.crawled_content import (
     text_block,
     video_block,
 )
+from crawl_scheduler.media_probe import (
+    DeferredMediaQueue,
+    get_deferred_media_queue,
+    video_action,
+)
+from crawl_scheduler.media_store import MediaByteBudget
 from crawl_scheduler.utils.loghandler import logger
 
 
 ContentKind = Literal["text", "image", "video"]
+DEFAULT_MEDIA_WORKERS = 4
 BLOCK_TAG_NAMES = {
     "address",
     "article",
@@ -143,17 +152,31 @@ def build_ordered_content_blocks(
     proxies: Mapping[str, str] | None = None,
     save_file: Callable[..., object] | None = None,
     save_videos: bool = True,
+    media_workers: int | None = None,
+    deferred_media: DeferredMediaQueue | None = None,
 ) -> list[dict[str, str]]:
-    """Materialize ordered article parts into the crawler content contract."""
-    blocks: list[dict[str, str]] = []
-    seen_media_urls: set[str] = set()
+    """Materialize ordered article parts into the crawler content contract.
+
+    Media downloads of one article run on up to ``media_workers`` threads
+    (``CRAWLER_MEDIA_WORKERS``, default 4; 1 downloads serially), so the body
+    takes about as long as its slowest file.  Blocks are still assembled in
+    DOM order, and OCR runs afterwards on the calling thread.  All downloads
+    share one ``CRAWLER_MEDIA_MAX_ARTICLE_BYTES`` budget.
+
+    Videos are probed before they are downloaded: large or unsized clips are
+    handed to the deferred media queue and keep only their ``source_url``
+    until the background download attaches a ``media_path``; oversized or
+    non-video responses are not downloaded at all.
+    """
     save_media = save_file or getattr(crawler, "save_file")
+    probe_media = getattr(crawler, "probe_media", None)
+    items: list[tuple[ArticleContentPart, str | None]] = []
+    downloads: dict[str, ArticleContentPart] = {}
+    seen_media_urls: set[str] = set()
 
     for part in ordered_article_content_parts(body):
         if part.kind == "text":
-            block = text_block(part.text)
-            if block:
-                _append_text_block(blocks, block)
+            items.append((part, None))
             continue
 
         media_tag = _source_tag(crawler, part, base_url=base_url)
@@ -165,28 +188,90 @@ def build_ordered_content_blocks(
         if not media_url or media_url in seen_media_urls:
             continue
         seen_media_urls.add(media_url)
+        items.append((part, media_url))
 
-        file_path = None
         is_remote_embed = part.tag is not None and part.tag.name.lower() == "iframe"
-        should_save_media = (
-            not is_remote_embed
-            and (part.kind != "video" or save_videos)
+        if not is_remote_embed and (part.kind != "video" or save_videos):
+            downloads[media_url] = part
+
+    media_budget = MediaByteBudget.for_article()
+
+    def defer(media_url: str) -> None:
+        saved_path = save_media(
+            media_url,
+            category=category,
+            no=no,
+            headers=dict(headers) if headers else None,
+            created_at=created_at,
+            proxies=dict(proxies) if proxies else None,
         )
-        if should_save_media:
-            try:
-                saved_path = save_media(
+        db_controller = getattr(crawler, "db_controller", None)
+        if saved_path and db_controller is not None:
+            query = {"category": category, "no": no}
+            if getattr(crawler, "site", None):
+                query["site"] = crawler.site
+            db_controller.attach_media_path(
+                "Realtime",
+                query,
+                media_url,
+                str(saved_path),
+            )
+
+    def download(media_url: str) -> str | None:
+        if downloads[media_url].kind == "video" and probe_media is not None:
+            action = video_action(
+                probe_media(
                     media_url,
-                    category=category,
-                    no=no,
                     headers=dict(headers) if headers else None,
-                    created_at=created_at,
                     proxies=dict(proxies) if proxies else None,
                 )
-                if saved_path:
-                    file_path = str(saved_path)
-            except Exception as exc:
-                logger.warning("Could not save article media %s: %s", media_url, exc)
+            )
+            if action == "skip":
+                logger.info("Skipped video after probing: %s", media_url)
+                return None
+            if action == "defer":
+                queue = deferred_media or get_deferred_media_queue()
+                if not queue.submit(partial(defer, media_url)):
+                    logger.info("Deferred media queue is full; linking %s", media_url)
+                return None
+
+        try:
+            saved_path = save_media(
+                media_url,
+                category=category,
+                no=no,
+                headers=dict(headers) if headers else None,
+                created_at=created_at,
+                proxies=dict(proxies) if proxies else None,
+                media_budget=media_budget,
+            )
+        except Exception as exc:
+            logger.warning("Could not save article media %s: %s", media_url, exc)
+            return None
+        return str(saved_path) if saved_path else None
+
+    workers = min(
+        media_workers if media_workers is not None else _media_workers(),
+        len(downloads),
+    )
+    if workers > 1:
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="media",
+        ) as executor:
+            file_paths = dict(zip(downloads, executor.map(download, downloads)))
+    else:
+        file_paths = {media_url: download(media_url) for media_url in downloads}
+
+    blocks: list[dict[str, str]] = []
+    for part, media_url in items:
+        if part.kind == "text":
+            block = text_block(part.text)
+            if block:
+                _append_text_block(blocks, block)
+            continue
 
+        file_path = file_paths.get(media_url)
         if part.kind == "video":
             block = video_block(media_path=file_path, source_url=media_url)
         else:
@@ -213,6 +298,13 @@ def build_ordered_content_blocks(
     return blocks
 
 
+def _media_workers() -> int:
+    try:
+        return max(int(os.getenv("CRAWLER_MEDIA_WORKERS", DEFAULT_MEDIA_WORKERS)), 1)
+    except (TypeError, ValueError):
+        return DEFAULT_MEDIA_WORKERS
+
+
 def _source_tag(
     crawler: object, part: ArticleContentPart, *, base_url: str
 ) -> Tag | None:
@@ -1,5 +1,5 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
@@ -67,3 +67,11 @@ class BoardListEntry:
         if self.metrics_crawled_at is not None:
             metrics["metrics_crawled_at"] = self.metrics_crawled_at
         return metrics
+
+
+def with_metrics_crawled_at(entries, metrics_crawled_at: datetime) -> list:
+    """Return copies of parsed feed entries stamped with a new fetch time."""
+    return [
+        replace(entry, metrics_crawled_at=metrics_crawled_at)
+        for entry in entries
+    ]
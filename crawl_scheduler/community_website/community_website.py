@@ -3,18 +3,31 @@ import re
 from abc import ABC, abstractmethod
 from urllib.parse import urljoin, urlparse
 
-import requests
-
 from crawl_scheduler.config import Config
 from crawl_scheduler.crawled_content import is_usable_thumbnail_url
 from crawl_scheduler.ocr import extract_text_from_image
 from crawl_scheduler.media_paths import dated_post_directory
+from crawl_scheduler.media_probe import probe_media_url
+from crawl_scheduler.media_store import (
+    MEDIA_CHUNK_BYTES,
+    MediaTooLargeError,
+    known_media_path,
+    media_file_byte_cap,
+    store_media_stream,
+)
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.utils.loghandler import logger
 
 
+NEW_POST_INSERT_BATCH_SIZE = 20
+
+
 class AbstractCommunityWebsite(ABC):
+    site = ""
     dayBestUrl = ""
     realtimeBestUrl = ""
+    # New posts are inserted in chunks of this size while bodies are fetched.
+    new_post_insert_batch_size = NEW_POST_INSERT_BATCH_SIZE
 
     def __init__(self, yyyymmdd) -> None:
         logger.info("Initializing AbstractCommunityWebsite with date %s", yyyymmdd)
@@ -47,6 +60,64 @@ class AbstractCommunityWebsite(ABC):
     def get_board_list(self):
         pass
 
+    def _save_new_posts(self, documents):
+        """Insert new posts as one batch, or one by one if the batch fails.
+
+        A single document the database rejects then costs only that post
+        instead of every post fetched in the same batch.
+        """
+        if not documents:
+            return
+        try:
+            self.db_controller.insert_many("Realtime", documents)
+            saved = documents
+        except Exception as exc:
+            logger.error(
+                "Error saving %s new posts as a batch, retrying one by one: %s",
+                self.site,
+                exc,
+            )
+            saved = []
+            for document in documents:
+                try:
+                    self.db_controller.insert_one("Realtime", document)
+                except Exception as exc:
+                    logger.error(
+                        "Error saving %s/%s/%s: %s",
+                        self.site,
+                        document["category"],
+                        document["no"],
+                        exc,
+                    )
+                else:
+                    saved.append(document)
+        for document in saved:
+            logger.info(
+                "Post %s/%s/%s inserted successfully",
+                self.site,
+                document["category"],
+                document["no"],
+            )
+
+    def parsed_page(self, url, parse, *, headers=None, use_page_cache=False):
+        """Fetch ``url`` and return ``parse(response)``.
+
+        With ``use_page_cache`` the request is conditional, and a page whose
+        body did not change since it was last fetched returns the previous
+        parse result instead of being parsed again.
+        """
+        if not use_page_cache:
+            response = http_client.get(url, headers=headers)
+            response.raise_for_status()
+            return parse(response)
+
+        page_cache = http_client.get_page_cache()
+        response = http_client.get(
+            url,
+            headers={**(headers or {}), **page_cache.conditional_headers(url)},
+        )
+        return page_cache.parse(self.site, url, response, parse)
+
     def save_file(
         self,
         url,
@@ -56,6 +127,7 @@ class AbstractCommunityWebsite(ABC):
         headers=None,
         created_at=None,
         proxies=None,
+        media_budget=None,
     ):
         try:
             media_url = self.normalize_media_url(url)
@@ -63,73 +135,121 @@ class AbstractCommunityWebsite(ABC):
                 logger.error("Invalid media URL for %s/%s: %s", category, no, url)
                 return False
 
-            if not headers:
-                headers = {"User-Agent": "Mozilla/5.0", "Cache-Control": "no-cache"}
-
-            response = requests.get(
-                media_url,
-                headers=headers,
-                proxies=proxies,
-                stream=True,
-                timeout=10,
-            )
-            child_class_name = self.__class__.__name__
             root_path = Config().get_env("ROOT") or "./media"
             path = dated_post_directory(
                 root_path,
-                child_class_name,
+                self.__class__.__name__,
                 category,
                 no,
                 created_at=created_at,
             )
+            # Content refreshes re-parse the post; media it already has is
+            # reused from the post manifest instead of downloaded again.
+            known_path = known_media_path(root_path, path, media_url)
+            if known_path:
+                return known_path
 
-            logger.info("Saving media from URL: %s", media_url)
-            os.makedirs(path, exist_ok=True)
-
-            file_name = alt_text or self._file_name_from_url(media_url)
-            detected_extension = None
-
-            if response.status_code == 200:
-                content_disposition = response.headers.get("content-Disposition", "")
-                match = re.search(r'filename="?([^";]+)"?', content_disposition)
-                if match:
-                    file_name = match.group(1)
-                detected_extension = self._extension_from_content_type(
-                    response.headers.get("Content-Type")
-                )
-            else:
-                logger.error("Failed to fetch media from %s: %s", media_url, response.status_code)
-                return False
-
-            file_name = self._safe_file_name(file_name)
-            file_name_without_extension, file_extension = os.path.splitext(file_name)
-            if detected_extension and not self._is_known_media_extension(file_extension):
-                file_extension = detected_extension
-                file_name = f"{file_name_without_extension}{file_extension}"
-                file_name_without_extension = os.path.splitext(file_name)[0]
-
-            file_path = os.path.join(path, file_name)
+            if not headers:
+                headers = {"User-Agent": "Mozilla/5.0", "Cache-Control": "no-cache"}
 
-            index = 1
-            while os.path.exists(file_path):
-                file_path = os.path.join(
-                    path, f"{file_name_without_extension}_{index}{file_extension}"
+            response = http_client.get(
+                media_url,
+                headers=headers,
+                proxies=proxies,
+                stream=True,
+            )
+            try:
+                return self._store_response(
+                    response,
+                    media_url,
+                    root_path,
+                    path,
+                    alt_text=alt_text,
+                    media_budget=media_budget,
                 )
-                index += 1
-
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-
-            return os.path.relpath(file_path, root_path)
+            finally:
+                response.close()
 
+        except MediaTooLargeError as e:
+            logger.warning("Skipped media for %s/%s: %s (%s)", category, no, url, e)
+            return False
         except Exception as e:
             logger.error("Failed to save media for %s/%s: %s", category, no, e)
             return False
 
+    def probe_media(self, url, headers=None, proxies=None):
+        media_url = self.normalize_media_url(url)
+        if not media_url:
+            return None
+        if not headers:
+            headers = {"User-Agent": "Mozilla/5.0", "Cache-Control": "no-cache"}
+        return probe_media_url(media_url, headers=headers, proxies=proxies)
+
+    def _store_response(
+        self,
+        response,
+        media_url,
+        root_path,
+        path,
+        *,
+        alt_text=None,
+        media_budget=None,
+    ):
+        logger.info("Saving media from URL: %s", media_url)
+        os.makedirs(path, exist_ok=True)
+
+        file_name = alt_text or self._file_name_from_url(media_url)
+        detected_extension = None
+
+        if response.status_code == 200:
+            content_disposition = response.headers.get("content-Disposition", "")
+            match = re.search(r'filename="?([^";]+)"?', content_disposition)
+            if match:
+                file_name = match.group(1)
+            detected_extension = self._extension_from_content_type(
+                response.headers.get("Content-Type")
+            )
+        else:
+            logger.error("Failed to fetch media from %s: %s", media_url, response.status_code)
+            return False
+
+        # Refuse oversized media from the declared length before reading it.
+        max_bytes = media_file_byte_cap()
+        declared_bytes = self._content_length(response.headers)
+        remaining_bytes = media_budget.remaining() if media_budget is not None else None
+        for cap in (max_bytes, remaining_bytes):
+            if declared_bytes is not None and cap is not None and declared_bytes > cap:
+                raise MediaTooLargeError(f"{declared_bytes} bytes declared, {cap} allowed")
+
+        file_name = self._safe_file_name(file_name)
+        file_name_without_extension, file_extension = os.path.splitext(file_name)
+        if detected_extension and not self._is_known_media_extension(file_extension):
+            file_extension = detected_extension
+            file_name = f"{file_name_without_extension}{file_extension}"
+
+        file_path = store_media_stream(
+            root_path,
+            path,
+            file_name,
+            response.iter_content(chunk_size=MEDIA_CHUNK_BYTES),
+            max_bytes=max_bytes,
+            budget=media_budget,
+            source_url=media_url,
+        )
+
+        return os.path.relpath(file_path, root_path)
+
     def img_to_text(self, img_path, *unused_args):
         logger.info("Extracting image text with OCR from %s", img_path)
         return extract_text_from_image(img_path)
 
+    @staticmethod
+    def _content_length(headers):
+        try:
+            return max(int(headers.get("Content-Length")), 0)
+        except (TypeError, ValueError):
+            return None
+
     @staticmethod
     def _extension_from_content_type(content_type):
         if not content_type:
@@ -1,20 +1,23 @@
 import re
 from bs4 import BeautifulSoup
-import requests
 from datetime import datetime, timezone
+from functools import partial
 from urllib.parse import parse_qs, urljoin, urlparse
 from zoneinfo import ZoneInfo
 from crawl_scheduler.crawled_content import metadata_image_block
 from crawl_scheduler.db.postgres_controller import PostgresController
 from crawl_scheduler.community_website.article_content import build_ordered_content_blocks
 from crawl_scheduler.community_website.community_website import AbstractCommunityWebsite
-from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime
+from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime, with_metrics_crawled_at
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER, SITE_DCINSIDE, DEFAULT_TAG
 import os
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.utils.loghandler import logger
 
 
 class Dcinside(AbstractCommunityWebsite):
+    site = SITE_DCINSIDE
+
     g_headers = [
         {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -29,38 +32,17 @@ class Dcinside(AbstractCommunityWebsite):
         pass
 
     def get_realtime_best(self):
-        already_exists_post = []
         board_entries = self.get_board_entries()
+        try:
+            ingest = self.db_controller.ingest_feed(SITE_DCINSIDE, board_entries)
+        except Exception as e:
+            logger.error(f"Error refreshing {SITE_DCINSIDE} feed metrics: {e}")
+            return False
+        self.feed_churn = ingest.churn
 
-        for entry in board_entries:
+        documents = []
+        for entry in ingest.new_entries:
             try:
-                query = {
-                    'site': SITE_DCINSIDE,
-                    'category': entry.category,
-                    'no': int(entry.no),
-                }
-                if self._post_already_exists(entry.category, entry.no):
-                    self.db_controller.refresh_native_metrics(
-                        'Realtime', query, entry.metrics_dict()
-                    )
-                    if self.db_controller.needs_content_refresh('Realtime', query):
-                        contents = self.get_board_contents(
-                            url=entry.url,
-                            category=entry.category,
-                            no=entry.no,
-                            created_at=entry.created_at,
-                            save_videos=False,
-                        )
-                        self.db_controller.refresh_crawled_content(
-                            'Realtime',
-                            query,
-                            contents,
-                            title=entry.title,
-                            url=entry.url,
-                        )
-                    already_exists_post.append((entry.category, entry.no))
-                    continue
-
                 gpt_obj_id = self.get_gpt_obj((entry.category, entry.no))
                 contents = self.get_board_contents(
                     url=entry.url,
@@ -69,7 +51,7 @@ class Dcinside(AbstractCommunityWebsite):
                     created_at=entry.created_at,
                 )
 
-                document = {
+                documents.append({
                     'site': SITE_DCINSIDE,
                     'category': entry.category,
                     'no': int(entry.no),
@@ -79,13 +61,43 @@ class Dcinside(AbstractCommunityWebsite):
                     'gpt_answer': gpt_obj_id,
                     'contents': contents,
                     **entry.metrics_dict(),
-                }
-                self.db_controller.insert_one('Realtime', document)
-                logger.info(f"Post {(entry.category, entry.no)} inserted successfully")
+                })
+            except Exception as e:
+                logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
+                continue
+            if len(documents) >= self.new_post_insert_batch_size:
+                self._save_new_posts(documents)
+                documents = []
+        self._save_new_posts(documents)
+
+        for entry in ingest.content_refresh_entries:
+            try:
+                contents = self.get_board_contents(
+                    url=entry.url,
+                    category=entry.category,
+                    no=entry.no,
+                    created_at=entry.created_at,
+                    save_videos=False,
+                    use_page_cache=True,
+                )
+                self.db_controller.refresh_crawled_content(
+                    'Realtime',
+                    {
+                        'site': SITE_DCINSIDE,
+                        'category': entry.category,
+                        'no': int(entry.no),
+                    },
+                    contents,
+                    title=entry.title,
+                    url=entry.url,
+                )
             except Exception as e:
                 logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
 
-        logger.info("Already exists post: %s", already_exists_post)
+        logger.info(
+            "Already exists post: %s",
+            [(entry.category, entry.no) for entry in ingest.existing_entries],
+        )
         return True
 
     def get_board_list(self):
@@ -96,19 +108,22 @@ class Dcinside(AbstractCommunityWebsite):
         ]
 
     def get_board_entries(self):
+        url = 'https://gall.dcinside.com/board/lists/?id=dcbest'
+        page_cache = http_client.get_page_cache()
         try:
-            req = requests.get(
-                'https://gall.dcinside.com/board/lists/?id=dcbest',
-                headers=self.g_headers[0],
-                timeout=10,
+            req = http_client.get(
+                url,
+                headers={**self.g_headers[0], **page_cache.conditional_headers(url)},
             )
-            req.raise_for_status()  # Check for HTTP errors
-            html_content = req.text
-            soup = BeautifulSoup(html_content, 'html.parser')
+            board_list = page_cache.parse(SITE_DCINSIDE, url, req, self.parse_board_entries)
         except Exception as e:
             logger.error(f"Get List Error: {e}")
             return []
 
+        return with_metrics_crawled_at(board_list, datetime.now(timezone.utc))
+
+    def parse_board_entries(self, req):
+        soup = BeautifulSoup(req.text, 'html.parser')
         board_list = []
         metrics_crawled_at = datetime.now(timezone.utc)
         tr_elements = soup.select('tr.ub-content')
@@ -216,39 +231,78 @@ class Dcinside(AbstractCommunityWebsite):
         url=None,
         created_at=None,
         save_videos=True,
+        use_page_cache=False,
     ):
         if not url:
             return []
-        content_list = []
+        parse = partial(
+            self.parse_board_contents,
+            url=url,
+            category=category,
+            no=no,
+            created_at=created_at,
+            save_videos=save_videos,
+        )
         try:
-            response = requests.get(url, headers=self.g_headers[0], timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            metadata_block = metadata_image_block(
-                super().metadata_image_url_from_soup(soup, base_url=url)
-            )
-            if metadata_block:
-                content_list.append(metadata_block)
-            board_body = soup.find('div', class_='write_div')
-            if not board_body:
-                return content_list
-            content_list.extend(
-                build_ordered_content_blocks(
-                    self,
-                    board_body,
-                    base_url=url,
-                    category=category,
-                    no=no,
-                    created_at=created_at,
-                    headers=self.g_headers[0],
-                    save_file=super().save_file,
-                    save_videos=save_videos,
-                )
+            return self.parsed_page(
+                url,
+                parse,
+                headers=self.g_headers[0],
+                use_page_cache=use_page_cache,
             )
         except Exception as e:
             logger.error(f"Error fetching board contents for {no if no else url}: {e}")
+            return []
 
+    def parse_board_contents(
+        self,
+        response,
+        *,
+        url,
+        category=None,
+        no=None,
+        created_at=None,
+        save_videos=True,
+    ):
+        content_list = []
+        soup = BeautifulSoup(response.text, 'html.parser')
+        metadata_block = metadata_image_block(
+            self.metadata_image_url_from_soup(soup, base_url=url)
+        )
+        if metadata_block:
+            content_list.append(metadata_block)
+        board_body = soup.find('div', class_='write_div')
+        if not board_body:
+            return content_list
+        content_list.extend(
+            build_ordered_content_blocks(
+                self,
+                board_body,
+                base_url=url,
+                category=category,
+                no=no,
+                created_at=created_at,
+                headers=self.g_headers[0],
+                save_file=self.save_file,
+                save_videos=save_videos,
+            )
+        )
         return content_list
+
+    def fetch_post_metrics(self, post):
+        """ 게시글 본문 페이지에서 댓글·추천·조회 수만 다시 읽음 """
+        response = http_client.get(post['url'], headers=self.g_headers[0])
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+        metrics = {
+            'native_comment_count': parse_native_count(soup.select_one('.gall_comment')),
+            'native_like_count': parse_native_count(soup.select_one('.gall_reply_num')),
+            'native_view_count': parse_native_count(soup.select_one('.gall_count')),
+        }
+        if all(value is None for value in metrics.values()):
+            return None
+        metrics['metrics_crawled_at'] = datetime.now(timezone.utc)
+        return metrics
         
     def set_driver_options(self):
         logger.info("Setting up Chrome driver options for Selenium")
@@ -321,8 +375,7 @@ class Dcinside(AbstractCommunityWebsite):
 
     def _post_exists(self, board_id):
         logger.debug(f"Checking if post {board_id} exists in DB")
-        existing_instance = self.db_controller.find('Realtime', {'board_id': board_id, 'site': SITE_DCINSIDE})
-        return existing_instance is not None
+        return self.db_controller.exists('Realtime', {'board_id': board_id, 'site': SITE_DCINSIDE})
 
     def _get_or_create_gpt_obj_id(self, board_id):
         logger.debug(f"Fetching or creating GPT object for post {board_id}")
@@ -362,5 +415,4 @@ class Dcinside(AbstractCommunityWebsite):
         return False
 
     def _post_already_exists(self, category, no):
-        existing_instance = self.db_controller.find('Realtime', {'site': SITE_DCINSIDE, 'category': category, 'no': int(no)})
-        return existing_instance
+        return self.db_controller.exists('Realtime', {'site': SITE_DCINSIDE, 'category': category, 'no': int(no)})
@@ -1,6 +1,6 @@
 import re
 from bs4 import BeautifulSoup
-import requests
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.db.postgres_controller import PostgresController
 from crawl_scheduler.community_website.community_website import AbstractCommunityWebsite
 from datetime import datetime
@@ -40,7 +40,7 @@ class Instiz(AbstractCommunityWebsite):
         logger.info("Fetching real-time best posts from Instiz")
         _url = "https://www.instiz.net/"
         try:
-            response = requests.get(_url)
+            response = http_client.get(_url)
             response.raise_for_status()  # Check for HTTP errors
             soup = BeautifulSoup(response.text, 'html.parser')
             already_exists_post = []
@@ -98,7 +98,7 @@ class Instiz(AbstractCommunityWebsite):
     def extract_time(self, url):
         logger.debug(f"Extracting time from URL: {url}")
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             return soup.find('span', {'itemprop': 'datePublished'}).get('content')
@@ -118,7 +118,7 @@ class Instiz(AbstractCommunityWebsite):
         content_list = []
         if daily_instance:
             try:
-                response = requests.get(daily_instance[0]['url'], headers=headers)
+                response = http_client.get(daily_instance[0]['url'], headers=headers)
                 response.raise_for_status()
                 soup = BeautifulSoup(response.text, 'lxml')
                 board_body = soup.find('div', class_='memo_content')
@@ -151,7 +151,7 @@ class Instiz(AbstractCommunityWebsite):
             if not os.path.exists(self.download_path):
                 os.makedirs(self.download_path)
 
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             img_name = os.path.basename(url)
             img_path = os.path.join(self.download_path, img_name)
@@ -1,7 +1,7 @@
 from datetime import datetime
 import os
 from bs4 import BeautifulSoup
-import requests
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.db.postgres_controller import PostgresController
 from crawl_scheduler.services.web_crawling.community_website.community_website import AbstractCommunityWebsite
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER, SITE_NATE, DEFAULT_TAG
@@ -48,7 +48,7 @@ class NatePan(AbstractCommunityWebsite):
     def get_realtime_best(self):
         logger.info("Fetching real-time best posts from NatePan")
         try:
-            req = requests.get('https://pann.nate.com/', headers=self.g_headers[0])
+            req = http_client.get('https://pann.nate.com/', headers=self.g_headers[0])
             req.raise_for_status()
             html_content = req.text
             soup = BeautifulSoup(html_content, 'html.parser')
@@ -101,7 +101,7 @@ class NatePan(AbstractCommunityWebsite):
 
         _url = "https://NatePan.net/hot/" + board_id
         try:
-            req = requests.get(_url, headers=self.g_headers[0])
+            req = http_client.get(_url, headers=self.g_headers[0])
             req.raise_for_status()
             html_content = req.text
             soup = BeautifulSoup(html_content, 'html.parser')
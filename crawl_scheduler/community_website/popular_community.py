@@ -1,19 +1,20 @@
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
+from functools import partial
 from math import ceil
-import os
 import time
 
-import requests
 from bs4 import BeautifulSoup
 
 from crawl_scheduler.community_website.article_content import (
     build_ordered_content_blocks,
 )
+from crawl_scheduler.community_website.board_list_entry import with_metrics_crawled_at
 from crawl_scheduler.community_website.community_website import AbstractCommunityWebsite
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER
 from crawl_scheduler.crawled_content import metadata_image_block
 from crawl_scheduler.db.postgres_controller import PostgresController
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.utils.loghandler import logger
 
 
@@ -60,7 +61,6 @@ def retry_after_seconds(response):
 class PopularCommunityCrawler(AbstractCommunityWebsite):
     """Common persistence and article-body handling for popular feeds."""
 
-    site = ""
     body_selectors = ()
     request_delay_seconds = 0.0
     _cooldown_until_by_site = {}
@@ -72,7 +72,6 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
         return None
 
     def get_realtime_best(self):
-        existing_posts = []
         try:
             board_entries = self.get_board_entries()
         except CrawlerThrottledError as exc:
@@ -82,68 +81,88 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
             logger.error("%s popular feed returned no posts", self.site)
             return False
 
-        for entry in board_entries:
-            query = {"site": self.site, "category": entry.category, "no": int(entry.no)}
-            try:
-                if self.db_controller.find("Realtime", query):
-                    self.db_controller.refresh_native_metrics(
-                        "Realtime", query, entry.metrics_dict()
+        try:
+            ingest = self.db_controller.ingest_feed(self.site, board_entries)
+        except Exception as exc:
+            logger.error("Error refreshing %s feed metrics: %s", self.site, exc)
+            return False
+        self.feed_churn = ingest.churn
+
+        documents = []
+        completed = True
+        try:
+            for entry in ingest.new_entries:
+                try:
+                    if self.request_delay_seconds:
+                        time.sleep(self.request_delay_seconds)
+                    contents = self.get_board_contents(
+                        url=entry.url,
+                        category=entry.category,
+                        no=entry.no,
+                        created_at=entry.created_at,
+                    )
+                except CrawlerThrottledError:
+                    raise
+                except Exception as exc:
+                    logger.error(
+                        "Error saving %s/%s/%s: %s", self.site, entry.category, entry.no, exc
                     )
-                    if self.db_controller.needs_content_refresh("Realtime", query):
-                        if self.request_delay_seconds:
-                            time.sleep(self.request_delay_seconds)
-                        contents = self.get_board_contents(
-                            url=entry.url,
-                            category=entry.category,
-                            no=entry.no,
-                            created_at=entry.created_at,
-                            save_videos=False,
-                        )
-                        self.db_controller.refresh_crawled_content(
-                            "Realtime",
-                            query,
-                            contents,
-                            title=entry.title,
-                            url=entry.url,
-                        )
-                    existing_posts.append((entry.category, entry.no))
                     continue
-
-                if self.request_delay_seconds:
-                    time.sleep(self.request_delay_seconds)
-                contents = self.get_board_contents(
-                    url=entry.url,
-                    category=entry.category,
-                    no=entry.no,
-                    created_at=entry.created_at,
-                )
-                self.db_controller.insert_one(
-                    "Realtime",
+                documents.append(
                     {
-                        **query,
+                        "site": self.site,
+                        "category": entry.category,
+                        "no": int(entry.no),
                         "title": entry.title,
                         "url": entry.url,
                         "create_time": entry.created_at,
                         "gpt_answer": DEFAULT_GPT_ANSWER,
                         "contents": contents,
                         **entry.metrics_dict(),
-                    },
-                )
-                logger.info(
-                    "Post %s/%s/%s inserted successfully",
-                    self.site,
-                    entry.category,
-                    entry.no,
+                    }
                 )
-            except CrawlerThrottledError as exc:
-                logger.warning("%s; stopping this crawl cycle", exc)
-                return False
-            except Exception as exc:
-                logger.error(
-                    "Error saving %s/%s/%s: %s", self.site, entry.category, entry.no, exc
-                )
-        logger.info({f"{self.site} already exists": existing_posts})
-        return True
+                if len(documents) >= self.new_post_insert_batch_size:
+                    self._save_new_posts(documents)
+                    documents = []
+
+            for entry in ingest.content_refresh_entries:
+                try:
+                    if self.request_delay_seconds:
+                        time.sleep(self.request_delay_seconds)
+                    contents = self.get_board_contents(
+                        url=entry.url,
+                        category=entry.category,
+                        no=entry.no,
+                        created_at=entry.created_at,
+                        save_videos=False,
+                        use_page_cache=True,
+                    )
+                    self.db_controller.refresh_crawled_content(
+                        "Realtime",
+                        {"site": self.site, "category": entry.category, "no": int(entry.no)},
+                        contents,
+                        title=entry.title,
+                        url=entry.url,
+                    )
+                except CrawlerThrottledError:
+                    raise
+                except Exception as exc:
+                    logger.error(
+                        "Error saving %s/%s/%s: %s", self.site, entry.category, entry.no, exc
+                    )
+        except CrawlerThrottledError as exc:
+            logger.warning("%s; stopping this crawl cycle", exc)
+            completed = False
+
+        self._save_new_posts(documents)
+        logger.info(
+            {
+                f"{self.site} already exists": [
+                    (entry.category, entry.no) for entry in ingest.existing_entries
+                ]
+            }
+        )
+        return completed
 
     def get_board_list(self):
         return [
@@ -158,20 +177,48 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
         url=None,
         created_at=None,
         save_videos=True,
+        use_page_cache=False,
     ):
         if not url:
             return []
+        parse = partial(
+            self.parse_board_contents,
+            url=url,
+            category=category,
+            no=no,
+            created_at=created_at,
+            save_videos=save_videos,
+        )
+        page_cache = http_client.get_page_cache()
         try:
-            response = self.get_response(url)
-            response.raise_for_status()
-            html = getattr(response, "content", None) or response.text
-            soup = BeautifulSoup(html, "html.parser")
+            if use_page_cache:
+                response = self.get_response(
+                    url,
+                    headers=page_cache.conditional_headers(url),
+                )
+            else:
+                response = self.get_response(url)
+                response.raise_for_status()
         except CrawlerThrottledError:
             raise
         except Exception as exc:
             logger.error("Error fetching %s body %s: %s", self.site, url, exc)
             return []
+        if use_page_cache:
+            return page_cache.parse(self.site, url, response, parse)
+        return parse(response)
 
+    def parse_board_contents(
+        self,
+        response,
+        *,
+        url,
+        category=None,
+        no=None,
+        created_at=None,
+        save_videos=True,
+    ):
+        soup = self.soup_from_response(response)
         body = next(
             (
                 selected_body
@@ -209,8 +256,15 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
     def is_ad(self, title=None):
         return False
 
+    def feed_entries(self, url, parse):
+        """Fetch a feed page conditionally and parse it only when its body changed."""
+        page_cache = http_client.get_page_cache()
+        response = self.get_response(url, headers=page_cache.conditional_headers(url))
+        entries = page_cache.parse(self.site, url, response, parse)
+        return with_metrics_crawled_at(entries, self.utc_now())
+
     @classmethod
-    def get_response(cls, url):
+    def get_response(cls, url, headers=None):
         cooldown_remaining = cls.cooldown_remaining_seconds()
         if cooldown_remaining:
             raise CrawlerThrottledError(
@@ -219,11 +273,10 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
                 "cooldown",
                 cooldown_remaining,
             )
-        response = requests.get(
+        response = http_client.get(
             url,
-            headers=BROWSER_HEADERS,
+            headers={**BROWSER_HEADERS, **(headers or {})},
             proxies=cls.request_proxies(),
-            timeout=15,
         )
         if getattr(response, "status_code", None) in {429, 430}:
             retry_seconds = retry_after_seconds(response)
@@ -240,6 +293,10 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
     def soup_from_url(cls, url):
         response = cls.get_response(url)
         response.raise_for_status()
+        return cls.soup_from_response(response)
+
+    @staticmethod
+    def soup_from_response(response):
         html = getattr(response, "content", None) or response.text
         return BeautifulSoup(html, "html.parser")
 
@@ -258,7 +315,4 @@ class PopularCommunityCrawler(AbstractCommunityWebsite):
 
     @staticmethod
     def request_proxies():
-        proxy_url = os.getenv("CRAWLER_HTTP_PROXY", "").strip()
-        if not proxy_url:
-            return None
-        return {"http": proxy_url, "https": proxy_url}
+        return http_client.crawler_proxies()
@@ -1,17 +1,20 @@
 import re
 from bs4 import BeautifulSoup
-import requests
 from datetime import datetime, timezone
+from functools import partial
 from zoneinfo import ZoneInfo
 from crawl_scheduler.crawled_content import metadata_image_block
-from crawl_scheduler.db.postgres_controller import PostgresController
+from crawl_scheduler.db.postgres_controller import FeedIngestResult, PostgresController
 from crawl_scheduler.community_website.article_content import build_ordered_content_blocks
 from crawl_scheduler.community_website.community_website import AbstractCommunityWebsite
-from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime
+from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime, with_metrics_crawled_at
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER, SITE_PPOMPPU, DEFAULT_TAG
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.utils.loghandler import logger
 
 class Ppomppu(AbstractCommunityWebsite):
+    site = SITE_PPOMPPU
+
     def __init__(self):
         self.db_controller = PostgresController()
         self.debugging_mode = False
@@ -21,7 +24,6 @@ class Ppomppu(AbstractCommunityWebsite):
 
     def get_realtime_best(self, category=None, no=None):
         domain = "https://ppomppu.co.kr"
-        already_exists_post = []
         board_entries = self.get_board_entries()
         
         if category and no:
@@ -41,37 +43,23 @@ class Ppomppu(AbstractCommunityWebsite):
                 )
             ]
 
-        for entry in board_entries:
+        if self.debugging_mode:
+            ingest = FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(board_entries),
+                content_refresh_entries=[],
+            )
+        else:
+            try:
+                ingest = self.db_controller.ingest_feed(SITE_PPOMPPU, board_entries)
+            except Exception as e:
+                logger.error(f"Error refreshing {SITE_PPOMPPU} feed metrics: {e}")
+                return False
+            self.feed_churn = ingest.churn
+
+        documents = []
+        for entry in ingest.new_entries:
             try:
-                query = {
-                    'site': SITE_PPOMPPU,
-                    'category': entry.category,
-                    'no': int(entry.no),
-                }
-                if self._post_already_exists(entry.category, entry.no) and self.debugging_mode == False:
-                    self.db_controller.refresh_native_metrics(
-                        'Realtime', query, entry.metrics_dict()
-                    )
-                    if self.db_controller.needs_content_refresh('Realtime', query):
-                        contents = self.get_board_contents(
-                            url=domain + entry.url,
-                            category=entry.category,
-                            no=entry.no,
-                            save_videos=False,
-                        )
-                        self.db_controller.refresh_crawled_content(
-                            'Realtime',
-                            query,
-                            contents,
-                            title=entry.title,
-                            url=domain + entry.url,
-                        )
-                    already_exists_post.append((entry.category, entry.no))
-                    continue
-                
-                # if category == "freeboard":
-                #     logger.warn("Freeboard ========================================")
-                    
                 gpt_obj_id = self.get_gpt_obj((entry.category, entry.no))
                 contents = self.get_board_contents(
                     url=domain + entry.url,
@@ -79,7 +67,7 @@ class Ppomppu(AbstractCommunityWebsite):
                     no=entry.no,
                 )
 
-                document = {
+                documents.append({
                     'site': SITE_PPOMPPU,
                     'category': entry.category,
                     'no': int(entry.no),
@@ -89,13 +77,43 @@ class Ppomppu(AbstractCommunityWebsite):
                     'gpt_answer': gpt_obj_id,
                     'contents': contents,
                     **entry.metrics_dict(),
-                }
-                self.db_controller.insert_one('Realtime', document)
-                logger.info(f"Post {(entry.category, entry.no)} inserted successfully")
+                })
+            except Exception as e:
+                logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
+                continue
+            if len(documents) >= self.new_post_insert_batch_size:
+                self._save_new_posts(documents)
+                documents = []
+        self._save_new_posts(documents)
+
+        for entry in ingest.content_refresh_entries:
+            try:
+                contents = self.get_board_contents(
+                    url=domain + entry.url,
+                    category=entry.category,
+                    no=entry.no,
+                    save_videos=False,
+                    use_page_cache=True,
+                )
+                self.db_controller.refresh_crawled_content(
+                    'Realtime',
+                    {
+                        'site': SITE_PPOMPPU,
+                        'category': entry.category,
+                        'no': int(entry.no),
+                    },
+                    contents,
+                    title=entry.title,
+                    url=domain + entry.url,
+                )
             except Exception as e:
                 logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
 
-        logger.info({"already exists post": already_exists_post})
+        logger.info({
+            "already exists post": [
+                (entry.category, entry.no) for entry in ingest.existing_entries
+            ]
+        })
         return True
 
     def get_board_list(self):
@@ -108,15 +126,22 @@ class Ppomppu(AbstractCommunityWebsite):
     def get_board_entries(self):
         url = "https://www.ppomppu.co.kr/hot.php?id=&page=1&category=999"
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'}
-        now = datetime.now(ZoneInfo('Asia/Seoul'))
+        page_cache = http_client.get_page_cache()
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = http_client.get(
+                url,
+                headers={**headers, **page_cache.conditional_headers(url)},
+            )
+            board_list = page_cache.parse(SITE_PPOMPPU, url, response, self.parse_board_entries)
         except Exception as e:
             logger.error(f"Get List Error: {e}")
             return []
 
+        return with_metrics_crawled_at(board_list, datetime.now(timezone.utc))
+
+    def parse_board_entries(self, response):
+        now = datetime.now(ZoneInfo('Asia/Seoul'))
+        soup = BeautifulSoup(response.text, 'html.parser')
         board_list = []
         metrics_crawled_at = datetime.now(timezone.utc)
 
@@ -217,42 +242,66 @@ class Ppomppu(AbstractCommunityWebsite):
         no=None,
         url=None,
         save_videos=True,
+        use_page_cache=False,
     ):
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'}
-        content_list = []
-        if url:
-            try:
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'lxml')
-                metadata_block = metadata_image_block(
-                    super().metadata_image_url_from_soup(soup, base_url=url)
-                )
-                if metadata_block:
-                    content_list.append(metadata_block)
-                board_body = soup.find('td', class_='board-contents')
-                if not board_body:
-                    return content_list
-                content_list.extend(
-                    build_ordered_content_blocks(
-                        self,
-                        board_body,
-                        base_url=url,
-                        category=category,
-                        no=no,
-                        headers=headers,
-                        save_file=super().save_file,
-                        save_videos=save_videos,
-                    )
-                )
-            except Exception as e:
-                logger.error(f"Error fetching board contents for {no if no else url}: {e}")
+        if not url:
+            return []
+        parse = partial(
+            self.parse_board_contents,
+            url=url,
+            category=category,
+            no=no,
+            headers=headers,
+            save_videos=save_videos,
+        )
+        try:
+            return self.parsed_page(
+                url,
+                parse,
+                headers=headers,
+                use_page_cache=use_page_cache,
+            )
+        except Exception as e:
+            logger.error(f"Error fetching board contents for {no if no else url}: {e}")
+            return []
 
+    def parse_board_contents(
+        self,
+        response,
+        *,
+        url,
+        category=None,
+        no=None,
+        headers=None,
+        save_videos=True,
+    ):
+        content_list = []
+        soup = BeautifulSoup(response.text, 'lxml')
+        metadata_block = metadata_image_block(
+            self.metadata_image_url_from_soup(soup, base_url=url)
+        )
+        if metadata_block:
+            content_list.append(metadata_block)
+        board_body = soup.find('td', class_='board-contents')
+        if not board_body:
+            return content_list
+        content_list.extend(
+            build_ordered_content_blocks(
+                self,
+                board_body,
+                base_url=url,
+                category=category,
+                no=no,
+                headers=headers,
+                save_file=self.save_file,
+                save_videos=save_videos,
+            )
+        )
         return content_list
 
     def _post_already_exists(self, category, no):
-        existing_instance = self.db_controller.find('Realtime', {'site': SITE_PPOMPPU, 'category': category, 'no': int(no)})
-        return existing_instance
+        return self.db_controller.exists('Realtime', {'site': SITE_PPOMPPU, 'category': category, 'no': int(no)})
 
     def get_gpt_obj(self, board_id):
         gpt_exists = self.db_controller.find('GPT', {'board_id': board_id, 'site': SITE_PPOMPPU})
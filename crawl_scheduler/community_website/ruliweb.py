@@ -1,6 +1,6 @@
 import re
 from bs4 import BeautifulSoup
-import requests
+from crawl_scheduler.utils import http_client
 from datetime import datetime
 from crawl_scheduler.utils.loghandler import catch_exception
 import sys
@@ -41,7 +41,7 @@ class Ruliweb(AbstractCommunityWebsite):
         num = 1
         _url = "https://bbs.ruliweb.com/best/humor_only/now?orderby=best_id&range=24h"
         try:
-            response = requests.get(_url)
+            response = http_client.get(_url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
         except Exception as e:
@@ -97,7 +97,7 @@ class Ruliweb(AbstractCommunityWebsite):
         num = 1
         _url = "https://bbs.ruliweb.com/best/humor_only/now?orderby=best_id&range=all"
         try:
-            response = requests.get(_url)
+            response = http_client.get(_url)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
         except Exception as e:
@@ -154,7 +154,7 @@ class Ruliweb(AbstractCommunityWebsite):
         content_list = []
         if daily_instance:
             try:
-                response = requests.get(daily_instance[0]['url'], headers=headers)
+                response = http_client.get(daily_instance[0]['url'], headers=headers)
                 response.raise_for_status()
                 soup = BeautifulSoup(response.text, 'lxml')
                 board_body = soup.find('td', class_='board-contents')
@@ -186,7 +186,7 @@ class Ruliweb(AbstractCommunityWebsite):
             os.makedirs(self.download_path)
 
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             img_name = os.path.basename(url)
 
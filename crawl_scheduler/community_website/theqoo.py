@@ -2,8 +2,6 @@ from datetime import datetime
 from urllib.parse import urljoin, urlparse
 from zoneinfo import ZoneInfo
 
-from bs4 import BeautifulSoup
-
 from crawl_scheduler.community_website.board_list_entry import (
     BoardListEntry,
     parse_native_count,
@@ -29,16 +27,15 @@ class Theqoo(PopularCommunityCrawler):
 
     def get_board_entries(self):
         try:
-            response = self.get_response(self.list_url)
-            response.raise_for_status()
-            html = getattr(response, "content", None) or response.text
-            soup = BeautifulSoup(html, "html.parser")
+            return self.feed_entries(self.list_url, self.parse_board_entries)
         except CrawlerThrottledError:
             raise
         except Exception as exc:
             logger.error("Get Theqoo HOT list error: %s", exc)
             return []
 
+    def parse_board_entries(self, response):
+        soup = self.soup_from_response(response)
         entries = []
         crawled_at = self.utc_now()
         now = datetime.now(ZoneInfo("Asia/Seoul"))
@@ -1,23 +1,26 @@
 from datetime import datetime, timezone
+from functools import partial
 from typing import Tuple
 from bs4 import BeautifulSoup
-import requests
 from crawl_scheduler.crawled_content import metadata_image_block
 from crawl_scheduler.db.postgres_controller import PostgresController
 from crawl_scheduler.community_website.article_content import build_ordered_content_blocks
 from crawl_scheduler.community_website.community_website import AbstractCommunityWebsite
-from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime
+from crawl_scheduler.community_website.board_list_entry import BoardListEntry, parse_native_count, recent_source_datetime, with_metrics_crawled_at
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER, SITE_YGOSU, DEFAULT_TAG
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.utils.loghandler import logger
 
 class Ygosu(AbstractCommunityWebsite):
+    site = SITE_YGOSU
+
     def __init__(self):
         self.db_controller = PostgresController()
 
     def get_daily_best(self):
         logger.info("Fetching daily best posts from Ygosu")
         try:
-            req = requests.get('https://ygosu.com/board/best_article/?type=daily')
+            req = http_client.get('https://ygosu.com/board/best_article/?type=daily')
             req.raise_for_status()
             soup = BeautifulSoup(req.text, 'html.parser')
         except Exception as e:
@@ -69,41 +72,22 @@ class Ygosu(AbstractCommunityWebsite):
         logger.info({"already exists post": already_exists_post})
 
     def get_realtime_best(self):
-        already_exists_post = []
         board_entries = self.get_board_entries()
-        for entry in board_entries:
-            try:
-                query = {
-                    'site': SITE_YGOSU,
-                    'category': entry.category,
-                    'no': int(entry.no),
-                }
-                if self._post_already_exists(entry.category, entry.no, 'Realtime'):
-                    self.db_controller.refresh_native_metrics(
-                        'Realtime', query, entry.metrics_dict()
-                    )
-                    if self.db_controller.needs_content_refresh('Realtime', query):
-                        contents = self.get_board_contents(
-                            url=entry.url,
-                            category=entry.category,
-                            no=entry.no,
-                            save_videos=False,
-                        )
-                        self.db_controller.refresh_crawled_content(
-                            'Realtime',
-                            query,
-                            contents,
-                            title=entry.title,
-                            url=entry.url,
-                        )
-                    already_exists_post.append((entry.category, entry.no))
-                    continue
+        try:
+            ingest = self.db_controller.ingest_feed(SITE_YGOSU, board_entries)
+        except Exception as e:
+            logger.error(f"Error refreshing {SITE_YGOSU} feed metrics: {e}")
+            return False
+        self.feed_churn = ingest.churn
 
+        documents = []
+        for entry in ingest.new_entries:
+            try:
                 gpt_obj_id = self.get_gpt_obj((entry.category, entry.no))
                 contents = self.get_board_contents(
                     url=entry.url, category=entry.category, no=entry.no
                 )
-                document = {
+                documents.append({
                     'site': SITE_YGOSU,
                     'category': entry.category,
                     'no': int(entry.no),
@@ -113,14 +97,43 @@ class Ygosu(AbstractCommunityWebsite):
                     'gpt_answer': gpt_obj_id,
                     'contents': contents,
                     **entry.metrics_dict(),
-                }
-                self.db_controller.insert_one('Realtime', document)
-                logger.info(f"Inserted Success: {(entry.category, entry.no)} ")
+                })
             except Exception as e:
                 logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
-                return False
+                continue
+            if len(documents) >= self.new_post_insert_batch_size:
+                self._save_new_posts(documents)
+                documents = []
+        self._save_new_posts(documents)
 
-        logger.info({"already exists post": already_exists_post})
+        for entry in ingest.content_refresh_entries:
+            try:
+                contents = self.get_board_contents(
+                    url=entry.url,
+                    category=entry.category,
+                    no=entry.no,
+                    save_videos=False,
+                    use_page_cache=True,
+                )
+                self.db_controller.refresh_crawled_content(
+                    'Realtime',
+                    {
+                        'site': SITE_YGOSU,
+                        'category': entry.category,
+                        'no': int(entry.no),
+                    },
+                    contents,
+                    title=entry.title,
+                    url=entry.url,
+                )
+            except Exception as e:
+                logger.error(f"Error Save To DB {entry.category, entry.no}: {e}")
+
+        logger.info({
+            "already exists post": [
+                (entry.category, entry.no) for entry in ingest.existing_entries
+            ]
+        })
 
         return True
 
@@ -130,38 +143,55 @@ class Ygosu(AbstractCommunityWebsite):
         no=None,
         url=None,
         save_videos=True,
+        use_page_cache=False,
     ):
-        content_list = []
-        if url:
-            try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                metadata_block = metadata_image_block(
-                    super().metadata_image_url_from_soup(soup, base_url=url)
-                )
-                if metadata_block:
-                    content_list.append(metadata_block)
-                board_body = soup.find('div', class_='container')
-                if not board_body:
-                    return content_list
-                content_list.extend(
-                    build_ordered_content_blocks(
-                        self,
-                        board_body,
-                        base_url=url,
-                        category=category,
-                        no=no,
-                        save_file=super().save_file,
-                        save_videos=save_videos,
-                    )
-                )
-            
-            except Exception as e:
-                logger.error(f"Error fetching board contents for {no}: {e}")
+        if not url:
+            return []
+        parse = partial(
+            self.parse_board_contents,
+            url=url,
+            category=category,
+            no=no,
+            save_videos=save_videos,
+        )
+        try:
+            return self.parsed_page(url, parse, use_page_cache=use_page_cache)
+        except Exception as e:
+            logger.error(f"Error fetching board contents for {no}: {e}")
+            return []
 
+    def parse_board_contents(
+        self,
+        response,
+        *,
+        url,
+        category=None,
+        no=None,
+        save_videos=True,
+    ):
+        content_list = []
+        soup = BeautifulSoup(response.content, 'html.parser')
+        metadata_block = metadata_image_block(
+            self.metadata_image_url_from_soup(soup, base_url=url)
+        )
+        if metadata_block:
+            content_list.append(metadata_block)
+        board_body = soup.find('div', class_='container')
+        if not board_body:
+            return content_list
+        content_list.extend(
+            build_ordered_content_blocks(
+                self,
+                board_body,
+                base_url=url,
+                category=category,
+                no=no,
+                save_file=self.save_file,
+                save_videos=save_videos,
+            )
+        )
         return content_list
-    
+
     def get_category_and_no(self, url) -> Tuple[str, int]:
         parts = url.split('/')
         no = parts[-2]
@@ -177,15 +207,20 @@ class Ygosu(AbstractCommunityWebsite):
         ]
 
     def get_board_entries(self):
-        board_list = []
+        url = 'https://ygosu.com/board/real_article'
+        page_cache = http_client.get_page_cache()
         try:
-            req = requests.get('https://ygosu.com/board/real_article', timeout=10)
-            req.raise_for_status()
-            soup = BeautifulSoup(req.text, 'html.parser')
+            req = http_client.get(url, headers=page_cache.conditional_headers(url))
+            board_list = page_cache.parse(SITE_YGOSU, url, req, self.parse_board_entries)
         except Exception as e:
             logger.error(f"Get List Error: {e}")
             return []
 
+        return with_metrics_crawled_at(board_list, datetime.now(timezone.utc))
+
+    def parse_board_entries(self, req):
+        board_list = []
+        soup = BeautifulSoup(req.text, 'html.parser')
         metrics_crawled_at = datetime.now(timezone.utc)
         for tr in soup.find_all('tr'):
             tit_element = tr.select_one('.tit a')
@@ -229,11 +264,11 @@ class Ygosu(AbstractCommunityWebsite):
         # 호환성 유지: (board_id, 'Daily') 또는 (category, no, 'Realtime') 모두 지원
         if arg3 is None:
             board_id, collection = arg1, arg2
-            existing_instance = self.db_controller.find(collection, {'board_id': board_id, 'site': SITE_YGOSU})
+            query = {'board_id': board_id, 'site': SITE_YGOSU}
         else:
             category, no, collection = arg1, arg2, arg3
-            existing_instance = self.db_controller.find(collection, {'site': SITE_YGOSU, 'category': category, 'no': int(no)})
-        return existing_instance
+            query = {'site': SITE_YGOSU, 'category': category, 'no': int(no)}
+        return self.db_controller.exists(collection, query)
 
     def get_gpt_obj(self, board_id):
         gpt_exists = self.db_controller.find('GPT', {'board_id': board_id, 'site': SITE_YGOSU})
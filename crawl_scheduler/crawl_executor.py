@@ -0,0 +1,61 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+from crawl_scheduler.utils.loghandler import logger
+
+
+class SiteCrawlExecutor:
+    """Run scheduled jobs on a bounded pool without overlapping one key.
+
+    Each scheduled site job is submitted under its own key.  A key that is
+    still running is skipped instead of queued, so one slow site can neither
+    block the other sites nor pile up duplicate runs of itself.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="crawler",
+        )
+        self._running: set[str] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, function, *args, **kwargs) -> Future | None:
+        with self._lock:
+            if key in self._running:
+                logger.warning("Skipping %s; the previous run is still in progress", key)
+                return None
+            self._running.add(key)
+
+        try:
+            future = self._executor.submit(function, *args, **kwargs)
+        except Exception:
+            self._release(key)
+            raise
+        future.add_done_callback(lambda completed: self._finish(key, completed))
+        return future
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._running
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _finish(self, key: str, future: Future) -> None:
+        self._release(key)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(
+                "Error - scheduled job %s: %s",
+                key,
+                error,
+                exc_info=(type(error), error, error.__traceback__),
+            )
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._running.discard(key)
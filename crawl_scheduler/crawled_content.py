@@ -38,6 +38,8 @@ def image_block(
     source_url: object = None,
     text: object = None,
     alt_text: object = None,
+    thumbnail_path: object = None,
+    webp_path: object = None,
 ) -> dict[str, str] | None:
     return _media_block(
         "image",
@@ -45,6 +47,8 @@ def image_block(
         source_url=source_url,
         text=text,
         alt_text=alt_text,
+        thumbnail_path=thumbnail_path,
+        webp_path=webp_path,
     )
 
 
@@ -131,6 +135,8 @@ def normalize_content_block(value: object) -> dict[str, str] | None:
             source_url=value.get("source_url") or value.get("url"),
             text=_first_text(value, "text", "content"),
             alt_text=value.get("alt_text") or value.get("alt"),
+            thumbnail_path=value.get("thumbnail_path"),
+            webp_path=value.get("webp_path"),
         )
 
     if block_type == METADATA_TYPE:
@@ -271,10 +277,15 @@ def analysis_min_language_characters() -> int:
 
 
 def first_thumbnail_path(contents: object) -> str | None:
+    """Return the first image's derived thumbnail, else its stored original."""
     metadata_fallback = None
     for block in normalize_contents(contents):
         if block.get("type") == "image":
-            thumbnail = block.get("media_path") or block.get("path")
+            thumbnail = (
+                block.get("thumbnail_path")
+                or block.get("media_path")
+                or block.get("path")
+            )
             if thumbnail:
                 return thumbnail
         if block.get("type") == METADATA_TYPE and metadata_fallback is None:
@@ -282,6 +293,67 @@ def first_thumbnail_path(contents: object) -> str | None:
     return metadata_fallback
 
 
+def local_image_paths(contents: object) -> list[str]:
+    """Return the stored image files of ``contents`` that can be decoded."""
+    paths = []
+    for block in normalize_contents(contents):
+        media_path = block.get("media_path")
+        if block.get("type") != "image" or not media_path:
+            continue
+        parsed = urlparse(media_path)
+        extension = os.path.splitext(parsed.path)[1].lower()
+        if (
+            not parsed.scheme
+            and not parsed.netloc
+            and extension in RECOVERABLE_IMAGE_EXTENSIONS
+            and media_path not in paths
+        ):
+            paths.append(media_path)
+    return paths
+
+
+def with_image_derivatives(
+    contents: object,
+    derivatives: dict[str, dict[str, str]],
+) -> list[dict[str, str]]:
+    """Attach derived ``thumbnail_path``/``webp_path`` to image blocks."""
+    blocks = []
+    for block in normalize_contents(contents):
+        derived = None
+        if block.get("type") == "image":
+            derived = derivatives.get(block.get("media_path"))
+        blocks.append({**block, **derived} if derived else block)
+    return blocks
+
+
+def carry_over_image_derivatives(
+    previous: object,
+    contents: object,
+) -> tuple[list[dict[str, str]], bool]:
+    """Keep derivatives of images that a rewrite of ``contents`` still holds.
+
+    Returns the merged blocks and whether every local image was already
+    present before, i.e. whether nothing is left to derive.
+    """
+    derivatives = {
+        block["media_path"]: {
+            key: block[key]
+            for key in ("thumbnail_path", "webp_path")
+            if key in block
+        }
+        for block in normalize_contents(previous)
+        if block.get("type") == "image" and block.get("media_path")
+    }
+    merged = [
+        {**derivatives.get(block.get("media_path"), {}), **block}
+        if block.get("type") == "image"
+        else block
+        for block in normalize_contents(contents)
+    ]
+    complete = all(path in derivatives for path in local_image_paths(merged))
+    return merged, complete
+
+
 def _has_recoverable_image(
     block: dict[str, str],
     *,
@@ -353,12 +425,17 @@ def _media_block(
     source_url: object = None,
     text: object = None,
     alt_text: object = None,
+    thumbnail_path: object = None,
+    webp_path: object = None,
 ) -> dict[str, str] | None:
     block: dict[str, str] = {"type": block_type}
     _put_clean(block, "media_path", media_path)
     _put_clean(block, "source_url", source_url)
     _put_clean(block, "text", text)
     _put_clean(block, "alt_text", alt_text)
+    if "media_path" in block:
+        _put_clean(block, "thumbnail_path", thumbnail_path)
+        _put_clean(block, "webp_path", webp_path)
 
     return block if len(block) > 1 else None
 
@@ -0,0 +1,480 @@
+"""Bulk loading of boards and metric snapshots for backfills and replays.
+
+Rows are streamed in batches.  On PostgreSQL each batch goes through
+``COPY ... FROM STDIN``: boards land in a temporary staging table and are
+merged with ``INSERT ... ON CONFLICT (source_id)``, and snapshots are
+copied straight into ``board_metric_snapshots``, which routes them to their
+daily partitions.  SQLite uses ``executemany`` with the same conflict
+handling.  The ORM, per-row scoring and listeners are bypassed; after a
+snapshot load the touched boards are re-scored in bulk from their three
+latest snapshots, and every committed board batch drops the in-process
+ranking cache.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from itertools import islice
+import logging
+from uuid import uuid4
+
+from psycopg.types.json import Jsonb
+from sqlalchemy import (
+    JSON,
+    Connection,
+    bindparam,
+    column,
+    desc,
+    func,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from crawl_scheduler.db.models import Board, BoardMetricSnapshot
+from crawl_scheduler.db.postgres import get_engine
+from crawl_scheduler.db.postgres_controller import (
+    PostgresController,
+    coerce_datetime,
+    optional_int,
+    popularity_metrics,
+)
+from crawl_scheduler.db.ranking_cache import get_ranking_cache
+from crawl_scheduler.popularity import (
+    DAILY_DECAY_HOURS,
+    HOT_DECAY_HOURS,
+    PopularityMetrics,
+    calculate_popularity_scores_batch,
+    next_metrics_crawl_at,
+    ranking_key,
+)
+
+
+logger = logging.getLogger("crawler")
+
+BULK_LOAD_BATCH_SIZE = 10_000
+RESCORE_BATCH_SIZE = 1000
+BOARD_CONFLICT_ACTIONS = {"skip", "update_metrics"}
+BOARD_METRIC_COLUMNS = (
+    "native_comment_count",
+    "native_like_count",
+    "native_view_count",
+    "source_rank",
+    "metrics_crawled_at",
+)
+BOARD_STAGE_TABLE = "board_load_stage"
+_JSON_COLUMNS = {
+    board_column.name
+    for board_column in Board.__table__.columns
+    if isinstance(board_column.type, JSON)
+}
+_RESCORED_COLUMNS = (
+    "native_comment_count",
+    "native_like_count",
+    "native_view_count",
+    "source_rank",
+    "metrics_crawled_at",
+    "hot_score",
+    "daily_score",
+    "score_breakdown",
+    "score_updated_at",
+    "hot_rank_key",
+    "daily_rank_key",
+    "next_metrics_crawl_at",
+    "last_snapshot_at",
+    "last_snapshot_comment_count",
+    "last_snapshot_like_count",
+    "last_snapshot_view_count",
+    "prior_snapshot_at",
+    "prior_snapshot_comment_count",
+    "prior_snapshot_like_count",
+    "prior_snapshot_view_count",
+)
+_RESCORE_STATEMENT = (
+    update(Board.__table__)
+    .where(Board.__table__.c.id == bindparam("board_id"))
+    .values({name: bindparam(name) for name in _RESCORED_COLUMNS})
+)
+
+
+@dataclass(frozen=True)
+class BulkLoadResult:
+    loaded: int
+    skipped: int
+    rescored: int = 0
+
+
+@dataclass(frozen=True)
+class _SnapshotSample:
+    captured_at: datetime
+    comment_count: int
+    like_count: int
+    view_count: int | None
+    source_rank: int | None
+
+
+def load_boards(
+    documents: Iterable[dict],
+    *,
+    database_url: str | None = None,
+    on_conflict: str = "skip",
+    batch_size: int = BULK_LOAD_BATCH_SIZE,
+) -> BulkLoadResult:
+    """Insert crawled board documents, handling ``source_id`` conflicts.
+
+    ``on_conflict="skip"`` leaves stored boards untouched, and
+    ``"update_metrics"`` only refreshes their native metric columns.
+    Documents go through the same normalization as ``insert_many``, but
+    nothing is scored: load snapshots afterwards or call ``rescore_boards``.
+    """
+    if on_conflict not in BOARD_CONFLICT_ACTIONS:
+        raise ValueError(f"unsupported conflict action: {on_conflict!r}")
+
+    controller = PostgresController(database_url=database_url)
+    engine = get_engine(database_url)
+    loaded = skipped = 0
+    for batch in _batches(documents, batch_size):
+        rows = {}
+        for document in batch:
+            row = _board_row(controller, document)
+            rows[row["source_id"]] = row
+        with engine.begin() as connection:
+            merge = (
+                _merge_boards_with_copy
+                if connection.dialect.name == "postgresql"
+                else _merge_boards_with_executemany
+            )
+            inserted = merge(connection, list(rows.values()), on_conflict)
+        get_ranking_cache().invalidate()
+        loaded += inserted
+        skipped += len(batch) - inserted
+    logger.info("Bulk loaded %d boards (%d skipped or merged)", loaded, skipped)
+    return BulkLoadResult(loaded=loaded, skipped=skipped)
+
+
+def load_metric_snapshots(
+    snapshots: Iterable[dict],
+    *,
+    database_url: str | None = None,
+    rescore: bool = True,
+    batch_size: int = BULK_LOAD_BATCH_SIZE,
+) -> BulkLoadResult:
+    """Append metric snapshots and re-score the boards they belong to.
+
+    Each snapshot names its board by ``board_id`` or ``source_id`` and holds
+    ``captured_at`` and the native ``comment_count``, ``like_count``,
+    ``view_count`` and ``source_rank``.  Snapshots of unknown boards are
+    skipped.
+    """
+    engine = get_engine(database_url)
+    loaded = skipped = 0
+    touched_board_ids: set[str] = set()
+    for batch in _batches(snapshots, batch_size):
+        with engine.begin() as connection:
+            board_ids = _resolve_board_ids(connection, batch)
+            rows = [
+                _snapshot_row(board_id, snapshot)
+                for snapshot in batch
+                if (board_id := board_ids.get(_board_reference(snapshot))) is not None
+            ]
+            if rows:
+                if connection.dialect.name == "postgresql":
+                    _copy_rows(connection, BoardMetricSnapshot.__table__.name, rows)
+                else:
+                    connection.execute(BoardMetricSnapshot.__table__.insert(), rows)
+        loaded += len(rows)
+        skipped += len(batch) - len(rows)
+        touched_board_ids.update(row["board_id"] for row in rows)
+
+    rescored = (
+        rescore_boards(touched_board_ids, database_url=database_url)
+        if rescore and touched_board_ids
+        else 0
+    )
+    logger.info(
+        "Bulk loaded %d metric snapshots (%d skipped), re-scored %d boards",
+        loaded,
+        skipped,
+        rescored,
+    )
+    return BulkLoadResult(loaded=loaded, skipped=skipped, rescored=rescored)
+
+
+def rescore_boards(
+    board_ids: Iterable[str] | None = None,
+    *,
+    database_url: str | None = None,
+    batch_size: int = RESCORE_BATCH_SIZE,
+) -> int:
+    """Recompute scores and rolling metric state from stored snapshots.
+
+    Every board is scored for its latest snapshot against the two before
+    it, exactly as if that snapshot had just been crawled.  Pass
+    ``board_ids=None`` to re-score every board that has snapshots.
+    """
+    engine = get_engine(database_url)
+    if board_ids is None:
+        with engine.connect() as connection:
+            board_ids = connection.execute(
+                select(BoardMetricSnapshot.board_id).distinct()
+            ).scalars().all()
+    board_ids = sorted(set(board_ids))
+
+    rescored = 0
+    for start in range(0, len(board_ids), batch_size):
+        with engine.begin() as connection:
+            rows = _rescored_board_rows(connection, board_ids[start:start + batch_size])
+            if rows:
+                connection.execute(_RESCORE_STATEMENT, rows)
+        if rows:
+            get_ranking_cache().invalidate()
+        rescored += len(rows)
+    return rescored
+
+
+def _batches(rows: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, max(batch_size, 1))):
+        yield batch
+
+
+def _board_row(controller: PostgresController, document: dict) -> dict:
+    values = controller.board_values("Realtime", document)
+    row = {}
+    for board_column in Board.__table__.columns:
+        name, default = board_column.key, board_column.default
+        if name in values:
+            row[name] = values[name]
+        elif default is None:
+            row[name] = None
+        elif default.is_callable:
+            row[name] = default.arg(None)
+        else:
+            row[name] = default.arg
+    updated_at = row["score_updated_at"] or row["created_at"]
+    row["hot_rank_key"] = ranking_key(row["hot_score"], updated_at, HOT_DECAY_HOURS)
+    row["daily_rank_key"] = ranking_key(row["daily_score"], updated_at, DAILY_DECAY_HOURS)
+    return row
+
+
+def _merge_boards_with_copy(
+    connection: Connection,
+    rows: list[dict],
+    on_conflict: str,
+) -> int:
+    connection.execute(
+        text(
+            f"CREATE TEMP TABLE {BOARD_STAGE_TABLE} "
+            "(LIKE boards INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    _copy_rows(connection, BOARD_STAGE_TABLE, rows)
+    columns = list(rows[0])
+    stage = table(BOARD_STAGE_TABLE, *[column(name) for name in columns])
+    statement = _with_board_conflict(
+        postgresql.insert(Board.__table__).from_select(columns, select(stage)),
+        on_conflict,
+    )
+    if on_conflict == "skip":
+        return connection.execute(statement).rowcount
+    # xmax is 0 only on rows this statement inserted rather than updated.
+    return sum(
+        connection.execute(statement.returning(text("xmax = 0"))).scalars()
+    )
+
+
+def _merge_boards_with_executemany(
+    connection: Connection,
+    rows: list[dict],
+    on_conflict: str,
+) -> int:
+    existing = set(
+        connection.execute(
+            select(Board.source_id).where(
+                Board.source_id.in_([row["source_id"] for row in rows])
+            )
+        ).scalars()
+    )
+    connection.execute(
+        _with_board_conflict(sqlite.insert(Board.__table__), on_conflict),
+        rows,
+    )
+    return sum(row["source_id"] not in existing for row in rows)
+
+
+def _with_board_conflict(statement, on_conflict: str):
+    if on_conflict == "update_metrics":
+        return statement.on_conflict_do_update(
+            index_elements=["source_id"],
+            set_={name: statement.excluded[name] for name in BOARD_METRIC_COLUMNS},
+        )
+    return statement.on_conflict_do_nothing(index_elements=["source_id"])
+
+
+def _copy_rows(connection: Connection, table_name: str, rows: list[dict]) -> None:
+    columns = list(rows[0])
+    driver_connection = connection.connection.driver_connection
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(
+                    [
+                        Jsonb(row[name])
+                        if name in _JSON_COLUMNS and row[name] is not None
+                        else row[name]
+                        for name in columns
+                    ]
+                )
+
+
+def _board_reference(snapshot: dict) -> tuple[str, str] | None:
+    if snapshot.get("board_id"):
+        return "id", str(snapshot["board_id"])
+    if snapshot.get("source_id"):
+        return "source_id", str(snapshot["source_id"])
+    return None
+
+
+def _resolve_board_ids(connection: Connection, snapshots: list[dict]) -> dict:
+    references = {_board_reference(snapshot) for snapshot in snapshots} - {None}
+    ids = {value for kind, value in references if kind == "id"}
+    source_ids = {value for kind, value in references if kind == "source_id"}
+    resolved = {}
+    if ids:
+        for board_id in connection.execute(
+            select(Board.id).where(Board.id.in_(ids))
+        ).scalars():
+            resolved["id", board_id] = board_id
+    if source_ids:
+        for source_id, board_id in connection.execute(
+            select(Board.source_id, Board.id).where(Board.source_id.in_(source_ids))
+        ):
+            resolved["source_id", source_id] = board_id
+    return resolved
+
+
+def _snapshot_row(board_id: str, snapshot: dict) -> dict:
+    captured_at = snapshot["captured_at"]
+    if captured_at.tzinfo is None:
+        captured_at = captured_at.replace(tzinfo=timezone.utc)
+    return {
+        "id": str(uuid4()),
+        "board_id": board_id,
+        "captured_at": captured_at,
+        "comment_count": int(snapshot.get("comment_count") or 0),
+        "like_count": int(snapshot.get("like_count") or 0),
+        "view_count": optional_int(snapshot.get("view_count")),
+        "source_rank": optional_int(snapshot.get("source_rank")),
+        "crawl_status": snapshot.get("crawl_status") or "success",
+        "crawl_error": snapshot.get("crawl_error"),
+    }
+
+
+def _rescored_board_rows(connection: Connection, board_ids: list[str]) -> list[dict]:
+    snapshot_rank = (
+        func.row_number()
+        .over(
+            partition_by=BoardMetricSnapshot.board_id,
+            order_by=desc(BoardMetricSnapshot.captured_at),
+        )
+        .label("snapshot_rank")
+    )
+    ranked_snapshots = (
+        select(
+            BoardMetricSnapshot.board_id,
+            BoardMetricSnapshot.captured_at,
+            BoardMetricSnapshot.comment_count,
+            BoardMetricSnapshot.like_count,
+            BoardMetricSnapshot.view_count,
+            BoardMetricSnapshot.source_rank,
+            snapshot_rank,
+        )
+        .where(BoardMetricSnapshot.board_id.in_(board_ids))
+        .subquery()
+    )
+    history: dict[str, list] = {}
+    for snapshot in connection.execute(
+        select(ranked_snapshots)
+        .where(ranked_snapshots.c.snapshot_rank <= 3)
+        .order_by(ranked_snapshots.c.board_id, ranked_snapshots.c.snapshot_rank)
+    ):
+        history.setdefault(snapshot.board_id, []).append(
+            _SnapshotSample(
+                captured_at=coerce_datetime(snapshot.captured_at),
+                comment_count=snapshot.comment_count,
+                like_count=snapshot.like_count,
+                view_count=snapshot.view_count,
+                source_rank=snapshot.source_rank,
+            )
+        )
+
+    boards = []
+    metrics = []
+    for board in connection.execute(
+        select(
+            Board.id,
+            Board.site,
+            Board.created_at,
+            Board.llm_engagement_score,
+        ).where(Board.id.in_(history))
+    ):
+        capture, previous, previous_previous = (history[board.id] + [None, None])[:3]
+        boards.append((board, capture, previous))
+        metrics.append(popularity_metrics(board, capture, previous, previous_previous))
+    if not boards:
+        return []
+
+    scores = calculate_popularity_scores_batch(
+        **{
+            field.name: [getattr(metric, field.name) for metric in metrics]
+            for field in fields(PopularityMetrics)
+        },
+        include_breakdown=True,
+    )
+    rows = []
+    for (board, capture, previous), hot_score, daily_score, breakdown in zip(
+        boards,
+        scores.hot_score.tolist(),
+        scores.daily_score.tolist(),
+        scores.breakdown_rows(),
+    ):
+        rows.append(
+            {
+                "board_id": board.id,
+                "native_comment_count": capture.comment_count,
+                "native_like_count": capture.like_count,
+                "native_view_count": capture.view_count,
+                "source_rank": capture.source_rank,
+                "metrics_crawled_at": capture.captured_at,
+                "hot_score": hot_score,
+                "daily_score": daily_score,
+                "score_breakdown": breakdown,
+                "score_updated_at": capture.captured_at,
+                "hot_rank_key": ranking_key(
+                    hot_score,
+                    capture.captured_at,
+                    HOT_DECAY_HOURS,
+                ),
+                "daily_rank_key": ranking_key(
+                    daily_score,
+                    capture.captured_at,
+                    DAILY_DECAY_HOURS,
+                ),
+                "next_metrics_crawl_at": next_metrics_crawl_at(
+                    hot_score=hot_score,
+                    created_at=coerce_datetime(board.created_at),
+                    captured_at=capture.captured_at,
+                ),
+                "last_snapshot_at": capture.captured_at,
+                "last_snapshot_comment_count": capture.comment_count,
+                "last_snapshot_like_count": capture.like_count,
+                "last_snapshot_view_count": capture.view_count,
+                "prior_snapshot_at": getattr(previous, "captured_at", None),
+                "prior_snapshot_comment_count": getattr(previous, "comment_count", None),
+                "prior_snapshot_like_count": getattr(previous, "like_count", None),
+                "prior_snapshot_view_count": getattr(previous, "view_count", None),
+            }
+        )
+    return rows
@@ -0,0 +1,433 @@
+"""Versioned schema bootstrap for the crawler tables.
+
+Migrations run once per process (or explicitly through ``main.py --migrate``)
+and record each applied step in ``schema_migrations``.  Constructing a
+``PostgresController`` afterwards performs no DDL and no catalog queries.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import threading
+
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    bindparam,
+    desc,
+    func,
+    inspect,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+from crawl_scheduler.constants import DEFAULT_GPT_ANSWER
+from crawl_scheduler.db.models import Board, BoardMetricSnapshot, SchemaMigration
+from crawl_scheduler.db.postgres import Base, get_engine
+from crawl_scheduler.db.snapshot_partitions import partition_snapshot_table
+from crawl_scheduler.popularity import (
+    DAILY_DECAY_HOURS,
+    HOT_DECAY_HOURS,
+    ZERO_SCORE_RANK_KEY,
+    ranking_key,
+)
+
+
+logger = logging.getLogger("crawler")
+
+MIGRATION_LOCK_KEY = 7_311_202_601
+BACKFILL_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _baseline(connection: Connection) -> None:
+    Base.metadata.create_all(bind=connection)
+    _ensure_board_columns(connection)
+    _ensure_board_no_bigint(connection)
+
+
+def _index_metric_polls(connection: Connection) -> None:
+    _create_missing_indexes(
+        connection,
+        "boards",
+        {
+            "ix_boards_next_metrics_crawl_at": "ON boards (next_metrics_crawl_at)",
+        },
+    )
+
+
+def _add_rank_keys(connection: Connection) -> None:
+    _add_missing_columns(
+        connection,
+        "boards",
+        {
+            "hot_rank_key": f"FLOAT NOT NULL DEFAULT {ZERO_SCORE_RANK_KEY:.0f}",
+            "daily_rank_key": f"FLOAT NOT NULL DEFAULT {ZERO_SCORE_RANK_KEY:.0f}",
+        },
+    )
+    _create_missing_indexes(
+        connection,
+        "boards",
+        {
+            "ix_boards_hot_rank_key": "ON boards (hot_rank_key, created_at)",
+            "ix_boards_daily_rank_key": (
+                "ON boards (daily_rank_key, like_count, created_at)"
+            ),
+        },
+    )
+    _backfill_rank_keys(connection)
+
+
+def _add_rank_key_tiebreaks(connection: Connection) -> None:
+    index_columns = {
+        "ix_boards_hot_rank_key": "hot_rank_key, created_at, id",
+        "ix_boards_daily_rank_key": "daily_rank_key, like_count, created_at, id",
+    }
+    existing_indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(connection).get_indexes("boards")
+    }
+    for index_name, columns in index_columns.items():
+        if existing_indexes.get(index_name, [])[-1:] == ["id"]:
+            continue
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        connection.execute(text(f"CREATE INDEX {index_name} ON boards ({columns})"))
+
+
+def _index_crawler_log_retention(connection: Connection) -> None:
+    _create_missing_indexes(
+        connection,
+        "crawler_logs",
+        {"ix_crawler_logs_created_at": "ON crawler_logs (created_at)"},
+    )
+
+
+def _add_rolling_metric_state(connection: Connection) -> None:
+    _add_missing_columns(
+        connection,
+        "boards",
+        {
+            "last_snapshot_at": "TIMESTAMP",
+            "last_snapshot_comment_count": "INTEGER",
+            "last_snapshot_like_count": "INTEGER",
+            "last_snapshot_view_count": "INTEGER",
+            "prior_snapshot_at": "TIMESTAMP",
+            "prior_snapshot_comment_count": "INTEGER",
+            "prior_snapshot_like_count": "INTEGER",
+            "prior_snapshot_view_count": "INTEGER",
+        },
+    )
+    _backfill_rolling_metric_state(connection)
+
+
+def _convert_board_json_to_jsonb(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+
+    column_types = {
+        column["name"]: column["type"]
+        for column in inspect(connection).get_columns("boards")
+    }
+    for column_name in ("contents", "tags", "score_breakdown"):
+        if not isinstance(column_types.get(column_name), JSONB):
+            connection.execute(
+                text(
+                    f"ALTER TABLE boards ALTER COLUMN {column_name} "
+                    f"TYPE JSONB USING {column_name}::jsonb"
+                )
+            )
+    connection.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_boards_tags "
+            "ON boards USING gin (tags jsonb_path_ops)"
+        )
+    )
+
+
+def _add_media_derivative_state(connection: Connection) -> None:
+    _add_missing_columns(connection, "boards", {"media_derived_at": "TIMESTAMP"})
+    _create_missing_indexes(
+        connection,
+        "boards",
+        {
+            "ix_boards_media_derived_at": (
+                "ON boards (media_derived_at, created_at)"
+            ),
+        },
+    )
+
+
+MIGRATIONS = (
+    Migration(1, "baseline", _baseline),
+    Migration(2, "index_metric_polls", _index_metric_polls),
+    Migration(3, "rank_keys", _add_rank_keys),
+    Migration(4, "rank_key_tiebreaks", _add_rank_key_tiebreaks),
+    Migration(5, "partition_metric_snapshots", partition_snapshot_table),
+    Migration(6, "index_crawler_log_retention", _index_crawler_log_retention),
+    Migration(7, "rolling_metric_state", _add_rolling_metric_state),
+    Migration(8, "board_jsonb", _convert_board_json_to_jsonb),
+    Migration(9, "media_derivative_state", _add_media_derivative_state),
+)
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+_applied_versions: dict[str | None, int] = {}
+_applied_lock = threading.Lock()
+
+
+def migrate(database_url: str | None = None) -> int:
+    """Apply pending migrations and return the resulting schema version."""
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"),
+                {"key": MIGRATION_LOCK_KEY},
+            )
+        SchemaMigration.__table__.create(bind=connection, checkfirst=True)
+        version = _current_version(connection)
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            logger.info(
+                "Applying schema migration %d: %s",
+                migration.version,
+                migration.name,
+            )
+            migration.apply(connection)
+            connection.execute(
+                insert(SchemaMigration).values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+            version = migration.version
+    return version
+
+
+def ensure_schema(database_url: str | None = None) -> int:
+    """Migrate at most once per process and database URL."""
+    version = _applied_versions.get(database_url)
+    if version is not None:
+        return version
+    with _applied_lock:
+        version = _applied_versions.get(database_url)
+        if version is None:
+            version = migrate(database_url)
+            _applied_versions[database_url] = version
+    return version
+
+
+def _current_version(connection: Connection) -> int:
+    return int(
+        connection.execute(select(func.max(SchemaMigration.version))).scalar() or 0
+    )
+
+
+def _add_missing_columns(
+    connection: Connection,
+    table_name: str,
+    column_definitions: dict[str, str],
+) -> set[str]:
+    inspector = inspect(connection)
+    if not inspector.has_table(table_name):
+        return set()
+
+    existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+    missing_columns = {
+        column_name: definition
+        for column_name, definition in column_definitions.items()
+        if column_name not in existing_columns
+    }
+    if_not_exists = "IF NOT EXISTS " if connection.dialect.name == "postgresql" else ""
+    for column_name, definition in missing_columns.items():
+        connection.execute(
+            text(
+                f"ALTER TABLE {table_name} ADD COLUMN "
+                f"{if_not_exists}{column_name} {definition}"
+            )
+        )
+    return set(missing_columns)
+
+
+def _create_missing_indexes(
+    connection: Connection,
+    table_name: str,
+    index_definitions: dict[str, str],
+) -> None:
+    existing_index_names = {
+        index["name"] for index in inspect(connection).get_indexes(table_name)
+    }
+    for index_name, definition in index_definitions.items():
+        if index_name not in existing_index_names:
+            connection.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {index_name} {definition}")
+            )
+
+
+def _ensure_board_columns(connection: Connection) -> None:
+    missing_columns = _add_missing_columns(
+        connection,
+        "boards",
+        {
+            "tags": "JSON",
+            "llm_engagement_score": "INTEGER",
+            "llm_engagement_reason": "TEXT",
+            "analysis_status": "VARCHAR(32) NOT NULL DEFAULT 'pending'",
+            "analysis_priority": "INTEGER NOT NULL DEFAULT 0",
+            "analysis_requested_at": "TIMESTAMP",
+            "analysis_started_at": "TIMESTAMP",
+            "analysis_updated_at": "TIMESTAMP",
+            "analysis_retry_count": "INTEGER NOT NULL DEFAULT 0",
+            "analysis_error": "TEXT",
+            "native_comment_count": "INTEGER",
+            "native_like_count": "INTEGER",
+            "native_view_count": "INTEGER",
+            "source_rank": "INTEGER",
+            "metrics_crawled_at": "TIMESTAMP",
+            "next_metrics_crawl_at": "TIMESTAMP",
+            "hot_score": "FLOAT",
+            "daily_score": "FLOAT",
+            "score_updated_at": "TIMESTAMP",
+            "score_breakdown": "JSON",
+        },
+    )
+    _create_missing_indexes(
+        connection,
+        "board_metric_snapshots",
+        {
+            "ix_board_metric_snapshots_board_captured_at": (
+                "ON board_metric_snapshots (board_id, captured_at)"
+            ),
+            "ix_board_metric_snapshots_captured_at": (
+                "ON board_metric_snapshots (captured_at)"
+            ),
+        },
+    )
+    if "llm_engagement_score" in missing_columns:
+        connection.execute(
+            text(
+                "UPDATE boards SET analysis_status = 'pending', "
+                "analysis_retry_count = 0 "
+                "WHERE llm_engagement_score IS NULL "
+                "AND gpt_answer IS NOT NULL AND gpt_answer <> :default_answer"
+            ),
+            {"default_answer": DEFAULT_GPT_ANSWER},
+        )
+
+
+def _ensure_board_no_bigint(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+
+    no_column = next(
+        column
+        for column in inspect(connection).get_columns("boards")
+        if column["name"] == "no"
+    )
+    if not isinstance(no_column["type"], BigInteger):
+        connection.execute(text("ALTER TABLE boards ALTER COLUMN no TYPE BIGINT"))
+
+
+def _backfill_rank_keys(connection: Connection) -> None:
+    rows = connection.execute(
+        select(
+            Board.id,
+            Board.hot_score,
+            Board.daily_score,
+            func.coalesce(Board.score_updated_at, Board.created_at).label("updated_at"),
+        ).where((Board.hot_score > 0) | (Board.daily_score > 0))
+    ).all()
+    statement = (
+        update(Board.__table__)
+        .where(Board.__table__.c.id == bindparam("board_id"))
+        .values(
+            hot_rank_key=bindparam("hot_rank_key"),
+            daily_rank_key=bindparam("daily_rank_key"),
+        )
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        connection.execute(
+            statement,
+            [
+                {
+                    "board_id": row.id,
+                    "hot_rank_key": ranking_key(
+                        row.hot_score,
+                        row.updated_at,
+                        HOT_DECAY_HOURS,
+                    ),
+                    "daily_rank_key": ranking_key(
+                        row.daily_score,
+                        row.updated_at,
+                        DAILY_DECAY_HOURS,
+                    ),
+                }
+                for row in rows[start:start + BACKFILL_BATCH_SIZE]
+            ],
+        )
+
+
+def _backfill_rolling_metric_state(connection: Connection) -> None:
+    snapshot_rank = (
+        func.row_number()
+        .over(
+            partition_by=BoardMetricSnapshot.board_id,
+            order_by=desc(BoardMetricSnapshot.captured_at),
+        )
+        .label("snapshot_rank")
+    )
+    ranked_snapshots = select(
+        BoardMetricSnapshot.board_id,
+        BoardMetricSnapshot.captured_at,
+        BoardMetricSnapshot.comment_count,
+        BoardMetricSnapshot.like_count,
+        BoardMetricSnapshot.view_count,
+        snapshot_rank,
+    ).subquery()
+    states: dict[str, dict] = {}
+    for snapshot in connection.execute(
+        select(ranked_snapshots).where(ranked_snapshots.c.snapshot_rank <= 2)
+    ):
+        prefix = "last" if snapshot.snapshot_rank == 1 else "prior"
+        state = states.setdefault(
+            snapshot.board_id,
+            {
+                "board_id": snapshot.board_id,
+                "prior_snapshot_at": None,
+                "prior_snapshot_comment_count": None,
+                "prior_snapshot_like_count": None,
+                "prior_snapshot_view_count": None,
+            },
+        )
+        state[f"{prefix}_snapshot_at"] = snapshot.captured_at
+        state[f"{prefix}_snapshot_comment_count"] = snapshot.comment_count
+        state[f"{prefix}_snapshot_like_count"] = snapshot.like_count
+        state[f"{prefix}_snapshot_view_count"] = snapshot.view_count
+
+    rows = list(states.values())
+    if not rows:
+        return
+    statement = (
+        update(Board.__table__)
+        .where(Board.__table__.c.id == bindparam("board_id"))
+        .values(
+            {
+                column: bindparam(column)
+                for column in rows[0]
+                if column != "board_id"
+            }
+        )
+    )
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        connection.execute(statement, rows[start:start + BACKFILL_BATCH_SIZE])
@@ -12,14 +12,51 @@ from sqlalchemy import (
     JSON,
     String,
     UniqueConstraint,
+    event,
+    inspect,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
+from crawl_scheduler.crawled_content import (
+    carry_over_image_derivatives,
+    first_thumbnail_path,
+)
 from crawl_scheduler.db.postgres import Base
+from crawl_scheduler.popularity import (
+    DAILY_DECAY_HOURS,
+    HOT_DECAY_HOURS,
+    ZERO_SCORE_RANK_KEY,
+    ranking_key,
+)
+
+
+ZERO_SCORE_RANK_KEY_DEFAULT = text(f"{ZERO_SCORE_RANK_KEY:.0f}")
+# Binary, indexable JSON on PostgreSQL; plain JSON text on SQLite.
+JSON_DOCUMENT = JSON().with_variant(JSONB(), "postgresql")
 
 
 class Board(Base):
     __tablename__ = "boards"
+    __table_args__ = (
+        Index("ix_boards_next_metrics_crawl_at", "next_metrics_crawl_at"),
+        Index("ix_boards_hot_rank_key", "hot_rank_key", "created_at", "id"),
+        Index(
+            "ix_boards_daily_rank_key",
+            "daily_rank_key",
+            "like_count",
+            "created_at",
+            "id",
+        ),
+        Index("ix_boards_media_derived_at", "media_derived_at", "created_at"),
+        Index(
+            "ix_boards_tags",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     source_id: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
@@ -28,9 +65,9 @@ class Board(Base):
     site: Mapped[str] = mapped_column(String(100), nullable=False)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     url: Mapped[str] = mapped_column(String(2048), nullable=False)
-    contents: Mapped[list | dict | str | None] = mapped_column(JSON, nullable=True)
+    contents: Mapped[list | dict | str | None] = mapped_column(JSON_DOCUMENT, nullable=True)
     gpt_answer: Mapped[str | None] = mapped_column(String, nullable=True)
-    tags: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    tags: Mapped[list | None] = mapped_column(JSON_DOCUMENT, nullable=True)
     llm_engagement_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     llm_engagement_reason: Mapped[str | None] = mapped_column(String, nullable=True)
     analysis_status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
@@ -41,6 +78,7 @@ class Board(Base):
     analysis_retry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     analysis_error: Mapped[str | None] = mapped_column(String, nullable=True)
     thumbnail: Mapped[str | None] = mapped_column(String(2048), nullable=True)
+    media_derived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     like_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     native_comment_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -52,7 +90,27 @@ class Board(Base):
     hot_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     daily_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     score_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    score_breakdown: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    score_breakdown: Mapped[dict | None] = mapped_column(JSON_DOCUMENT, nullable=True)
+    last_snapshot_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_snapshot_comment_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_snapshot_like_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_snapshot_view_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prior_snapshot_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    prior_snapshot_comment_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prior_snapshot_like_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prior_snapshot_view_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    hot_rank_key: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=ZERO_SCORE_RANK_KEY,
+        server_default=ZERO_SCORE_RANK_KEY_DEFAULT,
+    )
+    daily_rank_key: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=ZERO_SCORE_RANK_KEY,
+        server_default=ZERO_SCORE_RANK_KEY_DEFAULT,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -60,6 +118,37 @@ class Board(Base):
     )
 
 
+@event.listens_for(Board, "before_update")
+def _keep_image_derivatives(mapper, connection, board: Board) -> None:
+    """Carry derived image paths over when a crawl rewrites ``contents``.
+
+    Boards whose rewritten contents hold an image without derivatives are
+    queued for the derivative stage again by clearing ``media_derived_at``.
+    """
+    state = inspect(board)
+    contents_history = state.attrs.contents.history
+    if not contents_history.deleted or state.attrs.media_derived_at.history.has_changes():
+        return
+    raw_thumbnail = first_thumbnail_path(board.contents)
+    contents, complete = carry_over_image_derivatives(
+        contents_history.deleted[0],
+        board.contents,
+    )
+    board.contents = contents
+    if board.thumbnail == raw_thumbnail:
+        board.thumbnail = first_thumbnail_path(contents) or board.thumbnail
+    if not complete:
+        board.media_derived_at = None
+
+
+@event.listens_for(Board, "before_insert")
+@event.listens_for(Board, "before_update")
+def _refresh_board_rank_keys(mapper, connection, board: Board) -> None:
+    updated_at = board.score_updated_at or board.created_at or datetime.now(timezone.utc)
+    board.hot_rank_key = ranking_key(board.hot_score, updated_at, HOT_DECAY_HOURS)
+    board.daily_rank_key = ranking_key(board.daily_score, updated_at, DAILY_DECAY_HOURS)
+
+
 class BoardMetricSnapshot(Base):
     __tablename__ = "board_metric_snapshots"
     __table_args__ = (
@@ -104,6 +193,7 @@ class DailyTop10Snapshot(Base):
 
 class CrawlerLog(Base):
     __tablename__ = "crawler_logs"
+    __table_args__ = (Index("ix_crawler_logs_created_at", "created_at"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
     level: Mapped[str | None] = mapped_column(String(32), nullable=True)
@@ -116,3 +206,15 @@ class CrawlerLog(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
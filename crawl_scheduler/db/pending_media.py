@@ -0,0 +1,60 @@
+"""Media paths that finished downloading before their board was written.
+
+Crawlers store a feed's boards in one ``insert_many`` after every article
+of the feed was fetched, while deferred video downloads finish on their own
+schedule.  A ``media_path`` that finds no board yet is kept here by source
+id and applied when that board is upserted.  Paths are only forgotten once
+a committed board holds them, so an upsert that rolls back leaves them for
+its retry.  Only the most recent ``max_boards`` boards are remembered.
+"""
+
+from collections import OrderedDict
+import threading
+
+
+DEFAULT_PENDING_MEDIA_MAX_BOARDS = 1024
+
+
+class PendingMediaPaths:
+    def __init__(self, *, max_boards: int = DEFAULT_PENDING_MEDIA_MAX_BOARDS):
+        self.max_boards = max_boards
+        self._paths: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, source_id: str, source_url: str, media_path: str) -> None:
+        with self._lock:
+            self._paths.setdefault(source_id, {})[source_url] = media_path
+            self._paths.move_to_end(source_id)
+            while len(self._paths) > self.max_boards:
+                self._paths.popitem(last=False)
+
+    def discard(self, source_id: str, media_paths: dict[str, str]) -> None:
+        """Forget paths a committed board now holds.
+
+        A path registered again with a different value meanwhile is kept.
+        """
+        with self._lock:
+            paths = self._paths.get(source_id)
+            if paths is None:
+                return
+            for source_url, media_path in media_paths.items():
+                if paths.get(source_url) == media_path:
+                    del paths[source_url]
+            if not paths:
+                del self._paths[source_id]
+
+    def peek(self, source_id: str) -> dict[str, str]:
+        """Return the paths waiting for one board without forgetting them."""
+        with self._lock:
+            return dict(self._paths.get(source_id, {}))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._paths)
+
+
+_PENDING_MEDIA_PATHS = PendingMediaPaths()
+
+
+def get_pending_media_paths() -> PendingMediaPaths:
+    return _PENDING_MEDIA_PATHS
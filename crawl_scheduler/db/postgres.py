@@ -1,15 +1,28 @@
 import os
+from bisect import bisect_left
 from collections.abc import Generator
+from dataclasses import dataclass, replace
 from functools import lru_cache
 from pathlib import Path
+import threading
+import time
 
 from dotenv import load_dotenv
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event, exc
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 
 load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 
+DEFAULT_DB_POOL_SIZE = 5
+DEFAULT_DB_MAX_OVERFLOW = 10
+DEFAULT_DB_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_DB_STATEMENT_TIMEOUT_MS = 0
+DEFAULT_DB_PRE_PING_INTERVAL_SECONDS = 0.0
+# Upper bounds (seconds) of the checkout wait histogram buckets.
+POOL_WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0, 5.0)
+
 
 def _database_url(database_url: str | None = None) -> str:
     value = database_url or os.getenv("DATABASE_URL")
@@ -22,11 +35,151 @@ class Base(DeclarativeBase):
     pass
 
 
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool configuration shared by every engine of the process.
+
+    ``statement_timeout_ms`` is applied to PostgreSQL sessions only; 0 keeps
+    the server default.  A connection that was validated less than
+    ``pre_ping_interval_seconds`` ago is handed out without the pre-ping
+    ``SELECT 1``; 0 pings on every checkout.
+    """
+
+    pool_size: int = DEFAULT_DB_POOL_SIZE
+    max_overflow: int = DEFAULT_DB_MAX_OVERFLOW
+    recycle_seconds: int = DEFAULT_DB_POOL_RECYCLE_SECONDS
+    statement_timeout_ms: int = DEFAULT_DB_STATEMENT_TIMEOUT_MS
+    pre_ping_interval_seconds: float = DEFAULT_DB_PRE_PING_INTERVAL_SECONDS
+
+    @classmethod
+    def from_environment(cls, **overrides) -> "PoolSettings":
+        settings = cls(
+            pool_size=_env_number("DATABASE_POOL_SIZE", DEFAULT_DB_POOL_SIZE, minimum=1),
+            max_overflow=_env_number("DATABASE_MAX_OVERFLOW", DEFAULT_DB_MAX_OVERFLOW),
+            recycle_seconds=_env_number(
+                "DATABASE_POOL_RECYCLE_SECONDS",
+                DEFAULT_DB_POOL_RECYCLE_SECONDS,
+            ),
+            statement_timeout_ms=_env_number(
+                "DATABASE_STATEMENT_TIMEOUT_MS",
+                DEFAULT_DB_STATEMENT_TIMEOUT_MS,
+            ),
+            pre_ping_interval_seconds=_env_number(
+                "DATABASE_PRE_PING_INTERVAL_SECONDS",
+                DEFAULT_DB_PRE_PING_INTERVAL_SECONDS,
+                cast=float,
+            ),
+        )
+        return replace(
+            settings,
+            **{key: value for key, value in overrides.items() if value is not None},
+        )
+
+
+class PoolTelemetry:
+    """Checkout counters and wait-time histogram of one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+        self.pre_pings = 0
+        self.pre_pings_skipped = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.wait_buckets[bisect_left(POOL_WAIT_BUCKETS, seconds)] += 1
+
+    def record_pre_ping(self, skipped: bool) -> None:
+        with self._lock:
+            if skipped:
+                self.pre_pings_skipped += 1
+            else:
+                self.pre_pings += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={bound:g}s" for bound in POOL_WAIT_BUCKETS] + ["+Inf"]
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_histogram": dict(zip(labels, self.wait_buckets)),
+                "pre_pings": self.pre_pings,
+                "pre_pings_skipped": self.pre_pings_skipped,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that times how long each checkout waited for a slot."""
+
+    telemetry: PoolTelemetry | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.record_wait(time.perf_counter() - started)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+_POOL_SETTINGS: PoolSettings | None = None
+_ENGINES: list[Engine] = []
+
+
+def configure_pool(settings: PoolSettings) -> None:
+    """Use ``settings`` for engines created from now on.
+
+    Engines created earlier are disposed and dropped from the cache, so call
+    this once at startup before the first query.
+    """
+    global _POOL_SETTINGS
+
+    _POOL_SETTINGS = settings
+    for engine in _ENGINES:
+        engine.dispose()
+    get_session_factory.cache_clear()
+    get_engine.cache_clear()
+    _ENGINES.clear()
+
+
+def pool_settings() -> PoolSettings:
+    return _POOL_SETTINGS or PoolSettings.from_environment()
+
+
 @lru_cache(maxsize=None)
 def get_engine(database_url: str | None = None) -> Engine:
     url = _database_url(database_url)
+    settings = pool_settings()
     connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
-    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+    if url.startswith("postgresql") and settings.statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.statement_timeout_ms}"
+    pool_args = {}
+    if not _is_memory_database(url):
+        # In-memory SQLite needs its single-connection pool.
+        pool_args = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": settings.pool_size,
+            "max_overflow": settings.max_overflow,
+            "pool_recycle": settings.recycle_seconds or -1,
+        }
+    engine = create_engine(url, connect_args=connect_args, **pool_args)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.telemetry = PoolTelemetry()
+    _install_pre_ping(engine, settings.pre_ping_interval_seconds)
+    _ENGINES.append(engine)
+    return engine
 
 
 @lru_cache(maxsize=None)
@@ -40,3 +193,68 @@ def get_session(database_url: str | None = None) -> Generator[Session, None, Non
         yield session
     finally:
         session.close()
+
+
+def pool_stats(database_url: str | None = None) -> dict:
+    """Return the occupancy and checkout telemetry of an engine's pool."""
+    pool = get_engine(database_url).pool
+    telemetry = getattr(pool, "telemetry", None) or PoolTelemetry()
+    occupancy = {"size": 1, "checked_in": 0, "checked_out": 0, "overflow": 0}
+    if isinstance(pool, QueuePool):
+        occupancy = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    return {**occupancy, **telemetry.snapshot()}
+
+
+def _install_pre_ping(engine: Engine, interval_seconds: float) -> None:
+    """Ping connections on checkout unless they were validated recently.
+
+    A connection counts as validated when it was just opened, passed a ping
+    or was returned to the pool.  A failed ping raises ``DisconnectionError``, which makes
+    the pool discard the connection and retry with a fresh one.
+    """
+
+    @event.listens_for(engine, "checkout")
+    def ping(dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        validated_at = connection_record.info.get("validated_at")
+        telemetry = getattr(engine.pool, "telemetry", None)
+        if validated_at is not None and now - validated_at < interval_seconds:
+            if telemetry is not None:
+                telemetry.record_pre_ping(skipped=True)
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except engine.dialect.loaded_dbapi.Error as e:
+            raise exc.DisconnectionError() from e
+        connection_record.info["validated_at"] = now
+        if telemetry is not None:
+            telemetry.record_pre_ping(skipped=False)
+
+    @event.listens_for(engine, "connect")
+    def mark_connected(dbapi_connection, connection_record):
+        connection_record.info["validated_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def mark_validated(dbapi_connection, connection_record):
+        if dbapi_connection is not None:
+            connection_record.info["validated_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def forget_validation(dbapi_connection, connection_record, exception):
+        connection_record.info.pop("validated_at", None)
+
+
+def _is_memory_database(url: str) -> bool:
+    return url.startswith("sqlite") and (url.rstrip("/") == "sqlite:" or ":memory:" in url)
+
+
+def _env_number(name: str, default, *, minimum=0, cast=int):
+    try:
+        return max(cast(os.getenv(name, default)), minimum)
+    except (TypeError, ValueError):
+        return default
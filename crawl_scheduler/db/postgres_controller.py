@@ -1,3 +1,5 @@
+import base64
+import binascii
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import json
@@ -6,10 +8,13 @@ import os
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import DateTime, delete, desc, func, inspect, literal, select, text
+from sqlalchemy import delete, desc, func, insert, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import load_only
 
 from crawl_scheduler.constants import DEFAULT_GPT_ANSWER, DEFAULT_TAG
 from crawl_scheduler.crawled_content import (
+    MEDIA_TYPES,
     extract_llm_text,
     first_thumbnail_path,
     has_sufficient_body,
@@ -21,19 +26,46 @@ from crawl_scheduler.db.models import (
     CrawlerLog,
     DailyTop10Snapshot,
 )
-from crawl_scheduler.db.postgres import Base, get_engine, get_session_factory
+from crawl_scheduler.db.migrations import ensure_schema
+from crawl_scheduler.db.pending_media import get_pending_media_paths
+from crawl_scheduler.db.postgres import get_engine, get_session_factory
+from crawl_scheduler.db.ranking_cache import get_ranking_cache
 from crawl_scheduler.popularity import (
     DAILY_DECAY_HOURS,
     HOT_DECAY_HOURS,
     PopularityMetrics,
     calculate_popularity_scores,
+    next_metrics_crawl_at,
 )
 from crawl_scheduler.utils.llm import LLM
 
 
 BOARD_COLLECTIONS = {"realtime", "daily"}
-SNAPSHOT_RETENTION_DAYS = 7
-SNAPSHOT_CLEANUP_INTERVAL = timedelta(hours=1)
+# Columns a ranked listing card needs.  ``contents`` (the whole article,
+# including OCR text), ``score_breakdown`` and the analysis columns stay
+# unloaded in summary listings.
+BOARD_SUMMARY_COLUMNS = (
+    Board.source_id,
+    Board.category,
+    Board.no,
+    Board.site,
+    Board.title,
+    Board.url,
+    Board.thumbnail,
+    Board.tags,
+    Board.comment_count,
+    Board.like_count,
+    Board.native_comment_count,
+    Board.native_like_count,
+    Board.native_view_count,
+    Board.source_rank,
+    Board.hot_score,
+    Board.daily_score,
+    Board.score_updated_at,
+    Board.hot_rank_key,
+    Board.daily_rank_key,
+    Board.created_at,
+)
 SEOUL_TIMEZONE = ZoneInfo("Asia/Seoul")
 INSUFFICIENT_CONTENT_ANALYSIS_ERROR = (
     "crawled body is insufficient for AI analysis; content refresh required"
@@ -42,11 +74,64 @@ DEFAULT_CONTENT_REFRESH_COOLDOWN_SECONDS = 15 * 60
 MAX_CONTENT_REFRESH_COOLDOWN_SECONDS = 24 * 60 * 60
 
 
+@dataclass(frozen=True)
+class MetricSample:
+    """One earlier metric capture, as kept in a board's rolling columns."""
+
+    captured_at: datetime
+    comment_count: int | None
+    like_count: int | None
+    view_count: int | None
+
+
 @dataclass(frozen=True)
 class InsertOneResult:
     inserted_id: object
 
 
+@dataclass(frozen=True)
+class InsertManyResult:
+    inserted_ids: list
+
+
+@dataclass(frozen=True)
+class FeedIngestResult:
+    """Feed entries split by what the crawler still has to fetch.
+
+    ``existing_entries`` already had their native metrics refreshed.
+    ``content_refresh_entries`` is the subset whose stored body must be
+    re-crawled, and ``new_entries`` are not stored yet.
+    ``metric_change_ratio`` is the mean relative change of comment plus like
+    counts over the existing entries, capped at 1 per entry.
+    """
+
+    existing_entries: list
+    new_entries: list
+    content_refresh_entries: list
+    metric_change_ratio: float = 0.0
+
+    @property
+    def new_entry_ratio(self) -> float:
+        total = len(self.existing_entries) + len(self.new_entries)
+        return len(self.new_entries) / total if total else 0.0
+
+    @property
+    def churn(self) -> float:
+        return max(self.new_entry_ratio, self.metric_change_ratio)
+
+
+@dataclass(frozen=True)
+class BoardPage:
+    """One page of a ranked listing.
+
+    ``next_cursor`` is ``None`` on the last page; otherwise pass it back to
+    ``list_boards_after`` to continue right after the last item.
+    """
+
+    items: list[dict]
+    next_cursor: str | None
+
+
 class DeleteResult:
     def __init__(self, deleted_count: int):
         self.deleted_count = deleted_count
@@ -58,15 +143,99 @@ class UpdateResult:
         self.modified_count = modified_count
 
 
+def optional_int(value: object) -> int | None:
+    """Return a non-negative count, or ``None`` when ``value`` is not one."""
+    if value is None or value == "":
+        return None
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def coerce_datetime(value: object) -> datetime:
+    """Return ``value`` as an aware datetime; naive values are UTC."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+    return datetime.now(timezone.utc)
+
+
+def popularity_metrics(
+    board,
+    capture,
+    previous: MetricSample | None,
+    previous_previous: MetricSample | None,
+) -> PopularityMetrics:
+    """Build scoring inputs for ``capture`` from the two captures before it."""
+    return PopularityMetrics(
+        site=board.site,
+        created_at=board.created_at,
+        captured_at=capture.captured_at,
+        comment_count=capture.comment_count or 0,
+        like_count=capture.like_count or 0,
+        view_count=capture.view_count,
+        source_rank=capture.source_rank,
+        llm_engagement_score=board.llm_engagement_score,
+        previous_comment_count=getattr(previous, "comment_count", None),
+        previous_like_count=getattr(previous, "like_count", None),
+        previous_view_count=getattr(previous, "view_count", None),
+        previous_captured_at=getattr(previous, "captured_at", None),
+        previous_delta_comments=_snapshot_delta(
+            previous,
+            previous_previous,
+            "comment_count",
+        ),
+        previous_delta_likes=_snapshot_delta(
+            previous,
+            previous_previous,
+            "like_count",
+        ),
+        previous_delta_views=_snapshot_delta(
+            previous,
+            previous_previous,
+            "view_count",
+        ),
+        previous_interval_minutes=_snapshot_interval_minutes(
+            previous,
+            previous_previous,
+        ),
+    )
+
+
+def _snapshot_delta(
+    current: MetricSample | None,
+    previous: MetricSample | None,
+    attr: str,
+) -> int:
+    if current is None or previous is None:
+        return 0
+    current_value = getattr(current, attr) or 0
+    previous_value = getattr(previous, attr) or 0
+    return max(int(current_value) - int(previous_value), 0)
+
+
+def _snapshot_interval_minutes(
+    current: MetricSample | None,
+    previous: MetricSample | None,
+) -> float | None:
+    if current is None or previous is None:
+        return None
+    elapsed_seconds = (
+        coerce_datetime(current.captured_at)
+        - coerce_datetime(previous.captured_at)
+    ).total_seconds()
+    if elapsed_seconds <= 0:
+        return None
+    return elapsed_seconds / 60
+
+
 class PostgresController:
     def __init__(self, database_url: str | None = None, analyzer: LLM | None = None):
         self.database_url = database_url
         self.analyzer = analyzer or LLM()
-        self._last_snapshot_cleanup_at: datetime | None = None
-        engine = get_engine(database_url)
-        Base.metadata.create_all(bind=engine)
-        self._ensure_board_columns(engine)
-        self._ensure_schema_compatibility(engine)
+        ensure_schema(database_url)
 
     def find(self, collection_name: str, query: dict) -> list[dict]:
         collection = collection_name.lower()
@@ -78,6 +247,15 @@ class PostgresController:
             stmt = self._apply_board_query(stmt, query)
             return [self._board_to_document(board) for board in session.scalars(stmt).all()]
 
+    def exists(self, collection_name: str, query: dict) -> bool:
+        """Return whether a board matches ``query`` without loading it."""
+        if collection_name.lower() not in BOARD_COLLECTIONS:
+            return False
+
+        with get_session_factory(self.database_url)() as session:
+            stmt = self._apply_board_query(select(Board.id), query).limit(1)
+            return session.execute(stmt).first() is not None
+
     def needs_content_refresh(self, collection_name: str, query: dict) -> bool:
         """Return whether an existing board lacks analyzable or recoverable body data."""
         if collection_name.lower() not in BOARD_COLLECTIONS:
@@ -87,25 +265,61 @@ class PostgresController:
             board = session.scalars(self._apply_board_query(select(Board), query)).first()
             if board is None:
                 return False
-            if has_sufficient_body(
-                board.title,
-                board.contents,
-                media_root=self._media_root(),
-            ):
-                return False
-            if board.analysis_status == "processing":
-                return False
-            if (
-                board.analysis_error == INSUFFICIENT_CONTENT_ANALYSIS_ERROR
-                and board.analysis_updated_at is not None
-            ):
-                updated_at = self._coerce_datetime(board.analysis_updated_at)
-                if (
-                    datetime.now(timezone.utc) - updated_at
-                    < self._content_refresh_cooldown()
-                ):
-                    return False
-            return True
+            return self._board_needs_content_refresh(board)
+
+    def ingest_feed(self, site: str, entries: list) -> FeedIngestResult:
+        """Refresh every stored post of one feed page in a single transaction.
+
+        ``entries`` are ``BoardListEntry`` objects.  Their source ids are
+        resolved with one query, native metrics of stored posts are recorded
+        and committed together, and only the entries that still need an
+        article-body fetch are handed back to the crawler.
+        """
+        entries_by_source_id = {}
+        for entry in entries:
+            source_id = self._source_id_from_query(
+                {"site": site, "category": entry.category, "no": entry.no}
+            )
+            entries_by_source_id.setdefault(source_id, entry)
+
+        existing_entries = []
+        new_entries = []
+        content_refresh_entries = []
+        with get_session_factory(self.database_url)() as session:
+            boards_by_source_id = self._boards_by_source_id(
+                session,
+                entries_by_source_id,
+                for_update=self._locks_rows(),
+            )
+            metric_updates = []
+            metric_changes = []
+            for source_id, entry in entries_by_source_id.items():
+                board = boards_by_source_id.get(source_id)
+                if board is None:
+                    new_entries.append(entry)
+                    continue
+                metric_document = self._native_metric_document(
+                    board,
+                    entry.metrics_dict(),
+                )
+                metric_changes.append(
+                    self._metric_change_ratio(board, metric_document)
+                )
+                metric_updates.append((board, metric_document))
+                existing_entries.append(entry)
+                if self._board_needs_content_refresh(board):
+                    content_refresh_entries.append(entry)
+            self._record_metric_snapshots(session, metric_updates)
+            session.commit()
+
+        return FeedIngestResult(
+            existing_entries=existing_entries,
+            new_entries=new_entries,
+            content_refresh_entries=content_refresh_entries,
+            metric_change_ratio=(
+                sum(metric_changes) / len(metric_changes) if metric_changes else 0.0
+            ),
+        )
 
     def refresh_crawled_content(
         self,
@@ -130,7 +344,7 @@ class PostgresController:
         now = datetime.now(timezone.utc)
         with get_session_factory(self.database_url)() as session:
             stmt = self._apply_board_query(select(Board), query)
-            if get_engine(self.database_url).dialect.name == "postgresql":
+            if self._locks_rows():
                 stmt = stmt.with_for_update()
             board = session.scalars(stmt).first()
             if board is None:
@@ -197,8 +411,7 @@ class PostgresController:
     def insert_one(self, collection_name: str, document: dict) -> InsertOneResult:
         collection = collection_name.lower()
         if collection in BOARD_COLLECTIONS:
-            board = self._upsert_board(collection, document)
-            return InsertOneResult(board.id)
+            return InsertOneResult(self._upsert_boards(collection, [document])[0])
         if collection == "gpt":
             return InsertOneResult(document.get("answer") or DEFAULT_GPT_ANSWER)
         if collection == "tag":
@@ -212,48 +425,102 @@ class PostgresController:
         collection_name: str,
         query: dict,
         metrics: dict,
+        *,
+        clear_source_rank: bool = False,
     ) -> dict | None:
         """Update only source metrics and ranking scores for an existing board.
 
         Crawlers use this path for posts that are still visible in a source site's
         popular feed.  It intentionally leaves title, body, analysis and local
-        reaction counts untouched.
+        reaction counts untouched.  Metric repolls read the post page rather
+        than the feed and pass ``clear_source_rank`` so a post that left the
+        feed stops earning its old feed-rank bonus.
         """
         if collection_name.lower() not in BOARD_COLLECTIONS:
             return None
 
         with get_session_factory(self.database_url)() as session:
-            board = session.scalars(self._apply_board_query(select(Board), query)).first()
+            stmt = self._apply_board_query(select(Board), query)
+            if self._locks_rows():
+                stmt = stmt.with_for_update()
+            board = session.scalars(stmt).first()
             if board is None:
                 return None
 
-            metric_document = {
-                key: metrics.get(key)
-                for key in (
-                    "native_comment_count",
-                    "native_like_count",
-                    "native_view_count",
-                    "source_rank",
-                    "metrics_crawled_at",
-                )
-                if key in metrics
-            }
-            previous_metric_values = {
-                "native_comment_count": board.native_comment_count,
-                "native_like_count": board.native_like_count,
-                "native_view_count": board.native_view_count,
-                "source_rank": board.source_rank,
-            }
-            for key, previous_value in previous_metric_values.items():
-                if metric_document.get(key) is None and previous_value is not None:
-                    metric_document[key] = previous_value
-            self._record_metric_snapshot(session, board, metric_document)
+            self._record_metric_snapshots(
+                session,
+                [
+                    (
+                        board,
+                        self._native_metric_document(
+                            board,
+                            metrics,
+                            keep_source_rank=not clear_source_rank,
+                        ),
+                    )
+                ],
+            )
             if "next_metrics_crawl_at" in metrics:
                 board.next_metrics_crawl_at = metrics.get("next_metrics_crawl_at")
             session.commit()
             session.refresh(board)
             return self._board_to_document(board)
 
+    def attach_media_path(
+        self,
+        collection_name: str,
+        query: dict,
+        source_url: str,
+        media_path: str,
+    ) -> int:
+        """Fill ``media_path`` on blocks that were stored with only ``source_url``.
+
+        Deferred downloads usually finish after their board was written.
+        When the board is not written yet, the path is kept as pending and
+        applied by the upsert that writes it.  Returns the number of boards
+        changed now.
+        """
+        if collection_name.lower() not in BOARD_COLLECTIONS:
+            return 0
+
+        # Register first so an upsert committing meanwhile still applies it.
+        source_id = self._source_id_from_query(query)
+        pending = get_pending_media_paths()
+        if source_id is not None:
+            pending.add(source_id, source_url, media_path)
+
+        changed = 0
+        found = False
+        with get_session_factory(self.database_url)() as session:
+            stmt = self._apply_board_query(select(Board), query)
+            if self._locks_rows():
+                stmt = stmt.with_for_update()
+            for board in session.scalars(stmt):
+                found = True
+                contents = self._with_media_paths(
+                    board.contents,
+                    {source_url: media_path},
+                )
+                if contents != board.contents:
+                    board.contents = contents
+                    changed += 1
+            session.commit()
+        if found and source_id is not None:
+            pending.discard(source_id, {source_url: media_path})
+        return changed
+
+    def insert_many(self, collection_name: str, documents: list[dict]) -> InsertManyResult:
+        """Upsert many crawled boards with one lookup and one commit."""
+        collection = collection_name.lower()
+        if collection in BOARD_COLLECTIONS:
+            return InsertManyResult(self._upsert_boards(collection, documents))
+        return InsertManyResult(
+            [
+                self.insert_one(collection_name, document).inserted_id
+                for document in documents
+            ]
+        )
+
     def update_one(self, collection_name: str, query: dict, update: dict) -> UpdateResult:
         collection = collection_name.lower()
         if collection not in BOARD_COLLECTIONS:
@@ -287,11 +554,148 @@ class PostgresController:
             session.commit()
             return DeleteResult(1)
 
-    def get_realtime_best(self, index: int, limit: int) -> list[dict]:
-        return self._list_boards(index=index, limit=limit, daily=False)
+    def due_metric_polls(
+        self,
+        sites,
+        until: datetime,
+        limit: int,
+    ) -> list[dict]:
+        """Return stored posts whose native metrics are due by ``until``.
+
+        Rows come from the ``next_metrics_crawl_at`` index in due order and
+        carry just what a site needs to fetch one post's metrics again.
+        """
+        sites = set(sites)
+        if not sites or limit <= 0:
+            return []
+
+        with get_session_factory(self.database_url)() as session:
+            rows = session.execute(
+                select(
+                    Board.source_id,
+                    Board.site,
+                    Board.category,
+                    Board.no,
+                    Board.url,
+                    Board.created_at,
+                    Board.next_metrics_crawl_at,
+                )
+                .where(
+                    Board.next_metrics_crawl_at.is_not(None),
+                    Board.next_metrics_crawl_at <= until,
+                    Board.site.in_(sites),
+                )
+                .order_by(Board.next_metrics_crawl_at)
+                .limit(limit)
+            ).all()
+        return [
+            {
+                "source_id": row.source_id,
+                "site": row.site,
+                "category": row.category,
+                "no": row.no,
+                "url": row.url,
+                "created_at": coerce_datetime(row.created_at),
+                "next_metrics_crawl_at": coerce_datetime(row.next_metrics_crawl_at),
+            }
+            for row in rows
+        ]
+
+    def get_realtime_best(
+        self,
+        index: int,
+        limit: int,
+        *,
+        summary: bool = False,
+    ) -> list[dict]:
+        return self._list_boards(index=index, limit=limit, daily=False, summary=summary)
+
+    def get_daily_best(
+        self,
+        index: int,
+        limit: int,
+        *,
+        summary: bool = False,
+    ) -> list[dict]:
+        return self._list_boards(index=index, limit=limit, daily=True, summary=summary)
 
-    def get_daily_best(self, index: int, limit: int) -> list[dict]:
-        return self._list_boards(index=index, limit=limit, daily=True)
+    def list_boards_after(
+        self,
+        cursor: str | None,
+        limit: int,
+        *,
+        daily: bool = False,
+        summary: bool = False,
+    ) -> BoardPage:
+        """Return the ranked boards that follow ``cursor`` (keyset pagination).
+
+        The cursor is an opaque token holding the last row's ranking columns
+        and id.  Each page is one index range scan whatever its depth, and
+        because rank keys do not change as scores decay, consecutive pages
+        never repeat or skip a board unless its score was rewritten.
+        With ``summary=True`` only ``BOARD_SUMMARY_COLUMNS`` are selected.
+        """
+        limit = max(int(limit), 1)
+        order = self._ranking_order(daily=daily)
+        columns = [clause.element for clause in order]
+        stmt = self._board_listing(summary).order_by(*order).limit(limit + 1)
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(*columns) < tuple_(*self._decode_board_cursor(cursor, daily=daily))
+            )
+
+        score_as_of = datetime.now(timezone.utc)
+        with get_session_factory(self.database_url)() as session:
+            boards = session.scalars(stmt).all()
+            next_cursor = (
+                self._encode_board_cursor(boards[limit - 1], columns, daily=daily)
+                if len(boards) > limit
+                else None
+            )
+            to_document = self._board_to_summary if summary else self._board_to_document
+            return BoardPage(
+                items=[
+                    to_document(board, score_as_of=score_as_of)
+                    for board in boards[:limit]
+                ],
+                next_cursor=next_cursor,
+            )
+
+    def find_by_tags(
+        self,
+        tags: list[str] | str,
+        since: datetime | None = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        """Return summaries of boards carrying every tag, best ranked first.
+
+        On PostgreSQL the filter is a JSONB ``@>`` containment served by the
+        GIN index on ``tags``; SQLite falls back to ``json_each``.  ``since``
+        limits results to boards created at or after that instant.
+        """
+        tags = self._normalize_tags(tags)
+        if not tags or limit <= 0:
+            return []
+
+        stmt = self._board_listing(summary=True)
+        if get_engine(self.database_url).dialect.name == "postgresql":
+            stmt = stmt.where(Board.tags.op("@>")(literal(tags, JSONB)))
+        else:
+            for tag in tags:
+                tag_values = func.json_each(Board.tags).table_valued("value")
+                stmt = stmt.where(
+                    select(tag_values.c.value).where(tag_values.c.value == tag).exists()
+                )
+        if since is not None:
+            stmt = stmt.where(Board.created_at >= coerce_datetime(since))
+        stmt = stmt.order_by(*self._ranking_order(daily=False)).limit(limit)
+
+        score_as_of = datetime.now(timezone.utc)
+        with get_session_factory(self.database_url)() as session:
+            return [
+                self._board_to_summary(board, score_as_of=score_as_of)
+                for board in session.scalars(stmt).all()
+            ]
 
     def record_daily_top10_snapshot(
         self,
@@ -302,20 +706,17 @@ class PostgresController:
         captured_at = self._snapshot_captured_at(captured_at)
         snapshot_date = captured_at.astimezone(SEOUL_TIMEZONE).date()
         snapshot_limit = max(int(limit), 0)
-        score_expression = self._effective_score_expression(
-            daily=True,
-            as_of=captured_at,
-        )
 
         with get_session_factory(self.database_url)() as session:
             with session.begin():
                 ranked_boards = session.execute(
-                    select(Board.id, score_expression.label("effective_daily_score"))
-                    .order_by(
-                        desc(score_expression),
-                        desc(Board.like_count),
-                        desc(Board.created_at),
+                    select(
+                        Board.id,
+                        Board.daily_score,
+                        Board.score_updated_at,
+                        Board.created_at,
                     )
+                    .order_by(*self._ranking_order(daily=True))
                     .limit(snapshot_limit)
                 ).all()
                 session.execute(
@@ -328,45 +729,212 @@ class PostgresController:
                         DailyTop10Snapshot(
                             snapshot_date=snapshot_date,
                             rank=rank,
-                            board_id=board_id,
-                            daily_score=float(daily_score or 0.0),
+                            board_id=board.id,
+                            daily_score=self._effective_score_value(
+                                board.daily_score,
+                                board.score_updated_at or board.created_at,
+                                captured_at,
+                                DAILY_DECAY_HOURS,
+                            ),
                             captured_at=captured_at,
                         )
-                        for rank, (board_id, daily_score) in enumerate(
-                            ranked_boards,
-                            start=1,
-                        )
+                        for rank, board in enumerate(ranked_boards, start=1)
                     ]
                 )
 
         return len(ranked_boards)
 
-    def _upsert_board(self, collection_name: str, document: dict) -> Board:
-        source_id = self._source_id_from_document(collection_name, document)
+    def _upsert_boards(self, collection_name: str, documents: list[dict]) -> list[str]:
+        documents_with_source_ids = [
+            (self._source_id_from_document(collection_name, document), document)
+            for document in documents
+        ]
+        pending = get_pending_media_paths()
+        applied_media_paths = {}
         with get_session_factory(self.database_url)() as session:
-            board = session.scalar(select(Board).where(Board.source_id == source_id))
-            values = self._board_values(collection_name, document, board)
-            if board is None:
-                board = Board(**values)
-                session.add(board)
-                session.flush()
-            else:
-                for key, value in values.items():
-                    if key in {"id", "like_count"}:
-                        continue
-                    setattr(board, key, value)
+            boards_by_source_id = self._boards_by_source_id(
+                session,
+                [source_id for source_id, _ in documents_with_source_ids],
+                for_update=self._locks_rows(),
+            )
+            board_documents = []
+            for source_id, document in documents_with_source_ids:
+                board = boards_by_source_id.get(source_id)
+                values = self.board_values(collection_name, document, board)
+                media_paths = pending.peek(source_id)
+                if media_paths:
+                    values["contents"] = self._with_media_paths(
+                        values["contents"],
+                        media_paths,
+                    )
+                    applied_media_paths[source_id] = media_paths
+                if board is None:
+                    board = Board(**values)
+                    session.add(board)
+                    boards_by_source_id[source_id] = board
+                else:
+                    for key, value in values.items():
+                        if key in {"id", "like_count"}:
+                            continue
+                        setattr(board, key, value)
+                board_documents.append((board, document))
+
+            self._record_metric_snapshots(session, board_documents)
+            board_ids = [board.id for board, _ in board_documents]
+            session.commit()
+
+        # Pending paths are dropped only once the boards holding them are
+        # committed; a failed upsert leaves them for its retry.
+        for source_id, media_paths in applied_media_paths.items():
+            pending.discard(source_id, media_paths)
+        self._attach_late_media_paths(
+            {source_id for source_id, _ in documents_with_source_ids}
+        )
+        return board_ids
+
+    def _attach_late_media_paths(self, source_ids: set[str]) -> None:
+        """Apply paths registered while the upsert of their board was open.
 
-            self._record_metric_snapshot(session, board, document)
+        ``attach_media_path`` cannot see a board whose insert is not
+        committed yet, so a download finishing in that window stays pending
+        until the now committed board is written here.
+        """
+        pending = get_pending_media_paths()
+        late_media_paths = {
+            source_id: media_paths
+            for source_id in source_ids
+            if (media_paths := pending.peek(source_id))
+        }
+        if not late_media_paths:
+            return
+
+        with get_session_factory(self.database_url)() as session:
+            boards = self._boards_by_source_id(
+                session,
+                list(late_media_paths),
+                for_update=self._locks_rows(),
+            )
+            for source_id, board in boards.items():
+                contents = self._with_media_paths(
+                    board.contents,
+                    late_media_paths[source_id],
+                )
+                if contents != board.contents:
+                    board.contents = contents
             session.commit()
-            session.refresh(board)
-            return board
+        for source_id in boards:
+            pending.discard(source_id, late_media_paths[source_id])
+
+    @staticmethod
+    def _with_media_paths(contents, media_paths: dict[str, str]) -> list:
+        return [
+            {**block, "media_path": media_paths[block.get("source_url")]}
+            if isinstance(block, dict)
+            and block.get("type") in MEDIA_TYPES
+            and block.get("source_url") in media_paths
+            and not block.get("media_path")
+            else block
+            for block in contents or []
+        ]
+
+    def _locks_rows(self) -> bool:
+        """Whether board reads that are written back should lock their rows.
+
+        Site crawls, metric repolls and deferred media attach update the same
+        boards concurrently; SQLite serializes writers on its own.
+        """
+        return get_engine(self.database_url).dialect.name == "postgresql"
+
+    @staticmethod
+    def _boards_by_source_id(
+        session,
+        source_ids,
+        *,
+        for_update: bool = False,
+    ) -> dict[str, Board]:
+        """Load boards by source id, optionally locking them.
+
+        Rows are locked in source-id order so concurrent feed ingests and
+        metric repolls over overlapping boards cannot deadlock.
+        """
+        source_ids = set(source_ids)
+        if not source_ids:
+            return {}
+        stmt = select(Board).where(Board.source_id.in_(source_ids))
+        if for_update:
+            stmt = stmt.order_by(Board.source_id).with_for_update()
+        return {board.source_id: board for board in session.scalars(stmt)}
+
+    @staticmethod
+    def _native_metric_document(
+        board: Board,
+        metrics: dict,
+        *,
+        keep_source_rank: bool = True,
+    ) -> dict:
+        """Fill metrics the source did not report with the board's last values."""
+        metric_document = {
+            key: metrics.get(key)
+            for key in (
+                "native_comment_count",
+                "native_like_count",
+                "native_view_count",
+                "source_rank",
+                "metrics_crawled_at",
+            )
+            if key in metrics
+        }
+        previous_metric_values = {
+            "native_comment_count": board.native_comment_count,
+            "native_like_count": board.native_like_count,
+            "native_view_count": board.native_view_count,
+        }
+        if keep_source_rank:
+            previous_metric_values["source_rank"] = board.source_rank
+        else:
+            metric_document["source_rank"] = None
+        for key, previous_value in previous_metric_values.items():
+            if metric_document.get(key) is None and previous_value is not None:
+                metric_document[key] = previous_value
+        return metric_document
+
+    @classmethod
+    def _metric_change_ratio(cls, board: Board, metric_document: dict) -> float:
+        previous = (board.native_comment_count or 0) + (board.native_like_count or 0)
+        current = (
+            (optional_int(metric_document.get("native_comment_count")) or 0)
+            + (optional_int(metric_document.get("native_like_count")) or 0)
+        )
+        return min(abs(current - previous) / max(previous, 1), 1.0)
+
+    def _board_needs_content_refresh(self, board: Board) -> bool:
+        if has_sufficient_body(
+            board.title,
+            board.contents,
+            media_root=self._media_root(),
+        ):
+            return False
+        if board.analysis_status == "processing":
+            return False
+        if (
+            board.analysis_error == INSUFFICIENT_CONTENT_ANALYSIS_ERROR
+            and board.analysis_updated_at is not None
+        ):
+            updated_at = coerce_datetime(board.analysis_updated_at)
+            if (
+                datetime.now(timezone.utc) - updated_at
+                < self._content_refresh_cooldown()
+            ):
+                return False
+        return True
 
-    def _board_values(
+    def board_values(
         self,
         collection_name: str,
         document: dict,
         existing_board: Board | None = None,
     ) -> dict:
+        """Return the ``boards`` column values for a crawled ``document``."""
         site = str(document.get("site") or "unknown")
         category, no = self._category_and_no(collection_name, document)
         title = str(
@@ -456,19 +1024,19 @@ class PostgresController:
             "thumbnail": document.get("thumbnail") or first_thumbnail_path(contents),
             "comment_count": int(document.get("comment_count") or 0),
             "like_count": int(document.get("like_count") or 0),
-            "native_comment_count": self._optional_int(
+            "native_comment_count": optional_int(
                 document.get("native_comment_count", document.get("comment_count"))
             ),
-            "native_like_count": self._optional_int(
+            "native_like_count": optional_int(
                 document.get("native_like_count", document.get("like_count"))
             ),
-            "native_view_count": self._optional_int(
+            "native_view_count": optional_int(
                 document.get("native_view_count", document.get("view_count"))
             ),
-            "source_rank": self._optional_int(document.get("source_rank")),
+            "source_rank": optional_int(document.get("source_rank")),
             "metrics_crawled_at": document.get("metrics_crawled_at"),
             "next_metrics_crawl_at": document.get("next_metrics_crawl_at"),
-            "created_at": self._coerce_datetime(document.get("create_time") or document.get("created_at")),
+            "created_at": coerce_datetime(document.get("create_time") or document.get("created_at")),
             **analysis_queue_values,
         }
 
@@ -533,49 +1101,116 @@ class PostgresController:
             return f"{site}:{self._source_token(board_id)}"
         return None
 
-    def _list_boards(self, index: int, limit: int, daily: bool) -> list[dict]:
+    def _list_boards(
+        self,
+        index: int,
+        limit: int,
+        daily: bool,
+        summary: bool = False,
+    ) -> list[dict]:
+        """Return one ranked page, served from the ranking cache when fresh.
+
+        Cached pages keep the stored scores and their ``score_updated_at``;
+        the decay to ``score_as_of`` is applied per call, so a cached page
+        reports the same scores as a fresh query would.
+        """
         offset = max(index, 0) * max(limit, 1)
-        ordering = desc(self._effective_score_expression(daily=daily))
-        secondary_ordering = desc(Board.like_count) if daily else desc(Board.created_at)
         score_as_of = datetime.now(timezone.utc)
-        with get_session_factory(self.database_url)() as session:
-            boards = session.scalars(
-                select(Board)
-                .order_by(ordering, secondary_ordering, desc(Board.created_at))
-                .offset(offset)
-                .limit(limit)
-            ).all()
-            return [
-                self._board_to_document(board, score_as_of=score_as_of)
-                for board in boards
-            ]
-
-    def _effective_score_expression(
+        cache = get_ranking_cache()
+        cache_key = (self.database_url, daily, summary, offset, limit)
+        page = cache.get(cache_key)
+        if page is None:
+            generation = cache.generation
+            to_document = self._board_to_summary if summary else self._board_to_document
+            with get_session_factory(self.database_url)() as session:
+                boards = session.scalars(
+                    self._board_listing(summary)
+                    .order_by(*self._ranking_order(daily=daily))
+                    .offset(offset)
+                    .limit(limit)
+                ).all()
+                page = [
+                    (to_document(board), board.score_updated_at or board.created_at)
+                    for board in boards
+                ]
+            cache.put(cache_key, generation, page)
+        return [
+            self._decayed_document(document, updated_at, score_as_of)
+            for document, updated_at in page
+        ]
+
+    def _decayed_document(
         self,
-        *,
-        daily: bool,
-        as_of: datetime | None = None,
-    ):
-        score_column = Board.daily_score if daily else Board.hot_score
-        decay_hours = DAILY_DECAY_HOURS if daily else HOT_DECAY_HOURS
-        updated_at = func.coalesce(Board.score_updated_at, Board.created_at)
-        reference_time = (
-            func.current_timestamp()
-            if as_of is None
-            else literal(as_of, type_=DateTime(timezone=True))
-        )
-        engine = get_engine(self.database_url)
-        if engine.dialect.name == "postgresql":
-            elapsed_hours = func.greatest(
-                func.extract("epoch", reference_time - updated_at) / 3600.0,
-                0.0,
+        document: dict,
+        updated_at: datetime,
+        score_as_of: datetime,
+    ) -> dict:
+        return {
+            **document,
+            "hot_score": self._effective_score_value(
+                document["hot_score"],
+                updated_at,
+                score_as_of,
+                HOT_DECAY_HOURS,
+            ),
+            "daily_score": self._effective_score_value(
+                document["daily_score"],
+                updated_at,
+                score_as_of,
+                DAILY_DECAY_HOURS,
+            ),
+        }
+
+    @staticmethod
+    def _board_listing(summary: bool):
+        stmt = select(Board)
+        if summary:
+            stmt = stmt.options(load_only(*BOARD_SUMMARY_COLUMNS, raiseload=True))
+        return stmt
+
+    @staticmethod
+    def _ranking_order(*, daily: bool) -> tuple:
+        """Order by the stored rank key, matching the ranking index columns.
+
+        Sorting by the key is the same as sorting by the score decayed to
+        any common instant, so no per-row decay is evaluated.  The id makes
+        the order total, which keyset cursors rely on.
+        """
+        if daily:
+            return (
+                desc(Board.daily_rank_key),
+                desc(Board.like_count),
+                desc(Board.created_at),
+                desc(Board.id),
             )
-        else:
-            elapsed_hours = func.max(
-                (func.julianday(reference_time) - func.julianday(updated_at)) * 24.0,
-                0.0,
+        return desc(Board.hot_rank_key), desc(Board.created_at), desc(Board.id)
+
+    @staticmethod
+    def _encode_board_cursor(board: Board, columns: list, *, daily: bool) -> str:
+        values = [getattr(board, column.key) for column in columns]
+        payload = {
+            "daily": daily,
+            "values": [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in values
+            ],
+        }
+        token = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(token).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_board_cursor(cursor: str, *, daily: bool) -> list:
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
             )
-        return func.coalesce(score_column, 0.0) * func.exp(-elapsed_hours / decay_hours)
+            values = payload["values"]
+            if payload["daily"] is not daily or len(values) != (4 if daily else 3):
+                raise ValueError("cursor belongs to another listing")
+            values[-2] = datetime.fromisoformat(values[-2])
+            return values
+        except (binascii.Error, KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"invalid board cursor: {cursor!r}") from exc
 
     @staticmethod
     def _snapshot_captured_at(captured_at: datetime | None) -> datetime:
@@ -600,35 +1235,12 @@ class PostgresController:
             session.refresh(log)
             return InsertOneResult(log.id)
 
-    @staticmethod
-    def _ensure_schema_compatibility(engine) -> None:
-        if engine.dialect.name != "postgresql":
-            return
-
-        with engine.begin() as connection:
-            connection.execute(text("ALTER TABLE boards ALTER COLUMN no TYPE BIGINT"))
-
     def _board_to_document(
         self,
         board: Board,
         score_as_of: datetime | None = None,
     ) -> dict:
-        hot_score = board.hot_score
-        daily_score = board.daily_score
-        if score_as_of is not None:
-            updated_at = board.score_updated_at or board.created_at
-            hot_score = self._effective_score_value(
-                hot_score,
-                updated_at,
-                score_as_of,
-                HOT_DECAY_HOURS,
-            )
-            daily_score = self._effective_score_value(
-                daily_score,
-                updated_at,
-                score_as_of,
-                DAILY_DECAY_HOURS,
-            )
+        hot_score, daily_score = self._board_scores(board, score_as_of)
         return {
             "_id": board.id,
             "id": board.id,
@@ -650,7 +1262,7 @@ class PostgresController:
             "analysis_requested_at": board.analysis_requested_at,
             "analysis_started_at": board.analysis_started_at,
             "analysis_updated_at": board.analysis_updated_at,
-            "create_time": self._coerce_datetime(board.created_at),
+            "create_time": coerce_datetime(board.created_at),
             "thumbnail": board.thumbnail,
             "comment_count": int(board.comment_count or 0),
             "like_count": int(board.like_count or 0),
@@ -665,6 +1277,57 @@ class PostgresController:
             "score_updated_at": board.score_updated_at,
         }
 
+    def _board_to_summary(
+        self,
+        board: Board,
+        score_as_of: datetime | None = None,
+    ) -> dict:
+        hot_score, daily_score = self._board_scores(board, score_as_of)
+        return {
+            "_id": board.id,
+            "id": board.id,
+            "source_id": board.source_id,
+            "category": board.category,
+            "no": board.no,
+            "site": board.site,
+            "title": board.title,
+            "url": board.url,
+            "thumbnail": board.thumbnail,
+            "tags": board.tags or [],
+            "create_time": coerce_datetime(board.created_at),
+            "comment_count": int(board.comment_count or 0),
+            "like_count": int(board.like_count or 0),
+            "native_comment_count": board.native_comment_count,
+            "native_like_count": board.native_like_count,
+            "native_view_count": board.native_view_count,
+            "source_rank": board.source_rank,
+            "hot_score": hot_score,
+            "daily_score": daily_score,
+        }
+
+    def _board_scores(
+        self,
+        board: Board,
+        score_as_of: datetime | None,
+    ) -> tuple[float | None, float | None]:
+        if score_as_of is None:
+            return board.hot_score, board.daily_score
+        updated_at = board.score_updated_at or board.created_at
+        return (
+            self._effective_score_value(
+                board.hot_score,
+                updated_at,
+                score_as_of,
+                HOT_DECAY_HOURS,
+            ),
+            self._effective_score_value(
+                board.daily_score,
+                updated_at,
+                score_as_of,
+                DAILY_DECAY_HOURS,
+            ),
+        )
+
     @staticmethod
     def _effective_score_value(
         score: float | None,
@@ -829,83 +1492,6 @@ class PostgresController:
                 break
         return normalized
 
-    @staticmethod
-    def _ensure_board_columns(engine) -> None:
-        inspector = inspect(engine)
-        if not inspector.has_table("boards"):
-            return
-
-        existing_columns = {column["name"] for column in inspector.get_columns("boards")}
-        column_definitions = {
-            "tags": "JSON",
-            "llm_engagement_score": "INTEGER",
-            "llm_engagement_reason": "TEXT",
-            "analysis_status": "VARCHAR(32) NOT NULL DEFAULT 'pending'",
-            "analysis_priority": "INTEGER NOT NULL DEFAULT 0",
-            "analysis_requested_at": "TIMESTAMP",
-            "analysis_started_at": "TIMESTAMP",
-            "analysis_updated_at": "TIMESTAMP",
-            "analysis_retry_count": "INTEGER NOT NULL DEFAULT 0",
-            "analysis_error": "TEXT",
-            "native_comment_count": "INTEGER",
-            "native_like_count": "INTEGER",
-            "native_view_count": "INTEGER",
-            "source_rank": "INTEGER",
-            "metrics_crawled_at": "TIMESTAMP",
-            "next_metrics_crawl_at": "TIMESTAMP",
-            "hot_score": "FLOAT",
-            "daily_score": "FLOAT",
-            "score_updated_at": "TIMESTAMP",
-            "score_breakdown": "JSON",
-        }
-        missing_columns = {
-            column_name: definition
-            for column_name, definition in column_definitions.items()
-            if column_name not in existing_columns
-        }
-        existing_index_names = {
-            index["name"]
-            for index in inspector.get_indexes("board_metric_snapshots")
-        }
-        index_definitions = {
-            "ix_board_metric_snapshots_board_captured_at": (
-                "ON board_metric_snapshots (board_id, captured_at)"
-            ),
-            "ix_board_metric_snapshots_captured_at": (
-                "ON board_metric_snapshots (captured_at)"
-            ),
-        }
-        missing_indexes = {
-            name: definition
-            for name, definition in index_definitions.items()
-            if name not in existing_index_names
-        }
-        if not missing_columns and not missing_indexes:
-            return
-
-        with engine.begin() as connection:
-            for column_name, definition in missing_columns.items():
-                if_not_exists = "IF NOT EXISTS " if engine.dialect.name == "postgresql" else ""
-                connection.execute(
-                    text(
-                        f"ALTER TABLE boards ADD COLUMN {if_not_exists}{column_name} {definition}"
-                    )
-                )
-            for index_name, definition in missing_indexes.items():
-                connection.execute(
-                    text(f"CREATE INDEX IF NOT EXISTS {index_name} {definition}")
-                )
-            if "llm_engagement_score" in missing_columns:
-                connection.execute(
-                    text(
-                        "UPDATE boards SET analysis_status = 'pending', "
-                        "analysis_retry_count = 0 "
-                        "WHERE llm_engagement_score IS NULL "
-                        "AND gpt_answer IS NOT NULL AND gpt_answer <> :default_answer"
-                    ),
-                    {"default_answer": DEFAULT_GPT_ANSWER},
-                )
-
     @staticmethod
     def _source_token(value: object) -> str:
         if isinstance(value, (tuple, list)):
@@ -921,15 +1507,6 @@ class PostgresController:
         except (TypeError, ValueError):
             return abs(hash(str(value))) % 2_147_483_647
 
-    @staticmethod
-    def _optional_int(value: object) -> int | None:
-        if value is None or value == "":
-            return None
-        try:
-            return max(int(value), 0)
-        except (TypeError, ValueError):
-            return None
-
     @staticmethod
     def _optional_score(value: object) -> int | None:
         if value is None or value == "":
@@ -999,14 +1576,6 @@ class PostgresController:
             return value
         return json.dumps(value, ensure_ascii=False, default=str)
 
-    @staticmethod
-    def _coerce_datetime(value: object) -> datetime:
-        if isinstance(value, datetime):
-            if value.tzinfo is None:
-                return value.replace(tzinfo=timezone.utc)
-            return value
-        return datetime.now(timezone.utc)
-
     @staticmethod
     def _extract_thumbnail(contents: object) -> str | None:
         return first_thumbnail_path(contents)
@@ -1015,114 +1584,116 @@ class PostgresController:
     def _json_safe(value: object):
         return json.loads(json.dumps(value, ensure_ascii=False, default=str))
 
-    def _record_metric_snapshot(self, session, board: Board, document: dict) -> None:
-        comment_count = self._optional_int(
-            document.get("native_comment_count", document.get("comment_count"))
-        )
-        like_count = self._optional_int(document.get("native_like_count", document.get("like_count")))
-        view_count = self._optional_int(document.get("native_view_count", document.get("view_count")))
-        source_rank = self._optional_int(document.get("source_rank"))
-        captured_at = document.get("metrics_crawled_at") or datetime.now(timezone.utc)
-        if not isinstance(captured_at, datetime):
-            captured_at = datetime.now(timezone.utc)
-        if captured_at.tzinfo is None:
-            captured_at = captured_at.replace(tzinfo=timezone.utc)
+    def _record_metric_snapshots(
+        self,
+        session,
+        board_documents: list[tuple[Board, dict]],
+    ) -> None:
+        """Score and snapshot native metrics for many boards at once.
+
+        Velocity inputs come from the rolling ``last_snapshot_*`` and
+        ``prior_snapshot_*`` columns of the board rows already loaded, which
+        are shifted forward in the same write.  Snapshot rows are only
+        appended, in one multi-row insert, and never read back here.  A board
+        listed more than once is scored against its earlier entry.
+        """
+        if not board_documents:
+            return
 
-        if (
-            self._last_snapshot_cleanup_at is None
-            or captured_at - self._last_snapshot_cleanup_at >= SNAPSHOT_CLEANUP_INTERVAL
-        ):
-            session.execute(
-                delete(BoardMetricSnapshot).where(
-                    BoardMetricSnapshot.captured_at
-                    < captured_at - timedelta(days=SNAPSHOT_RETENTION_DAYS),
-                )
-            )
-            self._last_snapshot_cleanup_at = captured_at
-        previous_snapshots = session.scalars(
-            select(BoardMetricSnapshot)
-            .where(BoardMetricSnapshot.board_id == board.id)
-            .order_by(desc(BoardMetricSnapshot.captured_at))
-            .limit(2)
-        ).all()
-        previous_snapshot = previous_snapshots[0] if previous_snapshots else None
-        previous_previous_snapshot = previous_snapshots[1] if len(previous_snapshots) > 1 else None
-        scores = calculate_popularity_scores(
-            PopularityMetrics(
-                site=board.site,
-                created_at=board.created_at,
+        session.flush()
+        captures = []
+        for board, document in board_documents:
+            captured_at = document.get("metrics_crawled_at") or datetime.now(timezone.utc)
+            if not isinstance(captured_at, datetime):
+                captured_at = datetime.now(timezone.utc)
+            if captured_at.tzinfo is None:
+                captured_at = captured_at.replace(tzinfo=timezone.utc)
+            capture = BoardMetricSnapshot(
+                id=str(uuid4()),
+                board_id=board.id,
                 captured_at=captured_at,
-                comment_count=comment_count or 0,
-                like_count=like_count or 0,
-                view_count=view_count,
-                source_rank=source_rank,
-                llm_engagement_score=board.llm_engagement_score,
-                previous_comment_count=getattr(previous_snapshot, "comment_count", None),
-                previous_like_count=getattr(previous_snapshot, "like_count", None),
-                previous_view_count=getattr(previous_snapshot, "view_count", None),
-                previous_captured_at=getattr(previous_snapshot, "captured_at", None),
-                previous_delta_comments=self._snapshot_delta(
-                    previous_snapshot,
-                    previous_previous_snapshot,
-                    "comment_count",
+                comment_count=optional_int(
+                    document.get("native_comment_count", document.get("comment_count"))
                 ),
-                previous_delta_likes=self._snapshot_delta(
-                    previous_snapshot,
-                    previous_previous_snapshot,
-                    "like_count",
+                like_count=optional_int(
+                    document.get("native_like_count", document.get("like_count"))
                 ),
-                previous_delta_views=self._snapshot_delta(
-                    previous_snapshot,
-                    previous_previous_snapshot,
-                    "view_count",
+                view_count=optional_int(
+                    document.get("native_view_count", document.get("view_count"))
                 ),
-                previous_interval_minutes=self._snapshot_interval_minutes(
+                source_rank=optional_int(document.get("source_rank")),
+                crawl_status="success",
+            )
+            captures.append(capture)
+
+            previous_snapshot, previous_previous_snapshot = self._rolling_metric_samples(
+                board
+            )
+            scores = calculate_popularity_scores(
+                popularity_metrics(
+                    board,
+                    capture,
                     previous_snapshot,
                     previous_previous_snapshot,
-                ),
+                )
             )
-        )
 
-        session.add(
-            BoardMetricSnapshot(
-                board_id=board.id,
-                captured_at=captured_at,
-                comment_count=comment_count or 0,
-                like_count=like_count or 0,
-                view_count=view_count,
-                source_rank=source_rank,
+            board.prior_snapshot_at = board.last_snapshot_at
+            board.prior_snapshot_comment_count = board.last_snapshot_comment_count
+            board.prior_snapshot_like_count = board.last_snapshot_like_count
+            board.prior_snapshot_view_count = board.last_snapshot_view_count
+            board.last_snapshot_at = capture.captured_at
+            board.last_snapshot_comment_count = capture.comment_count or 0
+            board.last_snapshot_like_count = capture.like_count or 0
+            board.last_snapshot_view_count = capture.view_count
+
+            board.native_comment_count = capture.comment_count
+            board.native_like_count = capture.like_count
+            board.native_view_count = capture.view_count
+            board.source_rank = capture.source_rank
+            board.metrics_crawled_at = capture.captured_at
+            board.hot_score = scores.hot_score
+            board.daily_score = scores.daily_score
+            board.score_breakdown = scores.breakdown
+            board.score_updated_at = capture.captured_at
+            board.next_metrics_crawl_at = next_metrics_crawl_at(
+                hot_score=scores.hot_score,
+                created_at=board.created_at,
+                captured_at=capture.captured_at,
             )
-        )
-        board.native_comment_count = comment_count
-        board.native_like_count = like_count
-        board.native_view_count = view_count
-        board.source_rank = source_rank
-        board.metrics_crawled_at = captured_at
-        board.hot_score = scores.hot_score
-        board.daily_score = scores.daily_score
-        board.score_breakdown = scores.breakdown
-        board.score_updated_at = captured_at
 
-    @staticmethod
-    def _snapshot_delta(
-        current: BoardMetricSnapshot | None,
-        previous: BoardMetricSnapshot | None,
-        attr: str,
-    ) -> int:
-        if current is None or previous is None:
-            return 0
-        current_value = getattr(current, attr) or 0
-        previous_value = getattr(previous, attr) or 0
-        return max(int(current_value) - int(previous_value), 0)
+        session.execute(
+            insert(BoardMetricSnapshot),
+            [
+                {
+                    "id": capture.id,
+                    "board_id": capture.board_id,
+                    "captured_at": capture.captured_at,
+                    "comment_count": capture.comment_count or 0,
+                    "like_count": capture.like_count or 0,
+                    "view_count": capture.view_count,
+                    "source_rank": capture.source_rank,
+                    "crawl_status": capture.crawl_status,
+                }
+                for capture in captures
+            ],
+        )
 
     @staticmethod
-    def _snapshot_interval_minutes(
-        current: BoardMetricSnapshot | None,
-        previous: BoardMetricSnapshot | None,
-    ) -> float | None:
-        if current is None or previous is None:
-            return None
-        elapsed_seconds = (current.captured_at - previous.captured_at).total_seconds()
-        if elapsed_seconds <= 0:
-            return None
-        return elapsed_seconds / 60
+    def _rolling_metric_samples(
+        board: Board,
+    ) -> tuple[MetricSample | None, MetricSample | None]:
+        samples = []
+        for prefix in ("last", "prior"):
+            captured_at = getattr(board, f"{prefix}_snapshot_at")
+            samples.append(
+                None
+                if captured_at is None
+                else MetricSample(
+                    captured_at=captured_at,
+                    comment_count=getattr(board, f"{prefix}_snapshot_comment_count"),
+                    like_count=getattr(board, f"{prefix}_snapshot_like_count"),
+                    view_count=getattr(board, f"{prefix}_snapshot_view_count"),
+                )
+            )
+        return samples[0], samples[1]
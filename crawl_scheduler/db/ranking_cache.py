@@ -0,0 +1,111 @@
+"""In-process cache of ranked listing pages.
+
+Pages hold raw scores; callers decay them to their own ``score_as_of``.
+Every committed ORM write to ``boards`` bumps a generation counter that
+drops all cached pages, and bulk paths that write through Core call
+``invalidate`` themselves.  A page read under an older generation is never
+stored, so a listing that raced a score write is simply not cached.
+"""
+
+from collections import OrderedDict
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from crawl_scheduler.db.models import Board
+
+
+DEFAULT_RANKING_CACHE_TTL_SECONDS = 30
+DEFAULT_RANKING_CACHE_MAX_PAGES = 256
+
+
+class RankingCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_RANKING_CACHE_TTL_SECONDS,
+        max_pages: int = DEFAULT_RANKING_CACHE_MAX_PAGES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        self._generation = 0
+        self._pages: OrderedDict[tuple, tuple[int, float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: tuple) -> list | None:
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is None:
+                return None
+            generation, stored_at, page = cached
+            if (
+                generation != self._generation
+                or time.monotonic() - stored_at >= self.ttl_seconds
+            ):
+                del self._pages[key]
+                return None
+            self._pages.move_to_end(key)
+            return page
+
+    def put(self, key: tuple, generation: int, page: list) -> None:
+        if self.ttl_seconds <= 0 or self.max_pages <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pages[key] = (generation, time.monotonic(), page)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._pages.clear()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+def _env_number(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 0)
+    except ValueError:
+        return default
+
+
+_RANKING_CACHE = RankingCache(
+    ttl_seconds=_env_number("RANKING_CACHE_TTL_SECONDS", DEFAULT_RANKING_CACHE_TTL_SECONDS),
+    max_pages=_env_number("RANKING_CACHE_MAX_PAGES", DEFAULT_RANKING_CACHE_MAX_PAGES),
+)
+
+
+def get_ranking_cache() -> RankingCache:
+    return _RANKING_CACHE
+
+
+@event.listens_for(Session, "after_flush")
+def _note_board_writes(session: Session, flush_context) -> None:
+    if any(
+        isinstance(instance, Board)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["boards_written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_board_writes(session: Session) -> None:
+    if session.info.pop("boards_written", False):
+        _RANKING_CACHE.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_board_writes(session: Session) -> None:
+    session.info.pop("boards_written", None)
@@ -0,0 +1,306 @@
+"""Daily range partitions for ``board_metric_snapshots`` on PostgreSQL.
+
+Each UTC day of snapshots lives in its own partition named
+``board_metric_snapshots_pYYYYMMDD``.  Retention pre-creates the next few
+days and drops whole partitions once their day is older than
+``SNAPSHOT_RETENTION_DAYS``, so expiring history never deletes rows from the
+table the crawlers write to.  A default partition catches rows outside the
+prepared range; when a day's partition is created late, rows that already
+landed in the default partition are moved into it.  SQLite keeps a plain
+table and the periodic ``DELETE``.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+import logging
+import re
+
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from crawl_scheduler.db.postgres import get_engine
+
+
+logger = logging.getLogger("crawler")
+
+SNAPSHOT_TABLE = "board_metric_snapshots"
+SNAPSHOT_RETENTION_DAYS = 7
+SNAPSHOT_PARTITION_DAYS_AHEAD = 3
+DEFAULT_PARTITION = f"{SNAPSHOT_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{SNAPSHOT_TABLE}_p(\d{{8}})$")
+
+
+@dataclass(frozen=True)
+class PartitionMaintenanceResult:
+    created: list[str]
+    dropped: list[str]
+    default_rows_deleted: int = 0
+
+
+def partition_name(day: date) -> str:
+    return f"{SNAPSHOT_TABLE}_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> date | None:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+def retention_cutoff(now: datetime, retention_days: int = SNAPSHOT_RETENTION_DAYS) -> datetime:
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(timezone.utc) - timedelta(days=retention_days)
+
+
+def expired_partitions(names, cutoff: datetime) -> list[str]:
+    """Return the daily partitions whose whole day is older than ``cutoff``."""
+    return sorted(
+        name
+        for name in names
+        if (day := partition_day(name)) is not None
+        and _day_start(day + timedelta(days=1)) <= cutoff
+    )
+
+
+def partition_days(first_day: date, last_day: date) -> list[date]:
+    return [
+        first_day + timedelta(days=offset)
+        for offset in range((last_day - first_day).days + 1)
+    ]
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table_name "
+                "AND c.relnamespace = to_regnamespace(current_schema())"
+            ),
+            {"table_name": SNAPSHOT_TABLE},
+        ).scalar()
+    )
+
+
+def create_partitions(connection: Connection, days) -> list[str]:
+    """Create the missing daily partitions.
+
+    Rows the default partition already holds for one of those days are moved
+    into the new partition; PostgreSQL refuses to create it otherwise.
+    """
+    existing = set(_partition_names(connection))
+    created = []
+    for day in days:
+        name = partition_name(day)
+        if name in existing:
+            continue
+        bounds = {
+            "day_start": _day_start(day),
+            "day_end": _day_start(day + timedelta(days=1)),
+        }
+        stranded = DEFAULT_PARTITION in existing and connection.execute(
+            text(
+                f"SELECT 1 FROM {DEFAULT_PARTITION} "
+                "WHERE captured_at >= :day_start AND captured_at < :day_end LIMIT 1"
+            ),
+            bounds,
+        ).first() is not None
+        if stranded:
+            connection.execute(
+                text(f"ALTER TABLE {SNAPSHOT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+            )
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {SNAPSHOT_TABLE} "
+                f"FOR VALUES FROM ('{bounds['day_start'].isoformat()}') "
+                f"TO ('{bounds['day_end'].isoformat()}')"
+            )
+        )
+        if stranded:
+            moved = connection.execute(
+                text(
+                    f"INSERT INTO {name} "
+                    "(id, board_id, captured_at, comment_count, like_count, view_count, "
+                    "source_rank, crawl_status, crawl_error) "
+                    "SELECT id, board_id, captured_at, comment_count, like_count, "
+                    "view_count, source_rank, crawl_status, crawl_error "
+                    f"FROM {DEFAULT_PARTITION} "
+                    "WHERE captured_at >= :day_start AND captured_at < :day_end"
+                ),
+                bounds,
+            ).rowcount
+            connection.execute(
+                text(
+                    f"DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE captured_at >= :day_start AND captured_at < :day_end"
+                ),
+                bounds,
+            )
+            connection.execute(
+                text(
+                    f"ALTER TABLE {SNAPSHOT_TABLE} "
+                    f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+                )
+            )
+            logger.info(
+                "Moved %s snapshot rows from %s into %s",
+                moved,
+                DEFAULT_PARTITION,
+                name,
+            )
+        created.append(name)
+    return created
+
+
+def maintain_snapshot_partitions(
+    database_url: str | None = None,
+    now: datetime | None = None,
+    *,
+    retention_days: int = SNAPSHOT_RETENTION_DAYS,
+    days_ahead: int = SNAPSHOT_PARTITION_DAYS_AHEAD,
+) -> PartitionMaintenanceResult:
+    """Create upcoming daily partitions and drop the expired ones.
+
+    Each day is created in its own transaction and retention runs in a
+    separate one, so a day that cannot be created is logged and retried on
+    the next run without holding back the others or the drops.
+    """
+    now = now or datetime.now(timezone.utc)
+    engine = get_engine(database_url)
+    with engine.connect() as connection:
+        if not is_partitioned(connection):
+            return PartitionMaintenanceResult(created=[], dropped=[])
+
+    today = now.astimezone(timezone.utc).date()
+    created = []
+    for day in partition_days(today, today + timedelta(days=days_ahead)):
+        try:
+            with engine.begin() as connection:
+                created.extend(create_partitions(connection, [day]))
+        except SQLAlchemyError as exc:
+            logger.warning(
+                "Could not create snapshot partition %s: %s",
+                partition_name(day),
+                exc,
+            )
+
+    cutoff = retention_cutoff(now, retention_days)
+    with engine.begin() as connection:
+        dropped = expired_partitions(_partition_names(connection), cutoff)
+        for name in dropped:
+            connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        default_rows_deleted = connection.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE captured_at < :cutoff"),
+            {"cutoff": cutoff},
+        ).rowcount
+
+    if created or dropped:
+        logger.info(
+            "Snapshot partitions created %s, dropped %s",
+            created,
+            dropped,
+        )
+    return PartitionMaintenanceResult(
+        created=created,
+        dropped=dropped,
+        default_rows_deleted=max(default_rows_deleted or 0, 0),
+    )
+
+
+def partition_snapshot_table(
+    connection: Connection,
+    now: datetime | None = None,
+    *,
+    retention_days: int = SNAPSHOT_RETENTION_DAYS,
+    days_ahead: int = SNAPSHOT_PARTITION_DAYS_AHEAD,
+) -> None:
+    """Replace the plain snapshot table with a daily partitioned one.
+
+    Only snapshots inside the retention window are copied over.
+    """
+    if connection.dialect.name != "postgresql" or is_partitioned(connection):
+        return
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = retention_cutoff(now, retention_days)
+    legacy_table = f"{SNAPSHOT_TABLE}_unpartitioned"
+    connection.execute(text(f"ALTER TABLE {SNAPSHOT_TABLE} RENAME TO {legacy_table}"))
+    for index_name in (
+        "ix_board_metric_snapshots_board_captured_at",
+        "ix_board_metric_snapshots_captured_at",
+    ):
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {SNAPSHOT_TABLE} ("
+            "id VARCHAR(36) NOT NULL, "
+            "board_id VARCHAR(36) NOT NULL, "
+            "captured_at TIMESTAMP WITH TIME ZONE NOT NULL, "
+            "comment_count INTEGER NOT NULL, "
+            "like_count INTEGER NOT NULL, "
+            "view_count INTEGER, "
+            "source_rank INTEGER, "
+            "crawl_status VARCHAR(32) NOT NULL, "
+            "crawl_error VARCHAR, "
+            "CONSTRAINT pk_board_metric_snapshots PRIMARY KEY (id, captured_at), "
+            "CONSTRAINT fk_board_metric_snapshots_board_id "
+            "FOREIGN KEY (board_id) REFERENCES boards (id)"
+            ") PARTITION BY RANGE (captured_at)"
+        )
+    )
+    connection.execute(
+        text(
+            "CREATE INDEX ix_board_metric_snapshots_board_captured_at "
+            f"ON {SNAPSHOT_TABLE} (board_id, captured_at)"
+        )
+    )
+    connection.execute(
+        text(
+            "CREATE INDEX ix_board_metric_snapshots_captured_at "
+            f"ON {SNAPSHOT_TABLE} (captured_at)"
+        )
+    )
+    connection.execute(
+        text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {SNAPSHOT_TABLE} DEFAULT")
+    )
+    today = now.astimezone(timezone.utc).date()
+    create_partitions(
+        connection,
+        partition_days(cutoff.date(), today + timedelta(days=days_ahead)),
+    )
+    connection.execute(
+        text(
+            f"INSERT INTO {SNAPSHOT_TABLE} "
+            "(id, board_id, captured_at, comment_count, like_count, view_count, "
+            "source_rank, crawl_status, crawl_error) "
+            "SELECT id, board_id, captured_at, comment_count, like_count, view_count, "
+            f"source_rank, crawl_status, crawl_error FROM {legacy_table} "
+            "WHERE captured_at >= :cutoff"
+        ),
+        {"cutoff": cutoff},
+    )
+    connection.execute(text(f"DROP TABLE {legacy_table}"))
+
+
+def _partition_names(connection: Connection) -> list[str]:
+    return list(
+        connection.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table_name "
+                "AND parent.relnamespace = to_regnamespace(current_schema())"
+            ),
+            {"table_name": SNAPSHOT_TABLE},
+        ).scalars()
+    )
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
@@ -1,4 +1,5 @@
 import argparse
+from concurrent.futures import wait
 import os
 import sys
 import time
@@ -9,6 +10,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 import schedule
 
+from crawl_scheduler.adaptive_intervals import AdaptiveCrawlIntervals
 from crawl_scheduler.community_website.arca import Arca
 from crawl_scheduler.community_website.dcinside import Dcinside
 from crawl_scheduler.community_website.fmkorea import Fmkorea
@@ -16,6 +18,7 @@ from crawl_scheduler.community_website.inven import Inven
 from crawl_scheduler.community_website.ppomppu import Ppomppu
 from crawl_scheduler.community_website.theqoo import Theqoo
 from crawl_scheduler.community_website.ygosu import Ygosu
+from crawl_scheduler.crawl_executor import SiteCrawlExecutor
 from crawl_scheduler.constants import (
     SITE_ARCA,
     SITE_DCINSIDE,
@@ -25,11 +28,16 @@ from crawl_scheduler.constants import (
     SITE_THEQOO,
     SITE_YGOSU,
 )
+from crawl_scheduler.db.migrations import ensure_schema, migrate
+from crawl_scheduler.db.postgres import PoolSettings, configure_pool
 from crawl_scheduler.db.postgres_controller import PostgresController
+from crawl_scheduler.db.snapshot_partitions import maintain_snapshot_partitions
+from crawl_scheduler.maintenance import MaintenanceWorker
+from crawl_scheduler.metric_repoll import MetricRepollQueue
 from crawl_scheduler.utils.loghandler import logger
 
 DEFAULT_INTERVAL_MINUTES = 5
-SNAPSHOT_INTERVAL_MINUTES = 5
+METRIC_REPOLL_INTERVAL_MINUTES = 1
 
 
 @dataclass(frozen=True)
@@ -51,14 +59,28 @@ CRAWLER_SPECS = (
 DEFAULT_CRAWLER_FACTORIES = tuple(spec.factory for spec in CRAWLER_SPECS)
 
 
-def positive_minutes(value):
+def positive_int(value):
     try:
-        minutes = int(value)
+        number = int(value)
     except (TypeError, ValueError) as exc:
         raise argparse.ArgumentTypeError("must be an integer") from exc
-    if minutes < 1:
+    if number < 1:
         raise argparse.ArgumentTypeError("must be at least 1")
-    return minutes
+    return number
+
+
+def non_negative_number(value, cast=int):
+    try:
+        number = cast(value)
+    except (TypeError, ValueError) as exc:
+        raise argparse.ArgumentTypeError("must be a number") from exc
+    if number < 0:
+        raise argparse.ArgumentTypeError("must not be negative")
+    return number
+
+
+def non_negative_seconds(value):
+    return non_negative_number(value, float)
 
 
 def resolve_disabled_sites(crawler_specs=CRAWLER_SPECS):
@@ -92,7 +114,7 @@ def resolve_crawler_intervals(forced_interval=None, crawler_specs=CRAWLER_SPECS)
         if raw_value is None:
             raw_value = spec.default_interval_minutes
         try:
-            intervals[spec.site] = positive_minutes(raw_value)
+            intervals[spec.site] = positive_int(raw_value)
         except argparse.ArgumentTypeError as exc:
             source_name = (
                 environment_name
@@ -103,7 +125,14 @@ def resolve_crawler_intervals(forced_interval=None, crawler_specs=CRAWLER_SPECS)
     return intervals
 
 
-def get_realtime_best(crawler_factories=DEFAULT_CRAWLER_FACTORIES):
+def crawler_site(factory, crawler_specs=CRAWLER_SPECS):
+    return next(
+        (spec.site for spec in crawler_specs if spec.factory is factory),
+        getattr(factory, "__name__", factory.__class__.__name__),
+    )
+
+
+def get_realtime_best(crawler_factories=DEFAULT_CRAWLER_FACTORIES, on_churn=None):
     success_status = {}
 
     for factory in crawler_factories:
@@ -138,10 +167,24 @@ def get_realtime_best(crawler_factories=DEFAULT_CRAWLER_FACTORIES):
             )
             success_status[current_site] = "Fail"
 
+        churn = getattr(crawl, "feed_churn", None)
+        if on_churn is not None and churn is not None:
+            on_churn(crawler_site(factory), churn)
+
     logger.info(f"\n{success_status}")
     return success_status
 
 
+def bootstrap_schema() -> bool:
+    try:
+        version = ensure_schema()
+    except Exception as e:
+        logger.error(f"Error - schema bootstrap: {str(e)}", exc_info=True)
+        return False
+    logger.info(f"Database schema is at version {version}")
+    return True
+
+
 def record_daily_top10_snapshot():
     try:
         PostgresController().record_daily_top10_snapshot()
@@ -149,8 +192,44 @@ def record_daily_top10_snapshot():
         logger.error(f"Error - daily Top10 snapshot: {str(e)}", exc_info=True)
 
 
-def job(crawler_factories=DEFAULT_CRAWLER_FACTORIES):
-    get_realtime_best(crawler_factories)
+def maintain_partitions():
+    try:
+        maintain_snapshot_partitions()
+    except Exception as e:
+        logger.error(f"Error - snapshot partition maintenance: {str(e)}", exc_info=True)
+
+
+def metric_repoll_sites(crawler_specs=CRAWLER_SPECS):
+    return {
+        spec.site: spec.factory
+        for spec in crawler_specs
+        if callable(getattr(spec.factory, "fetch_post_metrics", None))
+    }
+
+
+def repoll_metrics(metric_repoll):
+    try:
+        polled = metric_repoll.run_due()
+    except Exception as e:
+        logger.error(f"Error - metric re-poll: {str(e)}", exc_info=True)
+        return
+    if polled:
+        logger.info(f"Re-polled metrics of {polled} posts")
+
+
+def job(crawler_factories=DEFAULT_CRAWLER_FACTORIES, executor=None):
+    if executor is None:
+        get_realtime_best(crawler_factories)
+    else:
+        futures = [
+            executor.submit(
+                f"crawler:{crawler_site(factory)}",
+                get_realtime_best,
+                (factory,),
+            )
+            for factory in crawler_factories
+        ]
+        wait([future for future in futures if future is not None])
     record_daily_top10_snapshot()
 
 
@@ -158,21 +237,50 @@ def configure_schedule(
     scheduler,
     crawler_intervals,
     crawler_specs=CRAWLER_SPECS,
+    executor=None,
+    adaptive_intervals=None,
+    metric_repoll=None,
 ):
+    crawl_kwargs = (
+        {"on_churn": adaptive_intervals.observe}
+        if adaptive_intervals is not None
+        else {}
+    )
     for spec in crawler_specs:
         interval_minutes = crawler_intervals[spec.site]
-        scheduler.every(interval_minutes).minutes.do(
-            get_realtime_best,
-            (spec.factory,),
-        ).tag(f"crawler:{spec.site}")
+        tag = f"crawler:{spec.site}"
+        if executor is None:
+            scheduler.every(interval_minutes).minutes.do(
+                get_realtime_best,
+                (spec.factory,),
+                **crawl_kwargs,
+            ).tag(tag)
+        else:
+            scheduler.every(interval_minutes).minutes.do(
+                executor.submit,
+                tag,
+                get_realtime_best,
+                (spec.factory,),
+                **crawl_kwargs,
+            ).tag(tag)
         logger.info(
             "Scheduled %s every %d minutes",
             spec.site,
             interval_minutes,
         )
-    scheduler.every(SNAPSHOT_INTERVAL_MINUTES).minutes.do(
-        record_daily_top10_snapshot
-    ).tag("snapshot")
+    if metric_repoll is not None:
+        if executor is None:
+            scheduler.every(METRIC_REPOLL_INTERVAL_MINUTES).minutes.do(
+                repoll_metrics,
+                metric_repoll,
+            ).tag("metrics")
+        else:
+            scheduler.every(METRIC_REPOLL_INTERVAL_MINUTES).minutes.do(
+                executor.submit,
+                "metrics",
+                repoll_metrics,
+                metric_repoll,
+            ).tag("metrics")
 
 
 def parse_args(argv=None):
@@ -190,30 +298,125 @@ def parse_args(argv=None):
     )
     parser.add_argument(
         "--interval-minutes",
-        type=positive_minutes,
+        type=positive_int,
         default=None,
         help=(
             "Force one scheduler interval for every site, overriding environment "
             "and recommended site defaults."
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help=(
+            "Dispatch each site's scheduled crawl to a pool of this many worker "
+            "threads so a slow site never delays the others. A site never "
+            "overlaps with its own previous run."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-intervals",
+        action="store_true",
+        help=(
+            "Shrink or stretch each site's interval after every crawl based on "
+            "how many feed posts were new and how much their metrics changed, "
+            "bounded by CRAWLER_ADAPTIVE_MIN_FACTOR and "
+            "CRAWLER_ADAPTIVE_MAX_FACTOR times the configured interval."
+        ),
+    )
+    parser.add_argument(
+        "--repoll-metrics",
+        action="store_true",
+        help=(
+            "Every minute, re-poll native metrics of stored posts whose "
+            "next_metrics_crawl_at is due, including posts that already left "
+            "the feed. Only sites with a per-post metrics hook are polled."
+        ),
+    )
+    parser.add_argument(
+        "--db-pool-size",
+        type=positive_int,
+        default=None,
+        help="Connections kept open per database (DATABASE_POOL_SIZE, default 5).",
+    )
+    parser.add_argument(
+        "--db-max-overflow",
+        type=non_negative_number,
+        default=None,
+        help=(
+            "Extra connections opened beyond the pool size under load "
+            "(DATABASE_MAX_OVERFLOW, default 10)."
+        ),
+    )
+    parser.add_argument(
+        "--db-pool-recycle-seconds",
+        type=non_negative_number,
+        default=None,
+        help=(
+            "Replace pooled connections older than this; 0 never recycles "
+            "(DATABASE_POOL_RECYCLE_SECONDS, default 1800)."
+        ),
+    )
+    parser.add_argument(
+        "--db-statement-timeout-ms",
+        type=non_negative_number,
+        default=None,
+        help=(
+            "PostgreSQL statement_timeout for every session; 0 keeps the server "
+            "default (DATABASE_STATEMENT_TIMEOUT_MS)."
+        ),
+    )
+    parser.add_argument(
+        "--db-pre-ping-interval-seconds",
+        type=non_negative_seconds,
+        default=None,
+        help=(
+            "Skip the checkout ping for connections validated within this many "
+            "seconds; 0 pings on every checkout "
+            "(DATABASE_PRE_PING_INTERVAL_SECONDS)."
+        ),
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Apply pending database schema migrations and exit.",
+    )
     args = parser.parse_args(argv)
     try:
         args.disabled_sites = resolve_disabled_sites()
         args.crawler_specs = tuple(
             spec for spec in CRAWLER_SPECS if spec.site not in args.disabled_sites
         )
+        args.pool_settings = PoolSettings.from_environment(
+            pool_size=args.db_pool_size,
+            max_overflow=args.db_max_overflow,
+            recycle_seconds=args.db_pool_recycle_seconds,
+            statement_timeout_ms=args.db_statement_timeout_ms,
+            pre_ping_interval_seconds=args.db_pre_ping_interval_seconds,
+        )
         args.crawler_intervals = resolve_crawler_intervals(
             args.interval_minutes,
             crawler_specs=args.crawler_specs,
         )
-    except argparse.ArgumentTypeError as exc:
+        args.adaptive = (
+            AdaptiveCrawlIntervals.from_environment(args.crawler_intervals)
+            if args.adaptive_intervals
+            else None
+        )
+    except (argparse.ArgumentTypeError, ValueError) as exc:
         parser.error(str(exc))
     return args
 
 
 def main(argv=None):
     args = parse_args(argv)
+    configure_pool(args.pool_settings)
+    if args.migrate:
+        version = migrate()
+        logger.info(f"Database schema migrated to version {version}")
+        return 0
+
     crawler_factories = tuple(spec.factory for spec in args.crawler_specs)
     if args.disabled_sites:
         logger.warning(
@@ -221,22 +424,46 @@ def main(argv=None):
             ", ".join(sorted(args.disabled_sites)),
         )
 
-    if args.once:
-        job(crawler_factories)
-        return 0
-
-    if args.run_on_start:
-        job(crawler_factories)
+    # Today's snapshot partition must exist before the first crawl writes
+    # snapshots; the maintenance worker only starts after that crawl.
+    if bootstrap_schema():
+        maintain_partitions()
+    executor = SiteCrawlExecutor(args.workers) if args.workers else None
+    maintenance = None
 
-    configure_schedule(
-        schedule,
-        args.crawler_intervals,
-        crawler_specs=args.crawler_specs,
-    )
+    try:
+        if args.once:
+            job(crawler_factories, executor=executor)
+            return 0
+
+        if args.run_on_start:
+            job(crawler_factories, executor=executor)
+
+        maintenance = MaintenanceWorker()
+        maintenance.start()
+        configure_schedule(
+            schedule,
+            args.crawler_intervals,
+            crawler_specs=args.crawler_specs,
+            executor=executor,
+            adaptive_intervals=args.adaptive,
+            metric_repoll=(
+                MetricRepollQueue(metric_repoll_sites(args.crawler_specs))
+                if args.repoll_metrics
+                else None
+            ),
+        )
 
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+        while True:
+            if args.adaptive is not None:
+                args.adaptive.apply(schedule)
+            schedule.run_pending()
+            time.sleep(1)
+    finally:
+        if maintenance is not None:
+            maintenance.stop(timeout=0)
+        if executor is not None:
+            executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,270 @@
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import multiprocessing
+import threading
+import time
+
+import schedule
+from sqlalchemy import delete, select, text
+
+from crawl_scheduler.db.models import BoardMetricSnapshot, CrawlerLog
+from crawl_scheduler.db.postgres import get_engine, pool_stats
+from crawl_scheduler.db.postgres_controller import PostgresController
+from crawl_scheduler.db.snapshot_partitions import (
+    SNAPSHOT_RETENTION_DAYS,
+    is_partitioned,
+    maintain_snapshot_partitions,
+)
+from crawl_scheduler.media_derivatives import (
+    DEFAULT_DERIVATIVE_BATCH_SIZE,
+    DEFAULT_DERIVATIVE_WORKERS,
+    derive_board_media,
+    pillow_available,
+)
+from crawl_scheduler.utils.loghandler import logger
+
+
+CRAWLER_LOG_RETENTION_DAYS = 30
+DEFAULT_DELETE_BATCH_SIZE = 5000
+DEFAULT_MAX_DELETE_BATCHES = 100
+ANALYZE_TABLES = ("boards", "board_metric_snapshots")
+
+DAILY_TOP10_INTERVAL_MINUTES = 5
+EXPIRE_SNAPSHOTS_INTERVAL_MINUTES = 60
+PRUNE_CRAWLER_LOGS_INTERVAL_MINUTES = 60
+ANALYZE_INTERVAL_MINUTES = 6 * 60
+POOL_STATS_INTERVAL_MINUTES = 5
+MEDIA_DERIVATIVES_INTERVAL_MINUTES = 1
+
+
+@dataclass(frozen=True)
+class MaintenanceTask:
+    name: str
+    interval_minutes: int
+    run: Callable[[datetime], int]
+
+
+@dataclass(frozen=True)
+class MaintenanceStats:
+    task: str
+    rows_affected: int
+    duration_seconds: float
+    error: str | None = None
+
+
+class MaintenanceWorker:
+    """Run retention and housekeeping tasks on a thread of their own.
+
+    The worker owns a private ``schedule.Scheduler`` so the daily Top10
+    snapshot, snapshot expiry, ``crawler_logs`` pruning, ``ANALYZE``, the
+    connection pool report and image derivatives never wait behind a crawl
+    job or delay one.  Deletes go out in chunks of
+    ``batch_size`` rows, each in its own transaction, and stop after
+    ``max_batches`` chunks so one run holds row locks only briefly; whatever
+    is left is picked up by the next run.
+
+    Every task run is logged with its duration and affected rows, and the
+    latest result per task is kept in ``last_stats``.
+    """
+
+    def __init__(
+        self,
+        database_url: str | None = None,
+        *,
+        batch_size: int = DEFAULT_DELETE_BATCH_SIZE,
+        max_batches: int = DEFAULT_MAX_DELETE_BATCHES,
+        snapshot_retention_days: int = SNAPSHOT_RETENTION_DAYS,
+        crawler_log_retention_days: int = CRAWLER_LOG_RETENTION_DAYS,
+        derivative_workers: int = DEFAULT_DERIVATIVE_WORKERS,
+        derivative_batch_size: int = DEFAULT_DERIVATIVE_BATCH_SIZE,
+    ):
+        self.database_url = database_url
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.snapshot_retention_days = snapshot_retention_days
+        self.crawler_log_retention_days = crawler_log_retention_days
+        self.derivative_workers = derivative_workers
+        self.derivative_batch_size = derivative_batch_size
+        self._derivative_executor: ProcessPoolExecutor | None = None
+        self.tasks = (
+            MaintenanceTask(
+                "daily_top10",
+                DAILY_TOP10_INTERVAL_MINUTES,
+                self.record_daily_top10_snapshot,
+            ),
+            MaintenanceTask(
+                "expire_snapshots",
+                EXPIRE_SNAPSHOTS_INTERVAL_MINUTES,
+                self.expire_snapshots,
+            ),
+            MaintenanceTask(
+                "prune_crawler_logs",
+                PRUNE_CRAWLER_LOGS_INTERVAL_MINUTES,
+                self.prune_crawler_logs,
+            ),
+            MaintenanceTask("analyze", ANALYZE_INTERVAL_MINUTES, self.analyze),
+            MaintenanceTask(
+                "pool_stats",
+                POOL_STATS_INTERVAL_MINUTES,
+                self.report_pool_stats,
+            ),
+            MaintenanceTask(
+                "media_derivatives",
+                MEDIA_DERIVATIVES_INTERVAL_MINUTES,
+                self.derive_media,
+            ),
+        )
+        self.last_stats: dict[str, MaintenanceStats] = {}
+        self.scheduler = schedule.Scheduler()
+        for task in self.tasks:
+            self.scheduler.every(task.interval_minutes).minutes.do(
+                self.run_task,
+                task,
+            ).tag(f"maintenance:{task.name}")
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_forever,
+            name="maintenance",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._derivative_executor is not None:
+            self._derivative_executor.shutdown(wait=False, cancel_futures=True)
+            self._derivative_executor = None
+
+    def run_all(self, now: datetime | None = None) -> list[MaintenanceStats]:
+        return [self.run_task(task, now) for task in self.tasks]
+
+    def run_task(
+        self,
+        task: MaintenanceTask,
+        now: datetime | None = None,
+    ) -> MaintenanceStats:
+        now = now or datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            rows_affected = task.run(now)
+            error = None
+        except Exception as e:
+            logger.error(f"Error - maintenance {task.name}: {str(e)}", exc_info=True)
+            rows_affected = 0
+            error = str(e)
+        stats = MaintenanceStats(
+            task=task.name,
+            rows_affected=rows_affected,
+            duration_seconds=time.perf_counter() - started,
+            error=error,
+        )
+        self.last_stats[task.name] = stats
+        logger.info(
+            "Maintenance %s: %d rows in %.3fs",
+            stats.task,
+            stats.rows_affected,
+            stats.duration_seconds,
+        )
+        return stats
+
+    def record_daily_top10_snapshot(self, now: datetime) -> int:
+        controller = PostgresController(database_url=self.database_url)
+        return controller.record_daily_top10_snapshot(now)
+
+    def expire_snapshots(self, now: datetime) -> int:
+        """Drop expired daily partitions on PostgreSQL, else delete in chunks."""
+        with get_engine(self.database_url).connect() as connection:
+            partitioned = is_partitioned(connection)
+        if partitioned:
+            result = maintain_snapshot_partitions(
+                self.database_url,
+                now,
+                retention_days=self.snapshot_retention_days,
+            )
+            return result.default_rows_deleted
+        return self._delete_in_batches(
+            BoardMetricSnapshot,
+            BoardMetricSnapshot.captured_at,
+            now - timedelta(days=self.snapshot_retention_days),
+        )
+
+    def prune_crawler_logs(self, now: datetime) -> int:
+        return self._delete_in_batches(
+            CrawlerLog,
+            CrawlerLog.created_at,
+            now - timedelta(days=self.crawler_log_retention_days),
+        )
+
+    def analyze(self, now: datetime) -> int:
+        with get_engine(self.database_url).begin() as connection:
+            for table_name in ANALYZE_TABLES:
+                connection.execute(text(f"ANALYZE {table_name}"))
+        return 0
+
+    def report_pool_stats(self, now: datetime) -> int:
+        stats = pool_stats(self.database_url)
+        logger.info(
+            "Database pool: %d checked out, %d idle, %d overflow; "
+            "%d checkouts, max wait %.3fs, waits %s; %d pings, %d skipped",
+            stats["checked_out"],
+            stats["checked_in"],
+            stats["overflow"],
+            stats["checkouts"],
+            stats["wait_seconds_max"],
+            stats["wait_histogram"],
+            stats["pre_pings"],
+            stats["pre_pings_skipped"],
+        )
+        return 0
+
+    def derive_media(self, now: datetime) -> int:
+        """Render thumbnails and WebP versions for boards still pending."""
+        if not pillow_available():
+            return 0
+        if self._derivative_executor is None:
+            # Spawned workers: forking this threaded process could copy
+            # locks held by crawl, HTTP or database pool threads.
+            self._derivative_executor = ProcessPoolExecutor(
+                max_workers=self.derivative_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return derive_board_media(
+            self.database_url,
+            limit=self.derivative_batch_size,
+            executor=self._derivative_executor,
+        )
+
+    def _delete_in_batches(self, model, timestamp_column, cutoff: datetime) -> int:
+        engine = get_engine(self.database_url)
+        deleted = 0
+        for _ in range(self.max_batches):
+            expired_ids = (
+                select(model.id)
+                .where(timestamp_column < cutoff)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            with engine.begin() as connection:
+                rowcount = connection.execute(
+                    delete(model).where(model.id.in_(expired_ids))
+                ).rowcount
+            deleted += rowcount
+            if rowcount < self.batch_size:
+                break
+        return deleted
+
+    def _run_forever(self) -> None:
+        self.scheduler.run_all()
+        while not self._stop.wait(1):
+            self.scheduler.run_pending()
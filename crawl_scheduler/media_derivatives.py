@@ -0,0 +1,159 @@
+"""Thumbnails and WebP versions of stored article images.
+
+Derivatives are keyed by the SHA-256 of the original and live under
+``<ROOT>/.derived/ab/<sha256>.thumb.webp`` and ``<sha256>.webp``, so an
+image reposted across posts is rendered once and an interrupted run simply
+skips what already exists.  Boards are picked up in batches while
+``media_derived_at`` is empty; rendering runs in a process pool owned by the
+maintenance worker, never on a crawl thread.  Pillow is an optional
+dependency (``poetry install --with images``).
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from functools import partial
+import importlib.util
+import os
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from crawl_scheduler.crawled_content import (
+    first_thumbnail_path,
+    local_image_paths,
+    with_image_derivatives,
+)
+from crawl_scheduler.db.models import Board
+from crawl_scheduler.db.postgres import get_session_factory
+from crawl_scheduler.media_store import media_digest
+from crawl_scheduler.utils.loghandler import logger
+
+
+DERIVED_DIRECTORY = ".derived"
+THUMBNAIL_SIZE = (320, 320)
+WEBP_QUALITY = 80
+DEFAULT_DERIVATIVE_BATCH_SIZE = 50
+DEFAULT_DERIVATIVE_WORKERS = 2
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def derivative_paths(digest: str) -> tuple[str, str]:
+    directory = f"{DERIVED_DIRECTORY}/{digest[:2]}"
+    return f"{directory}/{digest}.thumb.webp", f"{directory}/{digest}.webp"
+
+
+def render_derivatives(media_root: str, media_path: str) -> dict[str, str]:
+    """Render the missing derivatives of one stored image.
+
+    Returns the derived paths relative to ``media_root``.  Sources that are
+    already WebP and animated images keep their original as the full-size
+    version and only get a thumbnail.
+    """
+    thumbnail_path, webp_path = derivative_paths(media_digest(media_root, media_path))
+    root = Path(media_root)
+    wants_webp = Path(media_path).suffix.lower() != ".webp"
+    if not (root / thumbnail_path).exists() or (
+        wants_webp and not (root / webp_path).exists()
+    ):
+        from PIL import Image, ImageOps
+
+        with Image.open(root / media_path) as source:
+            animated = getattr(source, "is_animated", False)
+            image = ImageOps.exif_transpose(source)
+            has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+            if wants_webp and not animated and not (root / webp_path).exists():
+                _save_webp(image, root / webp_path)
+            if not (root / thumbnail_path).exists():
+                image.thumbnail(THUMBNAIL_SIZE)
+                _save_webp(image, root / thumbnail_path)
+
+    derived = {"thumbnail_path": thumbnail_path}
+    if (root / webp_path).exists():
+        derived["webp_path"] = webp_path
+    return derived
+
+
+def derive_board_media(
+    database_url: str | None = None,
+    *,
+    media_root: str | None = None,
+    limit: int = DEFAULT_DERIVATIVE_BATCH_SIZE,
+    executor: Executor | None = None,
+    render: Callable[[str, str], dict[str, str]] = render_derivatives,
+) -> int:
+    """Derive the images of up to ``limit`` pending boards, newest first.
+
+    Each board is written back only if its contents did not change while
+    its images were rendered; a board rewritten meanwhile stays pending.
+    Returns the number of boards marked as derived.
+    """
+    media_root = media_root or os.getenv("ROOT") or "./media"
+    session_factory = get_session_factory(database_url)
+    with session_factory() as session:
+        pending = session.execute(
+            select(Board.id, Board.contents)
+            .where(Board.media_derived_at.is_(None))
+            .order_by(Board.created_at.desc())
+            .limit(limit)
+        ).all()
+    if not pending:
+        return 0
+
+    media_paths = list(
+        dict.fromkeys(
+            media_path
+            for _, contents in pending
+            for media_path in local_image_paths(contents)
+            if (Path(media_root) / media_path).is_file()
+        )
+    )
+    map_function = executor.map if executor is not None else map
+    derivatives = {
+        media_path: derived
+        for media_path, derived in zip(
+            media_paths,
+            map_function(partial(_render_or_skip, render, media_root), media_paths),
+        )
+        if derived
+    }
+
+    derived_at = datetime.now(timezone.utc)
+    marked = 0
+    for board_id, contents in pending:
+        with session_factory() as session, session.begin():
+            board = session.get(Board, board_id, with_for_update=True)
+            if board is None or board.contents != contents:
+                continue
+            board.contents = with_image_derivatives(contents, derivatives)
+            board.thumbnail = first_thumbnail_path(board.contents) or board.thumbnail
+            board.media_derived_at = derived_at
+        marked += 1
+    return marked
+
+
+def _render_or_skip(
+    render: Callable[[str, str], dict[str, str]],
+    media_root: str,
+    media_path: str,
+) -> dict[str, str] | None:
+    try:
+        return render(media_root, media_path)
+    except Exception as exc:
+        logger.warning("Could not derive media %s: %s", media_path, exc)
+        return None
+
+
+def _save_webp(image, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.{uuid4().hex}.tmp")
+    try:
+        image.save(temporary, "WEBP", quality=WEBP_QUALITY, method=4)
+        os.replace(temporary, target)
+    finally:
+        temporary.unlink(missing_ok=True)
@@ -0,0 +1,229 @@
+"""Pre-flight checks for article videos.
+
+Before a video is downloaded on a crawl thread, a ``HEAD`` request (or a
+``Range: bytes=0-0`` GET when ``HEAD`` does not report a length) tells its
+type and size.  Small clips are downloaded inline, larger or unsized ones are
+handed to a background queue, and clips over the per-file cap or that are
+not video at all keep only their ``source_url``.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import re
+import threading
+from typing import Literal
+
+from crawl_scheduler.media_store import media_file_byte_cap
+from crawl_scheduler.utils import http_client
+from crawl_scheduler.utils.loghandler import logger
+
+
+DEFAULT_VIDEO_INLINE_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_DEFERRED_MEDIA_WORKERS = 1
+DEFAULT_DEFERRED_MEDIA_QUEUE_SIZE = 32
+GENERIC_MEDIA_TYPES = {"application/octet-stream", "binary/octet-stream", "application/mp4"}
+
+VideoAction = Literal["download", "defer", "skip"]
+
+
+@dataclass(frozen=True)
+class MediaProbe:
+    content_type: str | None
+    content_length: int | None
+
+
+class DeferredMediaQueue:
+    """Background downloads of media too large for a crawl thread.
+
+    At most ``max_pending`` jobs wait or run at once; ``submit`` returns
+    False instead of blocking when the queue is full.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = DEFAULT_DEFERRED_MEDIA_WORKERS,
+        max_pending: int = DEFAULT_DEFERRED_MEDIA_QUEUE_SIZE,
+    ):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="deferred-media",
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counts = Counter()
+
+    def submit(self, job: Callable[[], object]) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counts["dropped"] += 1
+                return False
+            self._pending += 1
+            self._counts["queued"] += 1
+        self._executor.submit(self._run, job)
+        return True
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "pending": self._pending,
+                **{
+                    key: self._counts[key]
+                    for key in ("queued", "completed", "failed", "dropped")
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Callable[[], object]) -> None:
+        outcome = "failed"
+        try:
+            job()
+            outcome = "completed"
+        except Exception as exc:
+            logger.warning("Deferred media download failed: %s", exc)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._counts[outcome] += 1
+
+
+_DEFERRED_QUEUE: DeferredMediaQueue | None = None
+_DEFERRED_QUEUE_LOCK = threading.Lock()
+
+
+def get_deferred_media_queue() -> DeferredMediaQueue:
+    global _DEFERRED_QUEUE
+
+    if _DEFERRED_QUEUE is None:
+        with _DEFERRED_QUEUE_LOCK:
+            if _DEFERRED_QUEUE is None:
+                _DEFERRED_QUEUE = DeferredMediaQueue(
+                    workers=_env_int(
+                        "CRAWLER_DEFERRED_MEDIA_WORKERS",
+                        DEFAULT_DEFERRED_MEDIA_WORKERS,
+                    ),
+                    max_pending=_env_int(
+                        "CRAWLER_DEFERRED_MEDIA_QUEUE_SIZE",
+                        DEFAULT_DEFERRED_MEDIA_QUEUE_SIZE,
+                    ),
+                )
+    return _DEFERRED_QUEUE
+
+
+def probe_media_url(
+    url: str,
+    *,
+    headers: Mapping[str, str] | None = None,
+    proxies: Mapping[str, str] | None = None,
+) -> MediaProbe | None:
+    """Return the type and length of ``url`` without reading its body."""
+    head_probe = None
+    try:
+        response = http_client.head(
+            url,
+            headers=dict(headers) if headers else None,
+            proxies=dict(proxies) if proxies else None,
+            allow_redirects=True,
+        )
+        try:
+            if response.status_code == 200:
+                head_probe = MediaProbe(
+                    _content_type(response.headers),
+                    _content_length(response.headers),
+                )
+                if head_probe.content_length is not None:
+                    return head_probe
+        finally:
+            response.close()
+
+        response = http_client.get(
+            url,
+            headers={**(headers or {}), "Range": "bytes=0-0"},
+            proxies=dict(proxies) if proxies else None,
+            stream=True,
+        )
+        try:
+            if response.status_code == 206:
+                return MediaProbe(
+                    _content_type(response.headers),
+                    _range_total(response.headers.get("Content-Range")),
+                )
+            if response.status_code == 200:
+                # The server ignored the range; the body is left unread.
+                return MediaProbe(
+                    _content_type(response.headers),
+                    _content_length(response.headers),
+                )
+        finally:
+            response.close()
+    except Exception as exc:
+        logger.warning("Could not probe media %s: %s", url, exc)
+    return head_probe
+
+
+def video_action(probe: MediaProbe | None) -> VideoAction:
+    """Decide how a probed video is fetched.
+
+    ``CRAWLER_VIDEO_INLINE_MAX_BYTES`` (default 16MiB, 0 for no limit) bounds
+    what a crawl thread downloads itself; anything over
+    ``CRAWLER_MEDIA_MAX_FILE_BYTES`` or not served as video is skipped.
+    Videos whose size could not be learned are deferred.
+    """
+    if probe is not None and not _is_video_type(probe.content_type):
+        return "skip"
+    if probe is None or probe.content_length is None:
+        return "defer"
+
+    max_bytes = media_file_byte_cap()
+    if max_bytes is not None and probe.content_length > max_bytes:
+        return "skip"
+    inline_bytes = video_inline_byte_cap()
+    if inline_bytes is not None and probe.content_length > inline_bytes:
+        return "defer"
+    return "download"
+
+
+def video_inline_byte_cap() -> int | None:
+    try:
+        value = int(os.getenv("CRAWLER_VIDEO_INLINE_MAX_BYTES", DEFAULT_VIDEO_INLINE_MAX_BYTES))
+    except (TypeError, ValueError):
+        value = DEFAULT_VIDEO_INLINE_MAX_BYTES
+    return value if value > 0 else None
+
+
+def _is_video_type(content_type: str | None) -> bool:
+    return (
+        content_type is None
+        or content_type.startswith("video/")
+        or content_type in GENERIC_MEDIA_TYPES
+    )
+
+
+def _content_type(headers: Mapping[str, str]) -> str | None:
+    content_type = (headers.get("Content-Type") or "").split(";", 1)[0]
+    return content_type.strip().lower() or None
+
+
+def _content_length(headers: Mapping[str, str]) -> int | None:
+    try:
+        return max(int(headers.get("Content-Length")), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _range_total(content_range: str | None) -> int | None:
+    match = re.fullmatch(r"\s*bytes\s+[\d*-]+/(\d+)\s*", content_range or "")
+    return int(match.group(1)) if match else None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 1)
+    except (TypeError, ValueError):
+        return default
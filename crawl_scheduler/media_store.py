@@ -0,0 +1,303 @@
+"""Content-addressed storage for downloaded media.
+
+Every distinct file is written once under ``<root>/.blobs/ab/cd/<sha256>``.
+The per-post path a crawler returns as ``media_path`` is a hardlink to that
+blob, so reposts of the same image across posts and sites cost a directory
+entry instead of another copy.  Each blob has a ``<sha256>.refs`` file that
+lists the post paths linked to it, one per line.  On filesystems without
+hardlinks the file is stored at the post path only.
+
+Downloads are streamed: chunks are hashed while they are written to a
+temporary file that is renamed into place, and a file or article that
+exceeds its byte cap is abandoned as soon as the cap is crossed.  Each post
+directory keeps a ``.manifest.json`` mapping source URLs to the stored
+``media_path``, size and hash, so refreshing a post skips known media.
+"""
+
+from collections.abc import Iterable
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+import shutil
+import threading
+from uuid import uuid4
+
+from crawl_scheduler.utils.loghandler import logger
+
+
+BLOB_DIRECTORY = ".blobs"
+DEFAULT_MAX_FILE_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_ARTICLE_BYTES = 300 * 1024 * 1024
+MEDIA_CHUNK_BYTES = 64 * 1024
+MANIFEST_NAME = ".manifest.json"
+_MANIFEST_LOCK = threading.Lock()
+
+
+class MediaTooLargeError(RuntimeError):
+    pass
+
+
+class MediaByteBudget:
+    """Bytes one article may still download, shared by its download threads.
+
+    ``max_bytes=None`` means unlimited.
+    """
+
+    def __init__(self, max_bytes: int | None):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_article(cls) -> "MediaByteBudget":
+        return cls(_env_byte_cap("CRAWLER_MEDIA_MAX_ARTICLE_BYTES", DEFAULT_MAX_ARTICLE_BYTES))
+
+    def remaining(self) -> int | None:
+        if self.max_bytes is None:
+            return None
+        with self._lock:
+            return max(self.max_bytes - self.used, 0)
+
+    def consume(self, size: int) -> None:
+        with self._lock:
+            if self.max_bytes is not None and self.used + size > self.max_bytes:
+                raise MediaTooLargeError(
+                    f"article media exceeds {self.max_bytes} bytes"
+                )
+            self.used += size
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.used = max(self.used - size, 0)
+
+
+def media_file_byte_cap() -> int | None:
+    return _env_byte_cap("CRAWLER_MEDIA_MAX_FILE_BYTES", DEFAULT_MAX_FILE_BYTES)
+
+
+def blob_path(root: str | Path, digest: str) -> Path:
+    return Path(root) / BLOB_DIRECTORY / digest[:2] / digest[2:4] / digest
+
+
+def store_media(
+    root: str | Path,
+    directory: str | Path,
+    file_name: str,
+    content: bytes,
+) -> Path:
+    return store_media_stream(root, directory, file_name, [content])
+
+
+def store_media_stream(
+    root: str | Path,
+    directory: str | Path,
+    file_name: str,
+    chunks: Iterable[bytes],
+    *,
+    max_bytes: int | None = None,
+    budget: MediaByteBudget | None = None,
+    source_url: str | None = None,
+) -> Path:
+    """Store streamed bytes as ``directory/file_name`` and return the path used.
+
+    The blob is only kept when no earlier download had the same bytes.
+    If the name is taken by a different file, ``name_1``, ``name_2``... are
+    tried; if it already holds these bytes, the existing path is returned.
+    ``MediaTooLargeError`` is raised, and nothing is stored, once the stream
+    passes ``max_bytes`` or the article ``budget``.  With ``source_url`` the
+    result is recorded in the post directory's manifest.
+    """
+    digest, size, temporary = _stream_to_temporary(root, chunks, max_bytes, budget)
+    blob = blob_path(root, digest)
+    try:
+        blob_created = _store_blob(temporary, blob)
+        use_blob = blob_created is not None
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem, extension = os.path.splitext(file_name)
+        candidate = directory / file_name
+        index = 1
+        while True:
+            try:
+                if use_blob:
+                    try:
+                        os.link(blob, candidate)
+                    except FileExistsError:
+                        raise
+                    except OSError as exc:
+                        # A post directory on another device than the blob
+                        # store gets the file itself, not a second copy.
+                        logger.debug("Storing %s without its blob: %s", candidate, exc)
+                        if blob_created:
+                            blob.unlink(missing_ok=True)
+                        use_blob = False
+                        continue
+                    _add_reference(root, digest, candidate)
+                else:
+                    _copy_exclusive(temporary, candidate)
+                break
+            except FileExistsError:
+                if _same_file(candidate, blob, digest, size):
+                    break
+                candidate = directory / f"{stem}_{index}{extension}"
+                index += 1
+    except BaseException:
+        if budget is not None:
+            budget.release(size)
+        raise
+    finally:
+        temporary.unlink(missing_ok=True)
+
+    if source_url:
+        _record_manifest_entry(
+            directory,
+            source_url,
+            {
+                "media_path": os.path.relpath(candidate, root),
+                "size": size,
+                "sha256": digest,
+            },
+        )
+    return candidate
+
+
+def known_media_path(
+    root: str | Path,
+    directory: str | Path,
+    source_url: str,
+) -> str | None:
+    """Return the ``media_path`` already stored for ``source_url`` in a post.
+
+    The post directory's manifest is trusted only while the file it names
+    is still present with the recorded size.
+    """
+    entry = _read_manifest(Path(directory)).get(source_url)
+    if not isinstance(entry, dict) or not entry.get("media_path"):
+        return None
+    try:
+        if (Path(root) / entry["media_path"]).stat().st_size != entry.get("size"):
+            return None
+    except OSError:
+        return None
+    return entry["media_path"]
+
+
+def media_references(root: str | Path, digest: str) -> list[str]:
+    """Return the ``media_path`` values that point at one blob."""
+    refs = blob_path(root, digest).with_suffix(".refs")
+    try:
+        lines = refs.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    return list(dict.fromkeys(line for line in lines if line))
+
+
+def media_digest(root: str | Path, media_path: str | Path) -> str:
+    """Return the SHA-256 of a stored ``media_path``."""
+    digest = sha256()
+    with open(Path(root) / media_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stream_to_temporary(
+    root: str | Path,
+    chunks: Iterable[bytes],
+    max_bytes: int | None,
+    budget: MediaByteBudget | None,
+) -> tuple[str, int, Path]:
+    staging = Path(root) / BLOB_DIRECTORY
+    staging.mkdir(parents=True, exist_ok=True)
+    temporary = staging / f".{uuid4().hex}.tmp"
+    digest = sha256()
+    size = 0
+    try:
+        with open(temporary, "xb") as f:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if max_bytes is not None and size + len(chunk) > max_bytes:
+                    raise MediaTooLargeError(f"media file exceeds {max_bytes} bytes")
+                if budget is not None:
+                    budget.consume(len(chunk))
+                size += len(chunk)
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        if budget is not None:
+            budget.release(size)
+        raise
+    return digest.hexdigest(), size, temporary
+
+
+def _store_blob(temporary: Path, blob: Path) -> bool | None:
+    """Link a finished download into the blob store.
+
+    Returns whether the blob was created by this call, or ``None`` when the
+    filesystem has no hardlinks and the post path should hold the file.
+    Linking instead of renaming keeps an existing blob's inode, so a
+    concurrent download of the same bytes never orphans earlier post links.
+    """
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(temporary, blob)
+    except FileExistsError:
+        return False
+    except OSError as exc:
+        logger.debug("Storing media without blob %s: %s", blob, exc)
+        return None
+    return True
+
+
+def _copy_exclusive(source: Path, target: Path) -> None:
+    with open(source, "rb") as f, open(target, "xb") as destination:
+        shutil.copyfileobj(f, destination)
+
+
+def _same_file(path: Path, blob: Path, digest: str, size: int) -> bool:
+    try:
+        if blob.exists() and os.path.samefile(path, blob):
+            return True
+        if path.stat().st_size != size:
+            return False
+        return media_digest(path.parent, path.name) == digest
+    except OSError:
+        return False
+
+
+def _add_reference(root: str | Path, digest: str, path: Path) -> None:
+    refs = blob_path(root, digest).with_suffix(".refs")
+    with open(refs, "a", encoding="utf-8") as f:
+        f.write(f"{os.path.relpath(path, root)}\n")
+
+
+def _read_manifest(directory: Path) -> dict:
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _record_manifest_entry(directory: Path, source_url: str, entry: dict) -> None:
+    with _MANIFEST_LOCK:
+        manifest = _read_manifest(directory)
+        manifest[source_url] = entry
+        temporary = directory / f".{MANIFEST_NAME}.{uuid4().hex}.tmp"
+        temporary.write_text(
+            json.dumps(manifest, ensure_ascii=False, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temporary, directory / MANIFEST_NAME)
+
+
+def _env_byte_cap(name: str, default: int) -> int | None:
+    try:
+        value = int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return value if value > 0 else None
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+import heapq
+
+from crawl_scheduler.db.postgres_controller import PostgresController
+from crawl_scheduler.popularity import next_metrics_crawl_at
+from crawl_scheduler.utils.loghandler import logger
+
+
+DEFAULT_REPOLL_BATCH_SIZE = 20
+DEFAULT_REPOLL_HORIZON = timedelta(minutes=5)
+
+
+class MetricRepollQueue:
+    """Poll native metrics of stored posts in ``next_metrics_crawl_at`` order.
+
+    Feed crawls only refresh posts that are still on a popular page.  This
+    queue keeps a heap of posts due within ``horizon`` and re-polls them
+    through the site crawler's ``fetch_post_metrics`` hook, so velocity
+    snapshots keep flowing after a post drops off the feed.  Every successful
+    poll records a snapshot, which also schedules the post's next poll from
+    its new hot score and age.
+
+    The database stays the source of truth: each run reloads due rows, and a
+    heap entry whose due time no longer matches the stored one is discarded.
+    """
+
+    def __init__(
+        self,
+        crawler_factories: dict[str, type],
+        db_controller: PostgresController | None = None,
+        *,
+        batch_size: int = DEFAULT_REPOLL_BATCH_SIZE,
+        horizon: timedelta = DEFAULT_REPOLL_HORIZON,
+    ):
+        self.crawler_factories = dict(crawler_factories)
+        self.db_controller = db_controller
+        self.batch_size = batch_size
+        self.horizon = horizon
+        self._heap: list[tuple[datetime, str]] = []
+        self._queued: dict[str, dict] = {}
+        self._crawlers: dict[str, object] = {}
+
+    def run_due(self, now: datetime | None = None) -> int:
+        """Poll up to ``batch_size`` due posts and return how many were polled."""
+        if not self.crawler_factories:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        if self.db_controller is None:
+            self.db_controller = PostgresController()
+        self._refill(now)
+
+        polled = 0
+        while self._heap and polled < self.batch_size:
+            due_at, source_id = self._heap[0]
+            if due_at > now:
+                break
+            heapq.heappop(self._heap)
+            post = self._queued.get(source_id)
+            if post is None or post["next_metrics_crawl_at"] != due_at:
+                continue
+            del self._queued[source_id]
+            self._poll(post, now)
+            polled += 1
+        return polled
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def _refill(self, now: datetime) -> None:
+        for post in self.db_controller.due_metric_polls(
+            self.crawler_factories.keys(),
+            until=now + self.horizon,
+            limit=self.batch_size * 2,
+        ):
+            due_at = post["next_metrics_crawl_at"]
+            queued = self._queued.get(post["source_id"])
+            if queued is not None and queued["next_metrics_crawl_at"] == due_at:
+                continue
+            self._queued[post["source_id"]] = post
+            heapq.heappush(self._heap, (due_at, post["source_id"]))
+
+    def _poll(self, post: dict, now: datetime) -> None:
+        query = {"source_id": post["source_id"]}
+        try:
+            metrics = self._crawler(post["site"]).fetch_post_metrics(post)
+        except Exception as e:
+            logger.error(f"Error - metric re-poll {post['source_id']}: {str(e)}")
+            metrics = None
+
+        if not metrics:
+            self.db_controller.update_one(
+                "Realtime",
+                query,
+                {
+                    "next_metrics_crawl_at": next_metrics_crawl_at(
+                        hot_score=None,
+                        created_at=post["created_at"],
+                        captured_at=now,
+                    )
+                },
+            )
+            return
+
+        # Post pages carry no feed rank; a repolled post is scored without one.
+        self.db_controller.refresh_native_metrics(
+            "Realtime",
+            query,
+            {"metrics_crawled_at": now, **metrics},
+            clear_source_rank=True,
+        )
+
+    def _crawler(self, site: str):
+        crawler = self._crawlers.get(site)
+        if crawler is None:
+            crawler = self.crawler_factories[site]()
+            self._crawlers[site] = crawler
+        return crawler
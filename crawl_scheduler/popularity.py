@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from math import exp, isfinite, log1p, sqrt
+from datetime import datetime, timedelta, timezone
+from math import exp, isfinite, log, log1p, sqrt
 from typing import Any
 
+import numpy as np
+
 
 SITE_WEIGHTS = {
     "dcinside": 1.0,
@@ -19,6 +22,12 @@ MIN_INTERVAL_SCALE = 0.25
 MAX_INTERVAL_SCALE = 4.0
 HOT_DECAY_HOURS = 12.0
 DAILY_DECAY_HOURS = 36.0
+METRIC_REPOLL_BASE_MINUTES = 30.0
+MIN_METRIC_REPOLL_MINUTES = 10.0
+MAX_METRIC_REPOLL_MINUTES = 360.0
+METRIC_REPOLL_MAX_AGE_HOURS = 72.0
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ZERO_SCORE_RANK_KEY = -1.0e12
 
 
 @dataclass(frozen=True)
@@ -236,3 +245,334 @@ def _age_hours(created_at: datetime, captured_at: datetime) -> float:
     if captured_at.tzinfo is None:
         captured_at = captured_at.replace(tzinfo=timezone.utc)
     return max((captured_at - created_at).total_seconds() / 3600, 0)
+
+
+def ranking_key(
+    score: float | None,
+    updated_at: datetime,
+    decay_hours: float,
+) -> float:
+    """Return a stored sort key equivalent to the score decayed to any instant.
+
+    ``score * exp(-(t - updated_at) / decay_hours)`` orders boards the same
+    for every ``t`` as ``log(score) + updated_at / decay_hours`` does, with
+    time in hours since the Unix epoch.  The key therefore never has to be
+    recomputed as time passes.  Missing or non-positive scores share
+    ``ZERO_SCORE_RANK_KEY`` so they tie below every positive score.
+    """
+    try:
+        value = float(score or 0.0)
+    except (TypeError, ValueError):
+        return ZERO_SCORE_RANK_KEY
+    if not isfinite(value) or value <= 0:
+        return ZERO_SCORE_RANK_KEY
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    epoch_hours = (updated_at - UNIX_EPOCH).total_seconds() / 3600
+    return log(value) + epoch_hours / decay_hours
+
+
+def next_metrics_crawl_at(
+    *,
+    hot_score: float | None,
+    created_at: datetime,
+    captured_at: datetime,
+) -> datetime | None:
+    """Return when a post's native metrics should be polled again.
+
+    The base interval doubles every ``HOT_DECAY_HOURS`` of post age and is
+    divided by ``1 + log1p(hot_score)``, so hot young posts are polled every
+    few minutes and old quiet ones a few times a day.  Posts older than
+    ``METRIC_REPOLL_MAX_AGE_HOURS`` are no longer polled.
+    """
+    if captured_at.tzinfo is None:
+        captured_at = captured_at.replace(tzinfo=timezone.utc)
+    age_hours = _age_hours(created_at, captured_at)
+    if age_hours >= METRIC_REPOLL_MAX_AGE_HOURS:
+        return None
+    score = float(hot_score or 0.0)
+    if not isfinite(score) or score < 0:
+        score = 0.0
+    minutes = (
+        METRIC_REPOLL_BASE_MINUTES
+        * 2 ** (age_hours / HOT_DECAY_HOURS)
+        / (1 + log1p(score))
+    )
+    minutes = min(max(minutes, MIN_METRIC_REPOLL_MINUTES), MAX_METRIC_REPOLL_MINUTES)
+    return captured_at + timedelta(minutes=minutes)
+
+
+# Breakdown keys the scalar function reports as ints rather than floats.
+INTEGER_BREAKDOWN_KEYS = frozenset(
+    {
+        "algorithm_version",
+        "comment_count",
+        "like_count",
+        "view_count",
+        "raw_delta_comments",
+        "raw_delta_likes",
+        "raw_delta_views",
+        "source_rank",
+    }
+)
+
+
+@dataclass(frozen=True)
+class PopularityScoreBatch:
+    hot_score: np.ndarray
+    daily_score: np.ndarray
+    breakdown: dict[str, np.ndarray] | None = None
+
+    def breakdown_rows(self) -> list[dict[str, Any]]:
+        """Split the breakdown into one dict per post, shaped like the scalar one.
+
+        ``NaN`` entries become ``None`` and count columns become ints, so the
+        rows can be stored as ``score_breakdown`` JSON.
+        """
+        rows = [{} for _ in range(len(self.hot_score))]
+        for key, values in (self.breakdown or {}).items():
+            as_int = key in INTEGER_BREAKDOWN_KEYS
+            for row, value in zip(rows, values.tolist()):
+                if value != value:
+                    row[key] = None
+                else:
+                    row[key] = int(value) if as_int else value
+        return rows
+
+
+def calculate_popularity_scores_batch(
+    *,
+    site: Sequence[str],
+    created_at: Sequence[datetime] | np.ndarray,
+    captured_at: Sequence[datetime] | np.ndarray,
+    comment_count: Sequence[int | None] | np.ndarray,
+    like_count: Sequence[int | None] | np.ndarray,
+    view_count: Sequence[int | None] | np.ndarray | None = None,
+    source_rank: Sequence[int | None] | np.ndarray | None = None,
+    previous_comment_count: Sequence[int | None] | np.ndarray | None = None,
+    previous_like_count: Sequence[int | None] | np.ndarray | None = None,
+    previous_view_count: Sequence[int | None] | np.ndarray | None = None,
+    previous_delta_comments: Sequence[int | None] | np.ndarray | None = None,
+    previous_delta_likes: Sequence[int | None] | np.ndarray | None = None,
+    previous_delta_views: Sequence[int | None] | np.ndarray | None = None,
+    llm_engagement_score: Sequence[float | None] | np.ndarray | None = None,
+    previous_captured_at: Sequence[datetime | None] | np.ndarray | None = None,
+    previous_interval_minutes: Sequence[float | None] | np.ndarray | None = None,
+    include_breakdown: bool = False,
+) -> PopularityScoreBatch:
+    """Score many posts at once with the same formula as ``calculate_popularity_scores``.
+
+    Every argument is a column with one value per post, named after the
+    matching ``PopularityMetrics`` field.  ``None`` entries (or ``NaN`` in
+    float arrays) mean "unknown", and an omitted optional column is unknown for
+    every post.  Datetime columns may be ``datetime`` sequences, where naive
+    values are UTC, or ``datetime64`` arrays in UTC.
+
+    The optional breakdown holds one array per scalar breakdown key; values
+    the scalar function reports as ``None`` are ``NaN`` here.
+    """
+    size = len(site)
+    created_us = _datetime_column(created_at, size)
+    captured_us = _datetime_column(captured_at, size)
+    previous_captured_us = _datetime_column(previous_captured_at, size)
+
+    comments = _clean_count_column(comment_count, size)
+    likes = _clean_count_column(like_count, size)
+    views = _clean_count_column(view_count, size)
+    raw_delta_comments = _delta_column(comments, previous_comment_count, size)
+    raw_delta_likes = _delta_column(likes, previous_like_count, size)
+    raw_delta_views = _delta_column(views, previous_view_count, size)
+
+    with np.errstate(invalid="ignore"):
+        current_interval_minutes = _clean_interval_column(
+            (captured_us - previous_captured_us) / 1_000_000 / 60
+        )
+    current_interval_scale = _interval_scale_column(current_interval_minutes)
+    previous_interval = _clean_interval_column(
+        _nullable_column(previous_interval_minutes, size)
+    )
+    previous_interval_scale = _interval_scale_column(previous_interval)
+
+    delta_comments = raw_delta_comments * current_interval_scale
+    delta_likes = raw_delta_likes * current_interval_scale
+    delta_views = raw_delta_views * current_interval_scale
+    previous_comments_delta = (
+        _clean_count_column(previous_delta_comments, size) * previous_interval_scale
+    )
+    previous_likes_delta = (
+        _clean_count_column(previous_delta_likes, size) * previous_interval_scale
+    )
+    previous_views_delta = (
+        _clean_count_column(previous_delta_views, size) * previous_interval_scale
+    )
+
+    total_component = (
+        1.2 * np.log1p(comments)
+        + 1.8 * np.log1p(likes)
+        + 0.2 * np.log1p(views)
+    )
+    velocity_component = _weighted_velocity_column(delta_comments, delta_likes, delta_views)
+    previous_velocity_component = _weighted_velocity_column(
+        previous_comments_delta,
+        previous_likes_delta,
+        previous_views_delta,
+    )
+    acceleration_component = np.minimum(
+        np.maximum(velocity_component - previous_velocity_component, 0.0),
+        2.0,
+    )
+    ranks = _nullable_column(source_rank, size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        source_rank_component = np.where(ranks > 0, 1 / np.sqrt(ranks), 0.0)
+    hot_source_rank_addend = 2.0 * source_rank_component
+    daily_source_rank_addend = 1.5 * source_rank_component
+    llm_scores = _nullable_column(llm_engagement_score, size)
+    llm_scores = np.where(np.isfinite(llm_scores), np.clip(llm_scores, 0.0, 100.0), 50.0)
+    llm_engagement_signal = (llm_scores - 50.0) / 50.0
+    hot_llm_addend = 1.5 * llm_engagement_signal
+    daily_llm_addend = 1.0 * llm_engagement_signal
+    age_hours = np.maximum((captured_us - created_us) / 1_000_000 / 3600, 0)
+    site_weight = np.array([SITE_WEIGHTS.get(value, 1.0) for value in site], dtype=float)
+
+    raw_hot_score = np.maximum(
+        0.35 * total_component
+        + 0.55 * velocity_component
+        + acceleration_component
+        + hot_source_rank_addend
+        + hot_llm_addend,
+        0.0,
+    )
+    raw_daily_score = np.maximum(
+        0.65 * total_component
+        + 0.25 * velocity_component
+        + daily_source_rank_addend
+        + daily_llm_addend,
+        0.0,
+    )
+    hot_age_decay = np.exp(-age_hours / HOT_DECAY_HOURS)
+    daily_age_decay = np.exp(-age_hours / DAILY_DECAY_HOURS)
+    hot_score = raw_hot_score * site_weight * hot_age_decay
+    daily_score = raw_daily_score * site_weight * daily_age_decay
+    if not include_breakdown:
+        return PopularityScoreBatch(hot_score=hot_score, daily_score=daily_score)
+
+    return PopularityScoreBatch(
+        hot_score=hot_score,
+        daily_score=daily_score,
+        breakdown={
+            "algorithm_version": np.full(size, ALGORITHM_VERSION),
+            "comment_count": comments,
+            "like_count": likes,
+            "view_count": views,
+            "raw_delta_comments": raw_delta_comments,
+            "raw_delta_likes": raw_delta_likes,
+            "raw_delta_views": raw_delta_views,
+            "current_interval_minutes": current_interval_minutes,
+            "current_interval_scale": current_interval_scale,
+            "previous_interval_minutes": previous_interval,
+            "previous_interval_scale": previous_interval_scale,
+            "delta_comments_20m": delta_comments,
+            "delta_likes_20m": delta_likes,
+            "delta_views_20m": delta_views,
+            "previous_delta_comments_20m": previous_comments_delta,
+            "previous_delta_likes_20m": previous_likes_delta,
+            "previous_delta_views_20m": previous_views_delta,
+            "total_component": total_component,
+            "velocity_component": velocity_component,
+            "previous_velocity_component": previous_velocity_component,
+            "acceleration_component": acceleration_component,
+            "source_rank": ranks,
+            "source_rank_component": source_rank_component,
+            "hot_source_rank_addend": hot_source_rank_addend,
+            "daily_source_rank_addend": daily_source_rank_addend,
+            "llm_engagement_score": llm_scores,
+            "llm_engagement_signal": llm_engagement_signal,
+            "hot_llm_addend": hot_llm_addend,
+            "daily_llm_addend": daily_llm_addend,
+            "raw_hot_score": raw_hot_score,
+            "raw_daily_score": raw_daily_score,
+            "age_hours": age_hours,
+            "hot_age_decay": hot_age_decay,
+            "daily_age_decay": daily_age_decay,
+            "site_weight": site_weight,
+        },
+    )
+
+
+def _nullable_column(values, size: int) -> np.ndarray:
+    if values is None:
+        return np.full(size, np.nan)
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+        return values.astype(float)
+    return np.array(
+        [np.nan if value is None else float(value) for value in values],
+        dtype=float,
+    )
+
+
+def _clean_count_column(values, size: int) -> np.ndarray:
+    counts = _nullable_column(values, size)
+    return np.where(np.isnan(counts), 0.0, np.maximum(np.trunc(counts), 0.0))
+
+
+def _delta_column(current: np.ndarray, previous, size: int) -> np.ndarray:
+    previous_counts = np.trunc(_nullable_column(previous, size))
+    return np.where(
+        np.isnan(previous_counts),
+        0.0,
+        np.maximum(current - previous_counts, 0.0),
+    )
+
+
+def _clean_interval_column(minutes: np.ndarray) -> np.ndarray:
+    return np.where(np.isfinite(minutes) & (minutes > 0), minutes, np.nan)
+
+
+def _interval_scale_column(interval_minutes: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        scale = np.clip(
+            DEFAULT_INTERVAL_MINUTES / interval_minutes,
+            MIN_INTERVAL_SCALE,
+            MAX_INTERVAL_SCALE,
+        )
+    return np.where(np.isnan(interval_minutes), 1.0, scale)
+
+
+def _weighted_velocity_column(
+    comments: np.ndarray,
+    likes: np.ndarray,
+    views: np.ndarray,
+) -> np.ndarray:
+    return (
+        2.4 * np.log1p(comments)
+        + 3.2 * np.log1p(likes)
+        + 0.3 * np.log1p(views)
+    )
+
+
+def _datetime_column(values, size: int) -> np.ndarray:
+    """Return UTC microseconds since the epoch as floats, ``NaN`` when unknown."""
+    if values is None:
+        return np.full(size, np.nan)
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        microseconds = values.astype("datetime64[us]")
+        return np.where(
+            np.isnat(microseconds),
+            np.nan,
+            microseconds.astype(np.int64).astype(float),
+        )
+    return np.array(
+        [
+            np.nan
+            if value is None
+            else float(
+                (
+                    (value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value)
+                    - UNIX_EPOCH
+                )
+                // timedelta(microseconds=1)
+            )
+            for value in values
+        ],
+        dtype=float,
+    )
@@ -2,7 +2,7 @@ import sys
 import os
 from datetime import datetime
 
-import requests
+from crawl_scheduler.utils import http_client
 from crawl_scheduler.config import Config
 from crawl_scheduler.utils.loghandler import logger
 class FileManager:
@@ -21,7 +21,7 @@ class FileManager:
         #     os.makedirs(self.download_path)
 
         try:
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             img_name = os.path.basename(url)
 
@@ -0,0 +1,262 @@
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+import hashlib
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_TIMEOUT_SECONDS = 15.0
+DEFAULT_PAGE_CACHE_MAX_PAGES = 512
+
+logger = logging.getLogger("crawler")
+
+
+class HttpClient:
+    """Process-wide HTTP session with keep-alive pools per host.
+
+    ``pool_connections`` bounds how many hosts keep a cached pool and
+    ``pool_maxsize`` bounds the idle connections kept per host, which should be
+    at least the number of crawler worker threads.  ``CRAWLER_HTTP_PROXY`` is
+    applied to crawler traffic; internal services opt out with
+    ``use_proxy=False``.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        proxy_url: str | None = None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        use_proxy: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout_seconds)
+        if kwargs.get("proxies") is None:
+            kwargs["proxies"] = self.proxies if use_proxy else None
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+@dataclass(frozen=True)
+class _CachedPage:
+    etag: str | None
+    last_modified: str | None
+    body_hash: str
+    parsed: object
+
+
+class PageCache:
+    """Validators, body hash and parse result of the last fetch of each URL.
+
+    Callers add ``conditional_headers(url)`` to the request and hand the
+    response to ``parse``.  A 304 response, or a 200 whose body hashes the
+    same as last time, returns the previous parse result without calling
+    ``parse`` again.  Feed pages and re-fetched article pages share the
+    cache; the least recently used URL is evicted beyond ``max_pages``.
+    Per-site counters are exposed by ``stats``.
+    """
+
+    def __init__(self, *, max_pages: int = DEFAULT_PAGE_CACHE_MAX_PAGES):
+        self.max_pages = max_pages
+        self._pages: OrderedDict[str, _CachedPage] = OrderedDict()
+        self._stats: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        with self._lock:
+            page = self._pages.get(url)
+        headers = {}
+        if page is not None and page.etag:
+            headers["If-None-Match"] = page.etag
+        if page is not None and page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def parse(self, site: str, url: str, response, parse):
+        with self._lock:
+            page = self._pages.get(url)
+        if getattr(response, "status_code", 200) == 304 and page is not None:
+            return self._reuse(site, url, page, "not_modified")
+
+        response.raise_for_status()
+        body = getattr(response, "content", None) or response.text
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        body_hash = hashlib.sha256(body).hexdigest()
+        headers = getattr(response, "headers", None) or {}
+        if page is not None and page.body_hash == body_hash:
+            page = _CachedPage(
+                etag=headers.get("ETag") or page.etag,
+                last_modified=headers.get("Last-Modified") or page.last_modified,
+                body_hash=body_hash,
+                parsed=page.parsed,
+            )
+            with self._lock:
+                self._remember(url, page)
+            return self._reuse(site, url, page, "unchanged")
+
+        parsed = parse(response)
+        with self._lock:
+            self._remember(
+                url,
+                _CachedPage(
+                    etag=headers.get("ETag"),
+                    last_modified=headers.get("Last-Modified"),
+                    body_hash=body_hash,
+                    parsed=parsed,
+                ),
+            )
+            self._stats.setdefault(site, Counter())["parsed"] += 1
+        return parsed
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {site: dict(counter) for site, counter in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._stats.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pages)
+
+    def _remember(self, url: str, page: _CachedPage) -> None:
+        self._pages[url] = page
+        self._pages.move_to_end(url)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _reuse(self, site: str, url: str, page: _CachedPage, reason: str):
+        with self._lock:
+            if url in self._pages:
+                self._pages.move_to_end(url)
+            counter = self._stats.setdefault(site, Counter())
+            counter[reason] += 1
+            skipped = counter["not_modified"] + counter["unchanged"]
+            total = skipped + counter["parsed"]
+        logger.info(
+            "Reused parsed %s page (%s): %s; %d of %d fetches skipped parsing",
+            site,
+            reason,
+            url,
+            skipped,
+            total,
+        )
+        return page.parsed
+
+
+_CLIENT: HttpClient | None = None
+_CLIENT_LOCK = threading.Lock()
+_PAGE_CACHE = PageCache()
+
+
+def get_http_client() -> HttpClient:
+    global _CLIENT
+
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HttpClient(
+                    pool_connections=_env_int(
+                        "CRAWLER_HTTP_POOL_CONNECTIONS",
+                        DEFAULT_POOL_CONNECTIONS,
+                    ),
+                    pool_maxsize=_env_int(
+                        "CRAWLER_HTTP_POOL_MAXSIZE",
+                        DEFAULT_POOL_MAXSIZE,
+                    ),
+                    timeout_seconds=_env_float(
+                        "CRAWLER_HTTP_TIMEOUT_SECONDS",
+                        DEFAULT_TIMEOUT_SECONDS,
+                    ),
+                    proxy_url=crawler_proxy_url(),
+                )
+    return _CLIENT
+
+
+def reset_http_client() -> None:
+    """Drop the shared client so the next request re-reads the environment."""
+    global _CLIENT
+
+    with _CLIENT_LOCK:
+        if _CLIENT is not None:
+            _CLIENT.close()
+        _CLIENT = None
+
+
+def get_page_cache() -> PageCache:
+    return _PAGE_CACHE
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return get_http_client().get(url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    return get_http_client().head(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return get_http_client().post(url, **kwargs)
+
+
+def crawler_proxy_url() -> str | None:
+    return os.getenv("CRAWLER_HTTP_PROXY", "").strip() or None
+
+
+def crawler_proxies() -> dict[str, str] | None:
+    proxy_url = crawler_proxy_url()
+    if not proxy_url:
+        return None
+    return {"http": proxy_url, "https": proxy_url}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
@@ -4,6 +4,8 @@ import os
 
 import requests
 
+from crawl_scheduler.utils import http_client
+
 
 logger = logging.getLogger("crawler")
 
@@ -49,10 +51,11 @@ class LLM:
         }
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}/api/chat",
                 json=payload,
                 timeout=self.timeout_seconds,
+                use_proxy=False,
             )
             response.raise_for_status()
             response_data = response.json()
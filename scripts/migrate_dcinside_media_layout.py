@@ -153,7 +153,7 @@ def main(argv=None):
                             cursor.execute(
                                 """
                                 UPDATE boards
-                                SET contents = %s::json, thumbnail = %s
+                                SET contents = %s::jsonb, thumbnail = %s
                                 WHERE lower(site) = 'dcinside'
                                   AND category = 'dcbest'
                                   AND no = %s
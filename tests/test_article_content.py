@@ -18,6 +18,11 @@ from crawl_scheduler.community_website.article_content import (
 from crawl_scheduler.community_website.community_website import (
     AbstractCommunityWebsite,
 )
+from crawl_scheduler.media_probe import MediaProbe
+
+
+def small_video_probe(url, **kwargs):
+    return MediaProbe(content_type="video/mp4", content_length=1024)
 
 
 class FakeResponse:
@@ -105,6 +110,7 @@ def test_common_popular_body_parser_interleaves_text_and_media(monkeypatch):
         or f"test/{media_url.rsplit('/', 1)[-1]}",
     )
     monkeypatch.setattr(crawler, "img_to_text", lambda path: "이미지 OCR")
+    monkeypatch.setattr(crawler, "probe_media", small_video_probe)
 
     contents = crawler.get_board_contents(
         category="best",
@@ -129,9 +135,9 @@ def test_common_popular_body_parser_interleaves_text_and_media(monkeypatch):
         "source_url": "https://www.youtube.com/embed/example",
     }
     assert contents[6]["text"] == "마지막"
-    assert saved_urls == [
-        "https://example.com/image.jpg",
+    assert sorted(saved_urls) == [
         "https://example.com/clip.mp4",
+        "https://example.com/image.jpg",
     ]
 
     saved_urls.clear()
@@ -189,6 +195,175 @@ def test_filename_alt_does_not_prevent_ocr(monkeypatch):
     ]
 
 
+def test_media_downloads_run_concurrently_and_keep_dom_order(monkeypatch):
+    import threading
+
+    from crawl_scheduler.community_website.article_content import (
+        build_ordered_content_blocks,
+    )
+    from crawl_scheduler.community_website.popular_community import (
+        PopularCommunityCrawler,
+    )
+
+    body = BeautifulSoup(
+        "<div>앞<img src='/1.jpg'>가운데<img src='/2.jpg'>"
+        "<img src='/1.jpg'><video src='/3.mp4'></video>끝</div>",
+        "html.parser",
+    ).div
+    crawler = PopularCommunityCrawler.__new__(PopularCommunityCrawler)
+    all_started = threading.Barrier(3, timeout=5)
+    saved_urls = []
+
+    def save_file(media_url, **kwargs):
+        saved_urls.append(media_url)
+        all_started.wait()
+        return f"test/{media_url.rsplit('/', 1)[-1]}"
+
+    ocr_paths = []
+    monkeypatch.setattr(crawler, "img_to_text", lambda path: ocr_paths.append(path))
+    monkeypatch.setattr(crawler, "probe_media", small_video_probe)
+
+    blocks = build_ordered_content_blocks(
+        crawler,
+        body,
+        base_url="https://example.com/posts/1",
+        save_file=save_file,
+        media_workers=3,
+    )
+
+    assert [(block["type"], block.get("media_path")) for block in blocks] == [
+        ("text", None),
+        ("image", "test/1.jpg"),
+        ("text", None),
+        ("image", "test/2.jpg"),
+        ("video", "test/3.mp4"),
+        ("text", None),
+    ]
+    assert sorted(saved_urls) == [
+        "https://example.com/1.jpg",
+        "https://example.com/2.jpg",
+        "https://example.com/3.mp4",
+    ]
+    assert [Path(path).name for path in ocr_paths] == ["1.jpg", "2.jpg"]
+
+
+def test_videos_are_probed_before_download_and_large_clips_are_deferred(
+    monkeypatch, tmp_path
+):
+    from crawl_scheduler.community_website.article_content import (
+        build_ordered_content_blocks,
+    )
+    from crawl_scheduler.community_website.popular_community import (
+        PopularCommunityCrawler,
+    )
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    body = BeautifulSoup(
+        "<div>영상 모음<video src='/small.mp4'></video><video src='/large.mp4'></video>"
+        "<video src='/huge.mp4'></video><video src='/player.mp4'></video>"
+        "<video src='/unsized.mp4'></video></div>",
+        "html.parser",
+    ).div
+    probes = {
+        "small.mp4": MediaProbe("video/mp4", 1024),
+        "large.mp4": MediaProbe("video/mp4", 50 * 1024 * 1024),
+        "huge.mp4": MediaProbe("video/mp4", 500 * 1024 * 1024),
+        "player.mp4": MediaProbe("text/html", 2048),
+        "unsized.mp4": None,
+    }
+    crawler = PopularCommunityCrawler.__new__(PopularCommunityCrawler)
+    crawler.site = "test"
+    crawler.db_controller = PostgresController(
+        database_url=f"sqlite:///{tmp_path / 'crawler.db'}"
+    )
+    monkeypatch.setattr(
+        crawler,
+        "probe_media",
+        lambda media_url, **kwargs: probes[media_url.rsplit("/", 1)[-1]],
+    )
+    saved_urls = []
+
+    def save_file(media_url, **kwargs):
+        saved_urls.append(media_url)
+        return f"test/{media_url.rsplit('/', 1)[-1]}"
+
+    class FakeQueue:
+        def __init__(self):
+            self.jobs = []
+
+        def submit(self, job):
+            self.jobs.append(job)
+            return True
+
+    deferred_media = FakeQueue()
+    blocks = build_ordered_content_blocks(
+        crawler,
+        body,
+        base_url="https://example.com/posts/7",
+        category="best",
+        no=7,
+        save_file=save_file,
+        deferred_media=deferred_media,
+    )
+
+    assert saved_urls == ["https://example.com/small.mp4"]
+    assert [block.get("media_path") for block in blocks[1:]] == [
+        "test/small.mp4",
+        None,
+        None,
+        None,
+        None,
+    ]
+    assert len(deferred_media.jobs) == 2
+    finished_before_insert, finished_after_insert = deferred_media.jobs
+    finished_before_insert()
+
+    crawler.db_controller.insert_one(
+        "Realtime",
+        {
+            "site": "test",
+            "category": "best",
+            "no": 7,
+            "title": "영상 모음",
+            "url": "https://example.com/posts/7",
+            "contents": blocks,
+        },
+    )
+    finished_after_insert()
+
+    stored = crawler.db_controller.find("Realtime", {"site": "test", "no": 7})[0]
+    assert [block.get("media_path") for block in stored["contents"][1:]] == [
+        "test/small.mp4",
+        "test/large.mp4",
+        None,
+        None,
+        "test/unsized.mp4",
+    ]
+
+
+def test_deferred_media_queue_refuses_jobs_beyond_its_bound():
+    import threading
+
+    from crawl_scheduler.media_probe import DeferredMediaQueue
+
+    queue = DeferredMediaQueue(workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        assert queue.submit(release.wait)
+        assert not queue.submit(lambda: None)
+    finally:
+        release.set()
+        queue.shutdown()
+
+    assert queue.stats() == {
+        "pending": 0,
+        "queued": 1,
+        "completed": 1,
+        "failed": 0,
+        "dropped": 1,
+    }
+
+
 @pytest.mark.parametrize(
     ("module_name", "class_name", "body_markup"),
     [
@@ -215,7 +390,7 @@ def test_legacy_body_parsers_capture_non_paragraph_text_in_order(
     crawler = getattr(module, class_name).__new__(getattr(module, class_name))
     saved_urls = []
     monkeypatch.setattr(
-        module.requests,
+        module.http_client,
         "get",
         lambda *args, **kwargs: FakeResponse(html),
     )
@@ -230,6 +405,11 @@ def test_legacy_body_parsers_capture_non_paragraph_text_in_order(
         "img_to_text",
         lambda self, path: "이미지 OCR",
     )
+    monkeypatch.setattr(
+        AbstractCommunityWebsite,
+        "probe_media",
+        lambda self, url, **kwargs: small_video_probe(url),
+    )
 
     contents = crawler.get_board_contents(
         category="best",
@@ -251,7 +431,7 @@ def test_legacy_body_parsers_capture_non_paragraph_text_in_order(
     assert "스타일 노이즈" not in "\n".join(
         block.get("text", "") for block in contents
     )
-    assert saved_urls == [
-        "https://example.com/image.jpg",
+    assert sorted(saved_urls) == [
         "https://example.com/clip.mp4",
+        "https://example.com/image.jpg",
     ]
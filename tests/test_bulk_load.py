@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+def _document(no, **overrides):
+    return {
+        "site": "ygosu",
+        "category": "yeobgi",
+        "no": no,
+        "title": f"post {no}",
+        "url": f"https://example.com/post/{no}",
+        "create_time": datetime(2026, 6, 23, 9, tzinfo=timezone.utc),
+        **overrides,
+    }
+
+
+def test_bulk_load_skips_or_merges_source_id_conflicts(tmp_path):
+    from crawl_scheduler.db.bulk_load import load_boards
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    database_url = f"sqlite:///{tmp_path / 'crawler.db'}"
+    controller = PostgresController(database_url=database_url)
+    controller.insert_one("Realtime", _document(1, title="stored", native_like_count=1))
+
+    result = load_boards(
+        [
+            _document(1, title="replayed", native_like_count=7),
+            _document(2),
+            _document(2),
+            _document(3),
+        ],
+        database_url=database_url,
+        batch_size=2,
+    )
+
+    assert (result.loaded, result.skipped) == (2, 2)
+    stored = controller.find("Realtime", {"site": "ygosu", "category": "yeobgi", "no": 1})[0]
+    assert (stored["title"], stored["native_like_count"]) == ("stored", 1)
+    assert controller.exists("Realtime", {"site": "ygosu", "category": "yeobgi", "no": 3})
+
+    merged = load_boards(
+        [_document(1, title="replayed", native_like_count=7)],
+        database_url=database_url,
+        on_conflict="update_metrics",
+    )
+
+    assert (merged.loaded, merged.skipped) == (0, 1)
+    stored = controller.find("Realtime", {"site": "ygosu", "category": "yeobgi", "no": 1})[0]
+    assert (stored["title"], stored["native_like_count"]) == ("stored", 7)
+    with pytest.raises(ValueError):
+        load_boards([], database_url=database_url, on_conflict="replace")
+
+
+def test_snapshot_replay_rescores_like_per_row_refreshes(tmp_path):
+    from crawl_scheduler.db.bulk_load import load_boards, load_metric_snapshots
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    created_at = datetime(2026, 6, 23, 9, tzinfo=timezone.utc)
+    captures = [
+        {
+            "captured_at": created_at + timedelta(minutes=7 * step),
+            "comment_count": 1 + step * 3,
+            "like_count": 1 + step * step,
+            "view_count": 100 * (step + 1),
+            "source_rank": 4 - step,
+        }
+        for step in range(3)
+    ]
+
+    per_row = PostgresController(database_url=f"sqlite:///{tmp_path / 'rows.db'}")
+    per_row.insert_one(
+        "Realtime",
+        _document(
+            9,
+            native_comment_count=captures[0]["comment_count"],
+            native_like_count=captures[0]["like_count"],
+            native_view_count=captures[0]["view_count"],
+            source_rank=captures[0]["source_rank"],
+            metrics_crawled_at=captures[0]["captured_at"],
+        ),
+    )
+    for capture in captures[1:]:
+        per_row.refresh_native_metrics(
+            "Realtime",
+            {"site": "ygosu", "category": "yeobgi", "no": 9},
+            {
+                "native_comment_count": capture["comment_count"],
+                "native_like_count": capture["like_count"],
+                "native_view_count": capture["view_count"],
+                "source_rank": capture["source_rank"],
+                "metrics_crawled_at": capture["captured_at"],
+            },
+        )
+
+    bulk_url = f"sqlite:///{tmp_path / 'bulk.db'}"
+    load_boards([_document(9)], database_url=bulk_url)
+    result = load_metric_snapshots(
+        [
+            {"source_id": "ygosu:yeobgi:9", **capture}
+            for capture in reversed(captures)
+        ]
+        + [{"source_id": "ygosu:yeobgi:404", **captures[0]}],
+        database_url=bulk_url,
+        batch_size=2,
+    )
+
+    assert (result.loaded, result.skipped, result.rescored) == (3, 1, 1)
+    query = {"site": "ygosu", "category": "yeobgi", "no": 9}
+    expected = per_row.find("Realtime", query)[0]
+    actual = PostgresController(database_url=bulk_url).find("Realtime", query)[0]
+    for key in ("native_comment_count", "native_like_count", "source_rank"):
+        assert actual[key] == expected[key]
+    assert actual["hot_score"] == pytest.approx(expected["hot_score"])
+    assert actual["daily_score"] == pytest.approx(expected["daily_score"])
+    assert actual["score_breakdown"] == pytest.approx(expected["score_breakdown"])
+    assert [
+        row["id"] for row in PostgresController(database_url=bulk_url).get_realtime_best(0, 5)
+    ] == [actual["id"]]
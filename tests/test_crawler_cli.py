@@ -39,9 +39,12 @@ def test_once_flag_runs_crawl_and_exits(monkeypatch):
         lambda factories: calls.append(("crawl", tuple(factories))),
     )
     monkeypatch.setattr(main, "PostgresController", FakeDB)
+    monkeypatch.setattr(main, "bootstrap_schema", lambda: True)
+    monkeypatch.setattr(main, "maintain_partitions", lambda: calls.append("partitions"))
 
     assert main.main(["--once"]) == 0
     assert calls == [
+        "partitions",
         ("crawl", main.DEFAULT_CRAWLER_FACTORIES),
         "snapshot",
     ]
@@ -62,6 +65,8 @@ def test_seed_alias_runs_crawl_and_exits(monkeypatch):
         lambda factories: calls.append(("crawl", tuple(factories))),
     )
     monkeypatch.setattr(main, "PostgresController", FakeDB)
+    monkeypatch.setattr(main, "bootstrap_schema", lambda: True)
+    monkeypatch.setattr(main, "maintain_partitions", lambda: None)
 
     assert main.main(["--seed"]) == 0
     assert calls == [
@@ -96,6 +101,8 @@ def test_disabled_sites_are_excluded_from_once_and_repeating_jobs(monkeypatch):
         ),
     )
     monkeypatch.setattr(main, "PostgresController", FakeDB)
+    monkeypatch.setattr(main, "bootstrap_schema", lambda: True)
+    monkeypatch.setattr(main, "maintain_partitions", lambda: None)
 
     assert main.main(["--once"]) == 0
     assert once_calls == [
@@ -207,7 +214,7 @@ def test_interval_minutes_rejects_invalid_environment_values(
         main.parse_args([])
 
 
-def test_repeating_scheduler_registers_each_site_and_one_snapshot_job():
+def test_repeating_scheduler_registers_one_job_per_site():
     import schedule
 
     from crawl_scheduler import main
@@ -223,11 +230,10 @@ def test_repeating_scheduler_registers_each_site_and_one_snapshot_job():
         next(iter(job.tags)): job
         for job in scheduler.jobs
     }
-    assert len(jobs_by_tag) == len(main.CRAWLER_SPECS) + 1
+    assert len(jobs_by_tag) == len(main.CRAWLER_SPECS)
     assert jobs_by_tag["crawler:arca"].interval == 10
     assert jobs_by_tag["crawler:theqoo"].interval == 15
     assert jobs_by_tag["crawler:fmkorea"].interval == 30
-    assert jobs_by_tag["snapshot"].interval == 5
 
 
 def test_scheduled_site_job_runs_only_its_factory(monkeypatch):
@@ -264,6 +270,136 @@ def test_scheduled_site_job_runs_only_its_factory(monkeypatch):
     assert calls == [(SecondCrawler,)]
 
 
+def test_workers_cli_option_is_parsed_and_validated():
+    from crawl_scheduler import main
+
+    assert main.parse_args([]).workers is None
+    assert main.parse_args(["--workers", "4"]).workers == 4
+    with pytest.raises(SystemExit):
+        main.parse_args(["--workers", "0"])
+
+
+def test_database_pool_cli_options_override_environment(monkeypatch):
+    from crawl_scheduler import main
+
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "8")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "4")
+
+    settings = main.parse_args(
+        ["--db-pool-size", "20", "--db-pre-ping-interval-seconds", "1.5"]
+    ).pool_settings
+
+    assert settings.pool_size == 20
+    assert settings.max_overflow == 4
+    assert settings.pre_ping_interval_seconds == 1.5
+    with pytest.raises(SystemExit):
+        main.parse_args(["--db-statement-timeout-ms", "-1"])
+    with pytest.raises(SystemExit):
+        main.parse_args(["--db-pool-size", "0"])
+
+
+def test_site_executor_never_overlaps_a_site_with_itself():
+    import threading
+
+    from crawl_scheduler.crawl_executor import SiteCrawlExecutor
+
+    release_slow = threading.Event()
+    fast_done = threading.Event()
+    calls = []
+
+    def slow_crawl():
+        calls.append("slow")
+        release_slow.wait(timeout=5)
+
+    def fast_crawl():
+        calls.append("fast")
+        fast_done.set()
+
+    executor = SiteCrawlExecutor(2)
+    try:
+        first = executor.submit("crawler:slow", slow_crawl)
+        duplicate = executor.submit("crawler:slow", slow_crawl)
+        other = executor.submit("crawler:fast", fast_crawl)
+
+        assert first is not None
+        assert duplicate is None
+        assert other is not None
+        assert fast_done.wait(timeout=5)
+        assert executor.is_running("crawler:slow")
+
+        release_slow.set()
+        first.result(timeout=5)
+        other.result(timeout=5)
+        assert not executor.is_running("crawler:slow")
+        assert executor.submit("crawler:slow", lambda: calls.append("again")).result(
+            timeout=5
+        ) is None
+    finally:
+        release_slow.set()
+        executor.shutdown()
+
+    assert calls == ["slow", "fast", "again"]
+
+
+def test_scheduled_site_jobs_are_dispatched_to_the_executor(monkeypatch):
+    import schedule
+
+    from crawl_scheduler import main
+
+    submitted = []
+
+    class FakeExecutor:
+        def submit(self, key, function, *args):
+            submitted.append((key, function, args))
+
+    class FirstCrawler:
+        pass
+
+    specs = (main.CrawlerSpec("first", FirstCrawler, 5),)
+    scheduler = schedule.Scheduler()
+
+    main.configure_schedule(
+        scheduler,
+        {"first": 5},
+        crawler_specs=specs,
+        executor=FakeExecutor(),
+    )
+    for job in scheduler.jobs:
+        job.run()
+
+    assert submitted == [
+        ("crawler:first", main.get_realtime_best, ((FirstCrawler,),)),
+    ]
+
+
+def test_once_with_workers_runs_sites_through_the_pool(monkeypatch):
+    import threading
+
+    from crawl_scheduler import main
+
+    calls = []
+    threads = set()
+
+    class FakeDB:
+        def record_daily_top10_snapshot(self):
+            calls.append("snapshot")
+
+    def fake_crawl(factories):
+        threads.add(threading.current_thread().name)
+        calls.append(tuple(factory.__name__ for factory in factories))
+
+    monkeypatch.setenv("CRAWLER_DISABLED_SITES", "fmkorea,theqoo,arca")
+    monkeypatch.setattr(main, "get_realtime_best", fake_crawl)
+    monkeypatch.setattr(main, "PostgresController", FakeDB)
+    monkeypatch.setattr(main, "bootstrap_schema", lambda: True)
+    monkeypatch.setattr(main, "maintain_partitions", lambda: None)
+
+    assert main.main(["--once", "--workers", "2"]) == 0
+    assert sorted(calls[:-1]) == [("Dcinside",), ("Inven",), ("Ppomppu",), ("Ygosu",)]
+    assert calls[-1] == "snapshot"
+    assert all(name.startswith("crawler") for name in threads)
+
+
 def test_snapshot_failure_is_logged_without_stopping_the_job(monkeypatch):
     from crawl_scheduler import main
 
@@ -415,7 +551,7 @@ def test_dcinside_board_list_preserves_absolute_links(monkeypatch):
             return None
 
     monkeypatch.setattr(dcinside, "PostgresController", lambda: FakeDB())
-    monkeypatch.setattr(dcinside.requests, "get", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(dcinside.http_client, "get", lambda *args, **kwargs: FakeResponse())
 
     crawler = dcinside.Dcinside()
     entries = crawler.get_board_entries()
@@ -432,6 +568,98 @@ def test_dcinside_board_list_preserves_absolute_links(monkeypatch):
     assert entries[0].created_at.tzinfo == ZoneInfo("Asia/Seoul")
 
 
+def test_unchanged_feed_page_is_not_parsed_again(monkeypatch):
+    from crawl_scheduler.community_website import dcinside
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+        text = """
+        <table>
+          <tr class="ub-content">
+            <td class="gall_num">1</td>
+            <td class="gall_tit"><a href="/board/view/?id=dcbest&no=77">같은 글</a></td>
+            <td class="gall_date" title="2026-07-17 15:30:00">15:30</td>
+            <td class="gall_count">10</td>
+            <td class="gall_recommend">2</td>
+          </tr>
+        </table>
+        """
+
+        def raise_for_status(self):
+            return None
+
+    requests = []
+    monkeypatch.setattr(dcinside, "PostgresController", lambda: object())
+    monkeypatch.setattr(
+        dcinside.http_client,
+        "get",
+        lambda url, headers=None: requests.append(headers) or FakeResponse(),
+    )
+    monkeypatch.setattr(dcinside.http_client, "_PAGE_CACHE", dcinside.http_client.PageCache())
+    crawler = dcinside.Dcinside()
+    parse_board_entries = crawler.parse_board_entries
+    parses = []
+    monkeypatch.setattr(
+        crawler,
+        "parse_board_entries",
+        lambda response: parses.append(response) or parse_board_entries(response),
+    )
+
+    first = crawler.get_board_entries()
+    second = crawler.get_board_entries()
+
+    assert len(parses) == 1
+    assert [entry.no for entry in second] == [entry.no for entry in first] == ["77"]
+    assert second[0].metrics_crawled_at >= first[0].metrics_crawled_at
+    assert dcinside.http_client.get_page_cache().stats() == {
+        "dcinside": {"parsed": 1, "unchanged": 1}
+    }
+
+
+def test_unchanged_article_is_not_parsed_again_on_content_refresh(monkeypatch):
+    from crawl_scheduler.community_website import ygosu
+
+    class FakeResponse:
+        status_code = 200
+        headers = {"ETag": '"article-v1"'}
+        content = b'<div class="container"><p>still too short</p></div>'
+
+        def raise_for_status(self):
+            return None
+
+    requests = []
+    monkeypatch.setattr(ygosu, "PostgresController", lambda: object())
+    monkeypatch.setattr(
+        ygosu.http_client,
+        "get",
+        lambda url, headers=None: requests.append(headers) or FakeResponse(),
+    )
+    monkeypatch.setattr(ygosu.http_client, "_PAGE_CACHE", ygosu.http_client.PageCache())
+    crawler = ygosu.Ygosu()
+    parse_board_contents = crawler.parse_board_contents
+    parses = []
+    monkeypatch.setattr(
+        crawler,
+        "parse_board_contents",
+        lambda response, **kwargs: parses.append(response)
+        or parse_board_contents(response, **kwargs),
+    )
+    url = "https://ygosu.com/board/yeobgi/77/"
+
+    first = crawler.get_board_contents(url=url, category="yeobgi", no=77, use_page_cache=True)
+    second = crawler.get_board_contents(url=url, category="yeobgi", no=77, use_page_cache=True)
+    crawler.get_board_contents(url=url, category="yeobgi", no=77)
+
+    assert len(parses) == 2
+    assert second == first
+    assert requests[1] == {"If-None-Match": '"article-v1"'}
+    assert requests[2] is None
+    assert ygosu.http_client.get_page_cache().stats() == {
+        "ygosu": {"parsed": 1, "unchanged": 1}
+    }
+
+
 def test_ppomppu_board_list_omits_reply_count_from_title(monkeypatch):
     from crawl_scheduler.community_website import ppomppu
 
@@ -463,7 +691,7 @@ def test_ppomppu_board_list_omits_reply_count_from_title(monkeypatch):
             return None
 
     monkeypatch.setattr(ppomppu, "PostgresController", lambda: FakeDB())
-    monkeypatch.setattr(ppomppu.requests, "get", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(ppomppu.http_client, "get", lambda *args, **kwargs: FakeResponse())
 
     crawler = ppomppu.Ppomppu()
     entries = crawler.get_board_entries()
@@ -510,7 +738,7 @@ def test_ygosu_board_entries_parse_metrics_and_contiguous_rank(monkeypatch):
             return None
 
     monkeypatch.setattr(ygosu, "PostgresController", lambda: FakeDB())
-    monkeypatch.setattr(ygosu.requests, "get", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(ygosu.http_client, "get", lambda *args, **kwargs: FakeResponse())
 
     crawler = ygosu.Ygosu()
     entries = crawler.get_board_entries()
@@ -542,6 +770,7 @@ def test_existing_posts_refresh_metrics_without_fetching_body(
     monkeypatch, module_name, class_name, site, category, no
 ):
     from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
 
     module = importlib.import_module(
         f"crawl_scheduler.community_website.{module_name}"
@@ -549,18 +778,17 @@ def test_existing_posts_refresh_metrics_without_fetching_body(
 
     class FakeDB:
         def __init__(self):
-            self.refresh_calls = []
+            self.ingest_calls = []
 
-        def find(self, collection, query):
-            return [{"id": "existing"}] if collection == "Realtime" else []
+        def ingest_feed(self, site, entries):
+            self.ingest_calls.append((site, list(entries)))
+            return FeedIngestResult(
+                existing_entries=list(entries),
+                new_entries=[],
+                content_refresh_entries=[],
+            )
 
-        def refresh_native_metrics(self, *args):
-            self.refresh_calls.append(args)
-
-        def needs_content_refresh(self, *args):
-            return False
-
-        def insert_one(self, *args, **kwargs):
+        def insert_many(self, *args, **kwargs):
             pytest.fail("existing posts must not be inserted again")
 
     fake_db = FakeDB()
@@ -588,13 +816,8 @@ def test_existing_posts_refresh_metrics_without_fetching_body(
     )
 
     assert crawler.get_realtime_best() is True
-    assert fake_db.refresh_calls == [
-        (
-            "Realtime",
-            {"site": site, "category": category, "no": no},
-            metrics,
-        )
-    ]
+    assert fake_db.ingest_calls == [(site, [entry])]
+    assert entry.metrics_dict() == metrics
 
 
 @pytest.mark.parametrize(
@@ -610,6 +833,7 @@ def test_existing_posts_with_insufficient_body_are_refetched(
     monkeypatch, module_name, class_name, site, category, no
 ):
     from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
 
     module = importlib.import_module(
         f"crawl_scheduler.community_website.{module_name}"
@@ -617,23 +841,22 @@ def test_existing_posts_with_insufficient_body_are_refetched(
 
     class FakeDB:
         def __init__(self):
-            self.metric_refreshes = []
+            self.ingest_calls = []
             self.content_refreshes = []
 
-        def find(self, collection, query):
-            return [{"id": "existing", "contents": []}]
-
-        def refresh_native_metrics(self, *args):
-            self.metric_refreshes.append(args)
-
-        def needs_content_refresh(self, *args):
-            return True
+        def ingest_feed(self, site, entries):
+            self.ingest_calls.append((site, list(entries)))
+            return FeedIngestResult(
+                existing_entries=list(entries),
+                new_entries=[],
+                content_refresh_entries=list(entries),
+            )
 
         def refresh_crawled_content(self, *args, **kwargs):
             self.content_refreshes.append((args, kwargs))
             return {"analysis_status": "pending"}
 
-        def insert_one(self, *args, **kwargs):
+        def insert_many(self, *args, **kwargs):
             pytest.fail("content recovery must update the existing post")
 
     fake_db = FakeDB()
@@ -684,9 +907,8 @@ def test_existing_posts_with_insufficient_body_are_refetched(
     )
     assert len(body_calls) == 1
     assert body_calls[0][1]["save_videos"] is False
-    assert fake_db.metric_refreshes == [
-        ("Realtime", query, entry.metrics_dict())
-    ]
+    assert body_calls[0][1]["use_page_cache"] is True
+    assert fake_db.ingest_calls == [(site, [entry])]
     assert fake_db.content_refreshes == [
         (
             ("Realtime", query, recovered_contents),
@@ -708,6 +930,7 @@ def test_new_posts_include_native_metrics_in_insert_payload(
     monkeypatch, module_name, class_name, site, category, no
 ):
     from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
 
     module = importlib.import_module(
         f"crawl_scheduler.community_website.{module_name}"
@@ -720,11 +943,21 @@ def test_new_posts_include_native_metrics_in_insert_payload(
         def find(self, *args, **kwargs):
             return []
 
+        def ingest_feed(self, site, entries):
+            return FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(entries),
+                content_refresh_entries=[],
+            )
+
         def insert_one(self, collection, document):
-            if collection == "Realtime":
-                self.realtime_documents.append(document)
             return SimpleNamespace(inserted_id="gpt-result")
 
+        def insert_many(self, collection, documents):
+            if collection == "Realtime":
+                self.realtime_documents.extend(documents)
+            return SimpleNamespace(inserted_ids=["id"] * len(documents))
+
     fake_db = FakeDB()
     monkeypatch.setattr(module, "PostgresController", lambda: fake_db)
     crawler = getattr(module, class_name)()
@@ -753,3 +986,172 @@ def test_new_posts_include_native_metrics_in_insert_payload(
     assert len(fake_db.realtime_documents) == 1
     document = fake_db.realtime_documents[0]
     assert {key: document[key] for key in metrics} == metrics
+
+
+@pytest.mark.parametrize(
+    ("module_name", "class_name", "site"),
+    [
+        ("ygosu", "Ygosu", "ygosu"),
+        ("ppomppu", "Ppomppu", "ppomppu"),
+        ("dcinside", "Dcinside", "dcinside"),
+    ],
+)
+def test_site_crawlers_save_new_posts_in_batches_past_failing_posts(
+    monkeypatch, module_name, class_name, site
+):
+    from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
+
+    module = importlib.import_module(
+        f"crawl_scheduler.community_website.{module_name}"
+    )
+
+    class FakeDB:
+        def __init__(self):
+            self.batch_sizes = []
+            self.saved_nos = []
+            self.content_refreshes = []
+
+        def find(self, *args, **kwargs):
+            return []
+
+        def ingest_feed(self, site, entries):
+            return FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(entries),
+                content_refresh_entries=list(entries[:2]),
+            )
+
+        def insert_one(self, collection, document):
+            if collection != "Realtime":
+                return SimpleNamespace(inserted_id="gpt-result")
+            if document["no"] == 2:
+                raise ValueError("invalid document")
+            self.saved_nos.append(document["no"])
+
+        def insert_many(self, collection, documents):
+            self.batch_sizes.append(len(documents))
+            if any(document["no"] == 2 for document in documents):
+                raise ValueError("invalid document")
+            self.saved_nos.extend(document["no"] for document in documents)
+
+        def refresh_crawled_content(self, collection, query, contents, **kwargs):
+            self.content_refreshes.append(query["no"])
+
+    fake_db = FakeDB()
+    monkeypatch.setattr(module, "PostgresController", lambda: fake_db)
+    crawler = getattr(module, class_name)()
+    crawler.new_post_insert_batch_size = 2
+    entries = [
+        BoardListEntry(
+            url=f"https://example.com/{no}",
+            category="best",
+            no=no,
+            title=f"post {no}",
+            created_at=datetime.now(ZoneInfo("Asia/Seoul")),
+            native_comment_count=0,
+            native_like_count=0,
+            native_view_count=0,
+            source_rank=no,
+        )
+        for no in range(1, 7)
+    ]
+
+    def get_board_contents(**kwargs):
+        if kwargs["no"] in {1, 4}:
+            raise RuntimeError("body fetch failed")
+        return []
+
+    monkeypatch.setattr(crawler, "get_board_entries", lambda: entries)
+    monkeypatch.setattr(crawler, "get_board_contents", get_board_contents)
+
+    assert crawler.get_realtime_best() is True
+    assert fake_db.batch_sizes == [2, 2]
+    assert fake_db.saved_nos == [3, 5, 6]
+    assert fake_db.content_refreshes == [2]
+
+
+@pytest.mark.parametrize(
+    ("module_name", "class_name"),
+    [("ygosu", "Ygosu"), ("ppomppu", "Ppomppu"), ("dcinside", "Dcinside")],
+)
+def test_site_crawlers_stop_when_feed_ingest_fails(monkeypatch, module_name, class_name):
+    module = importlib.import_module(
+        f"crawl_scheduler.community_website.{module_name}"
+    )
+
+    class FakeDB:
+        def ingest_feed(self, site, entries):
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(module, "PostgresController", FakeDB)
+    crawler = getattr(module, class_name)()
+    monkeypatch.setattr(crawler, "get_board_entries", lambda: [])
+
+    assert crawler.get_realtime_best() is False
+
+
+def test_adaptive_intervals_follow_churn_within_bounds():
+    from datetime import timedelta
+
+    import schedule
+
+    from crawl_scheduler.adaptive_intervals import AdaptiveCrawlIntervals
+
+    adaptive = AdaptiveCrawlIntervals(
+        {"busy": 8, "quiet": 10},
+        min_factor=0.5,
+        max_factor=2,
+    )
+
+    assert [adaptive.observe("busy", 0.6) for _ in range(4)] == [6, 4, 4, 4]
+    assert adaptive.observe("busy", 0.1) == 4
+    assert [adaptive.observe("quiet", 0.0) for _ in range(3)] == [15, 20, 20]
+
+    scheduler = schedule.Scheduler()
+    busy_job = scheduler.every(8).minutes.do(lambda: None).tag("crawler:busy")
+    quiet_job = scheduler.every(10).minutes.do(lambda: None).tag("crawler:quiet")
+    busy_job.run()
+    adaptive.apply(scheduler)
+
+    assert busy_job.interval == 4
+    assert busy_job.next_run == busy_job.last_run + timedelta(minutes=4)
+    assert quiet_job.interval == 20
+
+    adaptive.apply(scheduler)
+    assert busy_job.next_run == busy_job.last_run + timedelta(minutes=4)
+
+
+def test_crawl_churn_is_reported_per_site():
+    from crawl_scheduler import main
+
+    observed = []
+
+    class ChurningCrawler:
+        def get_realtime_best(self):
+            self.feed_churn = 0.4
+            return True
+
+    class SilentCrawler:
+        def get_realtime_best(self):
+            return False
+
+    main.get_realtime_best(
+        (ChurningCrawler, SilentCrawler),
+        on_churn=lambda site, churn: observed.append((site, churn)),
+    )
+
+    assert observed == [("ChurningCrawler", 0.4)]
+
+
+def test_adaptive_interval_factors_are_validated(monkeypatch):
+    from crawl_scheduler import main
+
+    assert main.parse_args([]).adaptive is None
+    monkeypatch.setenv("CRAWLER_ADAPTIVE_MAX_FACTOR", "3")
+    args = main.parse_args(["--adaptive-intervals"])
+    assert args.adaptive.bounds["fmkorea"] == (15, 90)
+
+    monkeypatch.setenv("CRAWLER_ADAPTIVE_MIN_FACTOR", "2")
+    with pytest.raises(SystemExit):
+        main.parse_args(["--adaptive-intervals"])
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+@pytest.fixture
+def pool_module(monkeypatch):
+    from crawl_scheduler.db import postgres
+
+    monkeypatch.setattr(postgres, "_POOL_SETTINGS", None)
+    yield postgres
+    postgres.configure_pool(postgres.PoolSettings.from_environment())
+    postgres._POOL_SETTINGS = None
+
+
+def test_pool_settings_read_environment_and_prefer_overrides(monkeypatch, pool_module):
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "12")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "many")
+    monkeypatch.setenv("DATABASE_STATEMENT_TIMEOUT_MS", "5000")
+    monkeypatch.setenv("DATABASE_PRE_PING_INTERVAL_SECONDS", "2.5")
+
+    settings = pool_module.PoolSettings.from_environment(
+        statement_timeout_ms=None,
+        recycle_seconds=600,
+    )
+
+    assert settings == pool_module.PoolSettings(
+        pool_size=12,
+        max_overflow=pool_module.DEFAULT_DB_MAX_OVERFLOW,
+        recycle_seconds=600,
+        statement_timeout_ms=5000,
+        pre_ping_interval_seconds=2.5,
+    )
+
+
+def test_pool_stats_report_checkouts_and_skip_recent_pre_pings(
+    monkeypatch,
+    tmp_path,
+    pool_module,
+):
+    from sqlalchemy import text
+
+    clock = [1000.0]
+    monkeypatch.setattr(pool_module.time, "monotonic", lambda: clock[0])
+
+    pool_module.configure_pool(
+        pool_module.PoolSettings(
+            pool_size=2,
+            max_overflow=1,
+            pre_ping_interval_seconds=60,
+        )
+    )
+    database_url = f"sqlite:///{tmp_path / 'crawler.db'}"
+    engine = pool_module.get_engine(database_url)
+
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    clock[0] += 61
+    first = engine.connect()
+    second = engine.connect()
+    third = engine.connect()
+    busy = pool_module.pool_stats(database_url)
+    for connection in (first, second, third):
+        connection.close()
+    stats = pool_module.pool_stats(database_url)
+
+    assert busy["size"] == 2
+    assert busy["checked_out"] == 3
+    assert busy["overflow"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 6
+    assert sum(stats["wait_histogram"].values()) == 6
+    assert stats["pre_pings"] == 1
+    assert stats["pre_pings_skipped"] == 5
@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+@pytest.fixture
+def fresh_client():
+    from crawl_scheduler.utils import http_client
+
+    http_client.reset_http_client()
+    yield http_client
+    http_client.reset_http_client()
+
+
+def test_shared_client_reuses_one_pooled_session(monkeypatch, fresh_client):
+    monkeypatch.setenv("CRAWLER_HTTP_POOL_CONNECTIONS", "3")
+    monkeypatch.setenv("CRAWLER_HTTP_POOL_MAXSIZE", "7")
+    monkeypatch.setenv("CRAWLER_HTTP_TIMEOUT_SECONDS", "4.5")
+
+    client = fresh_client.get_http_client()
+    adapter = client.session.get_adapter("https://example.com/")
+
+    assert fresh_client.get_http_client() is client
+    assert adapter is client.session.get_adapter("http://example.com/")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert client.timeout_seconds == 4.5
+
+
+def test_crawler_proxy_and_default_timeout_are_applied(monkeypatch, fresh_client):
+    monkeypatch.setenv("CRAWLER_HTTP_PROXY", "http://100.64.0.1:3128")
+    client = fresh_client.get_http_client()
+    calls = []
+    monkeypatch.setattr(
+        client.session,
+        "request",
+        lambda method, url, **kwargs: calls.append((method, url, kwargs)),
+    )
+
+    fresh_client.get("https://example.com/feed", headers={"Referer": "x"})
+    fresh_client.post("http://llm.local/api/chat", json={}, use_proxy=False, timeout=60)
+
+    assert calls[0][2]["proxies"] == {
+        "http": "http://100.64.0.1:3128",
+        "https": "http://100.64.0.1:3128",
+    }
+    assert calls[0][2]["timeout"] == fresh_client.DEFAULT_TIMEOUT_SECONDS
+    assert calls[0][2]["headers"] == {"Referer": "x"}
+    assert calls[1][0] == "POST"
+    assert calls[1][2]["proxies"] is None
+    assert calls[1][2]["timeout"] == 60
+
+
+def test_invalid_pool_settings_fall_back_to_defaults(monkeypatch, fresh_client):
+    monkeypatch.setenv("CRAWLER_HTTP_POOL_MAXSIZE", "many")
+    monkeypatch.setenv("CRAWLER_HTTP_TIMEOUT_SECONDS", "-1")
+
+    client = fresh_client.get_http_client()
+
+    assert client.session.get_adapter("https://example.com/")._pool_maxsize == (
+        fresh_client.DEFAULT_POOL_MAXSIZE
+    )
+    assert client.timeout_seconds == fresh_client.DEFAULT_TIMEOUT_SECONDS
+
+
+def test_page_cache_reuses_parse_for_not_modified_and_identical_pages(fresh_client):
+    from types import SimpleNamespace
+
+    cache = fresh_client.PageCache()
+    url = "https://example.com/feed"
+    parses = []
+
+    def response(status_code=200, content=b"<html>a</html>", headers=None):
+        return SimpleNamespace(
+            status_code=status_code,
+            headers=headers or {},
+            content=content,
+            raise_for_status=lambda: None,
+        )
+
+    def parse(page):
+        parses.append(page.content)
+        return [page.content.decode()]
+
+    assert cache.conditional_headers(url) == {}
+    first = cache.parse(
+        "site",
+        url,
+        response(headers={"ETag": '"v1"', "Last-Modified": "Sat, 18 Jul 2026 00:00:00 GMT"}),
+        parse,
+    )
+    assert cache.conditional_headers(url) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 18 Jul 2026 00:00:00 GMT",
+    }
+    assert cache.parse("site", url, response(status_code=304, content=b""), parse) is first
+    assert cache.parse("site", url, response(), parse) is first
+    changed = cache.parse("site", url, response(content=b"<html>b</html>"), parse)
+
+    assert changed == ["<html>b</html>"]
+    assert parses == [b"<html>a</html>", b"<html>b</html>"]
+    assert cache.stats() == {"site": {"parsed": 2, "not_modified": 1, "unchanged": 1}}
+
+
+def test_page_cache_evicts_the_least_recently_used_page(fresh_client):
+    from types import SimpleNamespace
+
+    cache = fresh_client.PageCache(max_pages=2)
+
+    def response(content):
+        return SimpleNamespace(
+            status_code=200,
+            headers={"ETag": f'"{content}"'},
+            content=content.encode(),
+            raise_for_status=lambda: None,
+        )
+
+    def parse(page):
+        return page.content.decode()
+
+    cache.parse("site", "https://example.com/feed", response("feed"), parse)
+    cache.parse("site", "https://example.com/1", response("one"), parse)
+    cache.parse("site", "https://example.com/feed", response("feed"), parse)
+    cache.parse("site", "https://example.com/2", response("two"), parse)
+
+    assert len(cache) == 2
+    assert cache.conditional_headers("https://example.com/1") == {}
+    assert cache.conditional_headers("https://example.com/feed") == {"If-None-Match": '"feed"'}
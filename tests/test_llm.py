@@ -20,16 +20,19 @@ def test_analyze_requests_json_response_format(monkeypatch):
 
     calls = []
 
-    def fake_post(url, json, timeout):
-        calls.append({"url": url, "json": json, "timeout": timeout})
+    def fake_post(url, json, timeout, use_proxy=True):
+        calls.append(
+            {"url": url, "json": json, "timeout": timeout, "use_proxy": use_proxy}
+        )
         return DummyResponse()
 
-    monkeypatch.setattr(llm_module.requests, "post", fake_post)
+    monkeypatch.setattr(llm_module.http_client, "post", fake_post)
 
     result = LLM(base_url="http://llm.local", model="gemma4:e4b").analyze("title\nbody")
 
     assert result == {"summary": "ok", "tags": ["ai"]}
     assert calls[0]["json"]["format"] == "json"
+    assert calls[0]["use_proxy"] is False
 
 
 def test_default_ollama_timeout_allows_slow_local_model(monkeypatch):
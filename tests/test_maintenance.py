@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+def test_maintenance_prunes_logs_in_bounded_chunks_and_records_stats(tmp_path):
+    from sqlalchemy import func, insert, select
+
+    from crawl_scheduler.db.migrations import migrate
+    from crawl_scheduler.db.models import CrawlerLog
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.maintenance import MaintenanceWorker
+
+    database_url = f"sqlite:///{tmp_path / 'crawler.db'}"
+    migrate(database_url)
+    now = datetime(2026, 5, 10, tzinfo=timezone.utc)
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(CrawlerLog),
+            [
+                {
+                    "id": f"old-{index}",
+                    "message": "old",
+                    "created_at": now - timedelta(days=40),
+                }
+                for index in range(5)
+            ]
+            + [{"id": "recent", "message": "recent", "created_at": now}],
+        )
+
+    worker = MaintenanceWorker(database_url, batch_size=2, max_batches=2)
+    tasks = {task.name: task for task in worker.tasks}
+
+    assert worker.run_task(tasks["prune_crawler_logs"], now).rows_affected == 4
+    assert worker.run_task(tasks["prune_crawler_logs"], now).rows_affected == 1
+    with engine.connect() as connection:
+        remaining = connection.execute(select(func.count()).select_from(CrawlerLog))
+        assert remaining.scalar() == 1
+
+    stats = worker.run_all(now)
+
+    assert [item.task for item in stats] == [
+        "daily_top10",
+        "expire_snapshots",
+        "prune_crawler_logs",
+        "analyze",
+        "pool_stats",
+        "media_derivatives",
+    ]
+    assert all(item.error is None for item in stats)
+    assert all(item.duration_seconds >= 0 for item in stats)
+    assert worker.last_stats["prune_crawler_logs"].rows_affected == 0
+    assert {next(iter(job.tags)) for job in worker.scheduler.jobs} == {
+        "maintenance:daily_top10",
+        "maintenance:expire_snapshots",
+        "maintenance:prune_crawler_logs",
+        "maintenance:analyze",
+        "maintenance:pool_stats",
+        "maintenance:media_derivatives",
+    }
+
+
+def test_maintenance_task_errors_are_reported_not_raised():
+    from crawl_scheduler.maintenance import MaintenanceTask, MaintenanceWorker
+
+    def fail(now):
+        raise RuntimeError("lock timeout")
+
+    worker = MaintenanceWorker("sqlite://")
+    stats = worker.run_task(MaintenanceTask("broken", 60, fail))
+
+    assert stats.rows_affected == 0
+    assert stats.error == "lock timeout"
+    assert worker.last_stats["broken"] == stats
+
+
+def test_media_derivatives_run_in_spawned_worker_processes(monkeypatch):
+    from crawl_scheduler import maintenance
+
+    executors = []
+    monkeypatch.setattr(maintenance, "pillow_available", lambda: True)
+    monkeypatch.setattr(
+        maintenance,
+        "derive_board_media",
+        lambda database_url, *, limit, executor: executors.append(executor) or 0,
+    )
+
+    worker = maintenance.MaintenanceWorker("sqlite://", derivative_workers=1)
+    try:
+        worker.derive_media(datetime.now(timezone.utc))
+        worker.derive_media(datetime.now(timezone.utc))
+    finally:
+        worker.stop()
+
+    assert executors[0] is executors[1]
+    assert executors[0]._mp_context.get_start_method() == "spawn"
@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+def _document(*image_names):
+    return {
+        "site": "dcinside",
+        "category": "dcbest",
+        "no": 971,
+        "title": "screenshot post",
+        "url": "https://example.com/post/971",
+        "contents": [
+            {"type": "text", "text": "본문 " * 20},
+            *(
+                {
+                    "type": "image",
+                    "media_path": f"Dcinside/dcbest/971/{name}",
+                    "source_url": f"https://example.com/{name}",
+                }
+                for name in image_names
+            ),
+        ],
+    }
+
+
+def test_board_images_get_derivatives_that_survive_recrawls(monkeypatch, tmp_path):
+    from crawl_scheduler.db.models import Board
+    from crawl_scheduler.db.postgres import get_session_factory
+    from crawl_scheduler.db.postgres_controller import PostgresController
+    from crawl_scheduler.media_derivatives import derive_board_media
+
+    media_root = tmp_path / "media"
+    post_directory = media_root / "Dcinside/dcbest/971"
+    post_directory.mkdir(parents=True)
+    for name in ("shot.png", "more.jpg"):
+        (post_directory / name).write_bytes(name.encode())
+    monkeypatch.setenv("ROOT", str(media_root))
+
+    rendered = []
+
+    def render(root, media_path):
+        rendered.append(media_path)
+        name = Path(media_path).name
+        return {
+            "thumbnail_path": f".derived/{name}.thumb.webp",
+            "webp_path": f".derived/{name}.webp",
+        }
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    controller.insert_one("Realtime", _document("shot.png"))
+    query = {"site": "dcinside", "category": "dcbest", "no": 971}
+
+    assert derive_board_media(controller.database_url, render=render) == 1
+    assert derive_board_media(controller.database_url, render=render) == 0
+    board = controller.find("Realtime", query)[0]
+    assert board["thumbnail"] == ".derived/shot.png.thumb.webp"
+    assert board["contents"][1]["webp_path"] == ".derived/shot.png.webp"
+
+    controller.insert_one("Realtime", _document("shot.png"))
+
+    assert derive_board_media(controller.database_url, render=render) == 0
+    board = controller.find("Realtime", query)[0]
+    assert board["thumbnail"] == ".derived/shot.png.thumb.webp"
+    assert board["contents"][1]["thumbnail_path"] == ".derived/shot.png.thumb.webp"
+
+    controller.insert_one("Realtime", _document("shot.png", "more.jpg"))
+
+    assert derive_board_media(controller.database_url, render=render) == 1
+    assert rendered == [
+        "Dcinside/dcbest/971/shot.png",
+        "Dcinside/dcbest/971/shot.png",
+        "Dcinside/dcbest/971/more.jpg",
+    ]
+    with get_session_factory(controller.database_url)() as session:
+        board = session.query(Board).one()
+        assert board.media_derived_at is not None
+        assert board.contents[2]["thumbnail_path"] == ".derived/more.jpg.thumb.webp"
+
+
+def test_render_derivatives_writes_webp_once_per_image_content(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+
+    from crawl_scheduler.media_derivatives import THUMBNAIL_SIZE, render_derivatives
+
+    for post in ("1", "2"):
+        (tmp_path / post).mkdir()
+        Image.new("RGB", (1600, 900), "navy").save(tmp_path / post / "shot.png")
+
+    first = render_derivatives(str(tmp_path), "1/shot.png")
+    repost = render_derivatives(str(tmp_path), "2/shot.png")
+
+    assert repost == first
+    with Image.open(tmp_path / first["thumbnail_path"]) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert max(thumbnail.size) <= max(THUMBNAIL_SIZE)
+    with Image.open(tmp_path / first["webp_path"]) as full_size:
+        assert full_size.size == (1600, 900)
@@ -70,3 +70,111 @@ def test_migration_loads_legacy_iso_dates(tmp_path):
     assert loaded["359240"].astimezone(timezone.utc) == datetime(
         2025, 8, 28, 16, 30, tzinfo=timezone.utc
     )
+
+
+def test_media_store_links_identical_downloads_to_one_blob(tmp_path):
+    from crawl_scheduler.media_store import (
+        blob_path,
+        media_digest,
+        media_references,
+        store_media,
+    )
+
+    meme = b"same meme bytes"
+    first = store_media(tmp_path, tmp_path / "Dcinside/dcbest/1", "meme.jpg", meme)
+    repost = store_media(tmp_path, tmp_path / "Ygosu/yeobgi/2", "funny.jpg", meme)
+    recrawl = store_media(tmp_path, tmp_path / "Dcinside/dcbest/1", "meme.jpg", meme)
+    other = store_media(tmp_path, tmp_path / "Dcinside/dcbest/1", "meme.jpg", b"other")
+
+    digest = media_digest(tmp_path, "Dcinside/dcbest/1/meme.jpg")
+    blob = blob_path(tmp_path, digest)
+    assert recrawl == first
+    assert other == tmp_path / "Dcinside/dcbest/1/meme_1.jpg"
+    assert first.samefile(blob) and repost.samefile(blob)
+    assert blob.stat().st_nlink == 3
+    assert repost.read_bytes() == meme
+    assert other.read_bytes() == b"other"
+    assert media_references(tmp_path, digest) == [
+        "Dcinside/dcbest/1/meme.jpg",
+        "Ygosu/yeobgi/2/funny.jpg",
+    ]
+
+
+def test_concurrent_identical_downloads_keep_every_post_on_one_blob(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    from crawl_scheduler.media_store import blob_path, media_digest, store_media_stream
+
+    started = threading.Barrier(8, timeout=5)
+
+    def download(no):
+        def chunks():
+            started.wait()
+            yield b"viral clip bytes"
+
+        return store_media_stream(tmp_path, tmp_path / f"post/{no}", "clip.mp4", chunks())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        paths = list(executor.map(download, range(8)))
+
+    blob = blob_path(tmp_path, media_digest(tmp_path, paths[0].relative_to(tmp_path)))
+    assert all(path.samefile(blob) for path in paths)
+    assert blob.stat().st_nlink == 9
+    assert list((tmp_path / ".blobs").glob("*.tmp")) == []
+
+
+def test_media_store_without_hardlinks_keeps_a_single_copy(monkeypatch, tmp_path):
+    from crawl_scheduler import media_store
+
+    def no_hardlinks(source, target):
+        raise PermissionError("hardlinks are not supported")
+
+    monkeypatch.setattr(media_store.os, "link", no_hardlinks)
+
+    first = media_store.store_media(tmp_path, tmp_path / "post/1", "meme.jpg", b"meme")
+    recrawl = media_store.store_media(tmp_path, tmp_path / "post/1", "meme.jpg", b"meme")
+
+    assert recrawl == first
+    assert first.read_bytes() == b"meme"
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == [first]
+
+
+def test_media_stream_stops_at_file_and_article_caps(tmp_path):
+    from hashlib import sha256
+
+    import pytest
+
+    from crawl_scheduler.media_store import (
+        BLOB_DIRECTORY,
+        MediaByteBudget,
+        MediaTooLargeError,
+        media_references,
+        store_media_stream,
+    )
+
+    read_chunks = []
+
+    def chunks():
+        for chunk in (b"aaaa", b"bbbb", b"cccc"):
+            read_chunks.append(chunk)
+            yield chunk
+
+    with pytest.raises(MediaTooLargeError):
+        store_media_stream(tmp_path, tmp_path / "post", "clip.mp4", chunks(), max_bytes=6)
+    assert read_chunks == [b"aaaa", b"bbbb"]
+
+    budget = MediaByteBudget(10)
+    first = store_media_stream(
+        tmp_path, tmp_path / "post", "a.jpg", [b"12", b"345"], budget=budget
+    )
+    with pytest.raises(MediaTooLargeError):
+        store_media_stream(
+            tmp_path, tmp_path / "post", "b.jpg", [b"abc", b"def"], budget=budget
+        )
+
+    assert budget.remaining() == 5
+    assert first.read_bytes() == b"12345"
+    assert media_references(tmp_path, sha256(b"12345").hexdigest()) == ["post/a.jpg"]
+    assert sorted(path.name for path in (tmp_path / "post").iterdir()) == ["a.jpg"]
+    assert not list((tmp_path / BLOB_DIRECTORY).glob("*.tmp"))
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+import sys
+from pathlib import Path
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+class FakeMetricsCrawler:
+    polls = []
+    failing_urls = set()
+
+    def fetch_post_metrics(self, post):
+        self.polls.append(post["source_id"])
+        if post["url"] in self.failing_urls:
+            raise RuntimeError("post deleted")
+        return {
+            "native_comment_count": 30,
+            "native_like_count": 12,
+            "native_view_count": 900,
+        }
+
+
+def insert_post(controller, no, created_at, captured_at, source_rank=None):
+    controller.insert_one(
+        "Realtime",
+        {
+            "site": "dcinside",
+            "category": "dcbest",
+            "no": no,
+            "title": f"post {no}",
+            "url": f"https://example.com/post/{no}",
+            "create_time": created_at,
+            "contents": [{"type": "text", "content": "body"}],
+            "native_comment_count": 3,
+            "native_like_count": 1,
+            "native_view_count": 100,
+            "source_rank": source_rank,
+            "metrics_crawled_at": captured_at,
+        },
+    )
+
+
+def test_due_posts_are_repolled_in_order_and_rescheduled(tmp_path):
+    from crawl_scheduler.db.models import BoardMetricSnapshot
+    from crawl_scheduler.db.postgres import get_session_factory
+    from crawl_scheduler.db.postgres_controller import PostgresController
+    from crawl_scheduler.metric_repoll import MetricRepollQueue
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    captured_at = datetime(2026, 6, 23, 10, tzinfo=timezone.utc)
+    insert_post(controller, 1, captured_at - timedelta(hours=1), captured_at, source_rank=1)
+    insert_post(controller, 2, captured_at - timedelta(hours=30), captured_at)
+    insert_post(controller, 3, captured_at - timedelta(hours=2), captured_at)
+    FakeMetricsCrawler.polls = []
+    FakeMetricsCrawler.failing_urls = {"https://example.com/post/3"}
+
+    due = {
+        post["source_id"]: post["next_metrics_crawl_at"]
+        for post in controller.due_metric_polls(
+            {"dcinside"},
+            until=captured_at + timedelta(days=1),
+            limit=10,
+        )
+    }
+    assert list(due) == [
+        "dcinside:dcbest:1",
+        "dcinside:dcbest:3",
+        "dcinside:dcbest:2",
+    ]
+    assert controller.due_metric_polls({"ygosu"}, captured_at + timedelta(days=1), 10) == []
+
+    queue = MetricRepollQueue({"dcinside": FakeMetricsCrawler}, controller)
+    now = due["dcinside:dcbest:3"]
+
+    assert queue.run_due(now=now) == 2
+    assert FakeMetricsCrawler.polls == ["dcinside:dcbest:1", "dcinside:dcbest:3"]
+
+    refreshed = controller.find("Realtime", {"source_id": "dcinside:dcbest:1"})[0]
+    failed = controller.find("Realtime", {"source_id": "dcinside:dcbest:3"})[0]
+    rescheduled = {
+        post["source_id"]: post["next_metrics_crawl_at"]
+        for post in controller.due_metric_polls(
+            {"dcinside"},
+            until=now + timedelta(days=1),
+            limit=10,
+        )
+    }
+    with get_session_factory(controller.database_url)() as session:
+        snapshot_count = session.query(BoardMetricSnapshot).count()
+
+    assert refreshed["native_comment_count"] == 30
+    assert refreshed["native_like_count"] == 12
+    assert refreshed["source_rank"] is None
+    assert refreshed["score_breakdown"]["source_rank"] is None
+    assert refreshed["score_breakdown"]["hot_source_rank_addend"] == 0
+    assert failed["native_comment_count"] == 3
+    assert snapshot_count == 4
+    assert rescheduled["dcinside:dcbest:1"] > now
+    assert rescheduled["dcinside:dcbest:3"] > now
+    assert rescheduled["dcinside:dcbest:2"] == due["dcinside:dcbest:2"]
+
+    assert queue.run_due(now=now) == 0
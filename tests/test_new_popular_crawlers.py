@@ -5,7 +5,6 @@ from types import SimpleNamespace
 from zoneinfo import ZoneInfo
 
 import pytest
-from bs4 import BeautifulSoup
 
 
 SERVICE_ROOT = Path(__file__).resolve().parents[1]
@@ -53,8 +52,13 @@ def test_popular_feeds_parse_identity_and_metrics(
     crawler = getattr(module, class_name)()
     monkeypatch.setattr(
         crawler,
-        "soup_from_url",
-        lambda url: BeautifulSoup(html, "html.parser"),
+        "get_response",
+        lambda url, headers=None: SimpleNamespace(
+            status_code=200,
+            headers={},
+            content=html.encode(),
+            raise_for_status=lambda: None,
+        ),
     )
 
     entries = crawler.get_board_entries()
@@ -86,6 +90,7 @@ def test_new_popular_posts_enter_common_ai_queue(
 ):
     from crawl_scheduler.community_website.board_list_entry import BoardListEntry
     from crawl_scheduler.constants import DEFAULT_GPT_ANSWER
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
 
     module = __import__(
         f"crawl_scheduler.community_website.{module_name}", fromlist=[class_name]
@@ -95,13 +100,17 @@ def test_new_popular_posts_enter_common_ai_queue(
         def __init__(self):
             self.documents = []
 
-        def find(self, *args):
-            return []
+        def ingest_feed(self, site, entries):
+            return FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(entries),
+                content_refresh_entries=[],
+            )
 
-        def insert_one(self, collection, document):
+        def insert_many(self, collection, documents):
             if collection == "Realtime":
-                self.documents.append(document)
-            return SimpleNamespace(inserted_id="id")
+                self.documents.extend(documents)
+            return SimpleNamespace(inserted_ids=["id"] * len(documents))
 
     fake_db = FakeDB()
     monkeypatch.setattr(module, "PostgresController", lambda: fake_db)
@@ -152,7 +161,7 @@ def test_throttled_body_request_stops_without_immediate_retry(monkeypatch):
 
     calls = []
     monkeypatch.setattr(
-        popular_community.requests,
+        popular_community.http_client,
         "get",
         lambda *args, **kwargs: calls.append((args, kwargs)) or FakeResponse(),
     )
@@ -182,7 +191,7 @@ def test_throttled_site_does_not_request_again_during_retry_after(monkeypatch):
 
     calls = []
     monkeypatch.setattr(
-        popular_community.requests,
+        popular_community.http_client,
         "get",
         lambda *args, **kwargs: calls.append((args, kwargs)) or FakeResponse(),
     )
@@ -208,16 +217,21 @@ def test_throttled_new_post_is_not_inserted_and_stops_site_cycle(monkeypatch):
     from crawl_scheduler.community_website.popular_community import (
         CrawlerThrottledError,
     )
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
 
     class FakeDB:
         def __init__(self):
             self.documents = []
 
-        def find(self, *args):
-            return []
+        def ingest_feed(self, site, entries):
+            return FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(entries),
+                content_refresh_entries=[],
+            )
 
-        def insert_one(self, collection, document):
-            self.documents.append(document)
+        def insert_many(self, collection, documents):
+            self.documents.extend(documents)
 
     crawler = Fmkorea.__new__(Fmkorea)
     crawler.db_controller = FakeDB()
@@ -248,3 +262,57 @@ def test_throttled_new_post_is_not_inserted_and_stops_site_cycle(monkeypatch):
     assert crawler.get_realtime_best() is False
     assert body_calls == [1]
     assert crawler.db_controller.documents == []
+
+
+def test_new_posts_are_saved_in_batches_and_a_bad_post_only_loses_itself(monkeypatch):
+    from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.community_website.fmkorea import Fmkorea
+    from crawl_scheduler.db.postgres_controller import FeedIngestResult
+
+    class FakeDB:
+        def __init__(self):
+            self.batch_sizes = []
+            self.saved_nos = []
+
+        def ingest_feed(self, site, entries):
+            return FeedIngestResult(
+                existing_entries=[],
+                new_entries=list(entries),
+                content_refresh_entries=[],
+            )
+
+        def insert_many(self, collection, documents):
+            self.batch_sizes.append(len(documents))
+            if any(document["no"] == 2 for document in documents):
+                raise ValueError("invalid document")
+            self.saved_nos.extend(document["no"] for document in documents)
+
+        def insert_one(self, collection, document):
+            if document["no"] == 2:
+                raise ValueError("invalid document")
+            self.saved_nos.append(document["no"])
+
+    crawler = Fmkorea.__new__(Fmkorea)
+    crawler.new_post_insert_batch_size = 3
+    crawler.db_controller = FakeDB()
+    crawler.request_delay_seconds = 0
+    entries = [
+        BoardListEntry(
+            url=f"https://example.com/{no}",
+            category="best",
+            no=no,
+            title=f"post {no}",
+            created_at=datetime.now(ZoneInfo("Asia/Seoul")),
+            native_comment_count=0,
+            native_like_count=0,
+            native_view_count=0,
+            source_rank=no,
+        )
+        for no in range(1, 6)
+    ]
+    monkeypatch.setattr(crawler, "get_board_entries", lambda: entries)
+    monkeypatch.setattr(crawler, "get_board_contents", lambda **kwargs: [])
+
+    assert crawler.get_realtime_best() is True
+    assert crawler.db_controller.batch_sizes == [3, 2]
+    assert crawler.db_controller.saved_nos == [1, 3, 4, 5]
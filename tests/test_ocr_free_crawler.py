@@ -90,12 +90,13 @@ def test_save_file_sanitizes_query_only_media_urls(monkeypatch, tmp_path):
 
     monkeypatch.setenv("ROOT", str(tmp_path))
     monkeypatch.setattr(
-        community_website.requests,
+        community_website.http_client,
         "get",
         lambda *args, **kwargs: SimpleNamespace(
             status_code=200,
             headers={"Content-Type": "image/webp"},
-            content=b"image-bytes",
+            iter_content=lambda chunk_size: iter([b"image-", b"bytes"]),
+            close=lambda: None,
         ),
     )
 
@@ -136,12 +137,13 @@ def test_save_file_does_not_write_failed_response(monkeypatch, tmp_path):
 
     monkeypatch.setenv("ROOT", str(tmp_path))
     monkeypatch.setattr(
-        community_website.requests,
+        community_website.http_client,
         "get",
         lambda *args, **kwargs: SimpleNamespace(
             status_code=404,
             headers={"Content-Type": "text/html"},
-            content=b"not-found",
+            iter_content=lambda chunk_size: iter([b"not-found"]),
+            close=lambda: None,
         ),
     )
 
@@ -155,6 +157,165 @@ def test_save_file_does_not_write_failed_response(monkeypatch, tmp_path):
     assert list(tmp_path.rglob("*.*")) == []
 
 
+def test_save_file_refuses_declared_oversized_media_without_reading(
+    monkeypatch,
+    tmp_path,
+):
+    import crawl_scheduler.community_website.community_website as community_website
+
+    class ConcreteCrawler(community_website.AbstractCommunityWebsite):
+        def get_daily_best(self):
+            pass
+
+        def get_realtime_best(self):
+            pass
+
+        def get_board_contents(self, board_id):
+            pass
+
+        def is_ad(self, title) -> bool:
+            return False
+
+        def get_gpt_obj(self, url):
+            pass
+
+        def get_board_list(self):
+            pass
+
+    def unread_body(chunk_size):
+        raise AssertionError("oversized body must not be read")
+
+    closed = []
+    monkeypatch.setenv("ROOT", str(tmp_path))
+    monkeypatch.setenv("CRAWLER_MEDIA_MAX_FILE_BYTES", "1024")
+    monkeypatch.setattr(
+        community_website.http_client,
+        "get",
+        lambda *args, **kwargs: SimpleNamespace(
+            status_code=200,
+            headers={"Content-Type": "video/mp4", "Content-Length": "4096"},
+            iter_content=unread_body,
+            close=lambda: closed.append(True),
+        ),
+    )
+
+    crawler = ConcreteCrawler("20260428")
+
+    assert not crawler.save_file(
+        "https://example.com/huge.mp4",
+        category="humor",
+        no=1,
+    )
+    assert closed == [True]
+    assert list(tmp_path.rglob("*.mp4")) == []
+
+
+def test_video_probe_falls_back_to_a_one_byte_range_request(monkeypatch):
+    from crawl_scheduler import media_probe
+
+    requests = []
+
+    def fake_request(method, status_code, headers):
+        def send(url, **kwargs):
+            requests.append((method, kwargs["headers"].get("Range")))
+            return SimpleNamespace(
+                status_code=status_code,
+                headers=headers,
+                close=lambda: None,
+            )
+
+        return send
+
+    monkeypatch.delenv("CRAWLER_MEDIA_MAX_FILE_BYTES", raising=False)
+    monkeypatch.delenv("CRAWLER_VIDEO_INLINE_MAX_BYTES", raising=False)
+    monkeypatch.setattr(
+        media_probe.http_client,
+        "head",
+        fake_request("HEAD", 405, {}),
+    )
+    monkeypatch.setattr(
+        media_probe.http_client,
+        "get",
+        fake_request(
+            "GET",
+            206,
+            {"Content-Type": "video/mp4", "Content-Range": "bytes 0-0/209715200"},
+        ),
+    )
+
+    probe = media_probe.probe_media_url(
+        "https://example.com/clip.mp4",
+        headers={"User-Agent": "Mozilla/5.0"},
+    )
+
+    assert requests == [("HEAD", None), ("GET", "bytes=0-0")]
+    assert probe == media_probe.MediaProbe("video/mp4", 200 * 1024 * 1024)
+    assert media_probe.video_action(probe) == "skip"
+    large = media_probe.MediaProbe("video/mp4", 20 * 1024 * 1024)
+    assert media_probe.video_action(large) == "defer"
+    small = media_probe.MediaProbe("video/mp4", 1024)
+    assert media_probe.video_action(small) == "download"
+
+
+def test_save_file_reuses_manifest_entries_on_content_refresh(monkeypatch, tmp_path):
+    import json
+
+    import crawl_scheduler.community_website.community_website as community_website
+
+    class ConcreteCrawler(community_website.AbstractCommunityWebsite):
+        def get_daily_best(self):
+            pass
+
+        def get_realtime_best(self):
+            pass
+
+        def get_board_contents(self, board_id):
+            pass
+
+        def is_ad(self, title) -> bool:
+            return False
+
+        def get_gpt_obj(self, url):
+            pass
+
+        def get_board_list(self):
+            pass
+
+    fetched_urls = []
+
+    def fetch(url, **kwargs):
+        fetched_urls.append(url)
+        return SimpleNamespace(
+            status_code=200,
+            headers={"Content-Type": "image/png"},
+            iter_content=lambda chunk_size: iter([b"png-bytes"]),
+            close=lambda: None,
+        )
+
+    monkeypatch.setenv("ROOT", str(tmp_path))
+    monkeypatch.setattr(community_website.http_client, "get", fetch)
+    crawler = ConcreteCrawler("20260428")
+
+    first = crawler.save_file("https://example.com/a.png", category="humor", no=7)
+    refreshed = crawler.save_file("https://example.com/a.png", category="humor", no=7)
+
+    assert refreshed == first
+    assert fetched_urls == ["https://example.com/a.png"]
+    manifest = json.loads(
+        (tmp_path / "ConcreteCrawler/humor/7/.manifest.json").read_text(encoding="utf-8")
+    )
+    assert manifest["https://example.com/a.png"]["media_path"] == first
+    assert manifest["https://example.com/a.png"]["size"] == len(b"png-bytes")
+
+    (tmp_path / first).unlink()
+    restored = crawler.save_file("https://example.com/a.png", category="humor", no=7)
+
+    assert restored == first
+    assert len(fetched_urls) == 2
+    post_directory = tmp_path / "ConcreteCrawler/humor/7"
+    assert [path.name for path in post_directory.glob("*.png")] == ["a.png"]
+
+
 def test_media_url_from_tag_prefers_real_lazy_image_over_placeholder():
     import crawl_scheduler.community_website.community_website as community_website
 
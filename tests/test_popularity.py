@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+import math
 
 import pytest
 
@@ -180,3 +181,179 @@ def test_source_rank_is_a_bounded_explicit_addend():
     assert first.breakdown["hot_source_rank_addend"] == 2.0
     assert fourth.breakdown["hot_source_rank_addend"] == 1.0
     assert unranked.breakdown["hot_source_rank_addend"] == 0.0
+
+
+def test_batch_scorer_matches_scalar_scores_for_random_metrics():
+    import random
+
+    import numpy as np
+
+    from crawl_scheduler.popularity import (
+        INTEGER_BREAKDOWN_KEYS,
+        calculate_popularity_scores_batch,
+    )
+
+    rng = random.Random(20260623)
+    base = datetime(2026, 6, 23, 10, 20, tzinfo=timezone.utc)
+
+    def maybe(value):
+        return None if rng.random() < 0.2 else value
+
+    metrics = []
+    for _ in range(500):
+        captured_at = base + timedelta(seconds=rng.randint(0, 86_400))
+        created_at = captured_at - timedelta(seconds=rng.randint(-600, 3 * 86_400))
+        if rng.random() < 0.5:
+            created_at = created_at.replace(tzinfo=None)
+        metrics.append(
+            PopularityMetrics(
+                site=rng.choice(["dcinside", "theqoo", "fmkorea", "unknown"]),
+                created_at=created_at,
+                captured_at=captured_at,
+                comment_count=rng.randint(-5, 5_000),
+                like_count=rng.randint(-5, 5_000),
+                view_count=maybe(rng.randint(0, 500_000)),
+                source_rank=maybe(rng.randint(-2, 60)),
+                previous_comment_count=maybe(rng.randint(0, 5_000)),
+                previous_like_count=maybe(rng.randint(0, 5_000)),
+                previous_view_count=maybe(rng.randint(0, 500_000)),
+                previous_delta_comments=rng.randint(0, 300),
+                previous_delta_likes=rng.randint(0, 300),
+                previous_delta_views=rng.randint(0, 30_000),
+                llm_engagement_score=maybe(
+                    rng.choice([rng.uniform(-20, 120), float("nan"), 50])
+                ),
+                previous_captured_at=maybe(
+                    captured_at - timedelta(seconds=rng.randint(-120, 7_200))
+                ),
+                previous_interval_minutes=maybe(rng.uniform(-5, 240)),
+            )
+        )
+
+    batch = calculate_popularity_scores_batch(
+        **{
+            field: [getattr(metric, field) for metric in metrics]
+            for field in PopularityMetrics.__dataclass_fields__
+        },
+        include_breakdown=True,
+    )
+
+    for index, metric in enumerate(metrics):
+        expected = calculate_popularity_scores(metric)
+        assert batch.hot_score[index] == pytest.approx(expected.hot_score, rel=1e-12, abs=1e-12)
+        assert batch.daily_score[index] == pytest.approx(expected.daily_score, rel=1e-12, abs=1e-12)
+        for key, value in expected.breakdown.items():
+            column_value = batch.breakdown[key][index]
+            if value is None:
+                assert np.isnan(column_value), key
+            else:
+                assert column_value == pytest.approx(value, rel=1e-12, abs=1e-12), key
+
+    for row, metric in zip(batch.breakdown_rows(), metrics):
+        expected = calculate_popularity_scores(metric).breakdown
+        assert row == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        for key in INTEGER_BREAKDOWN_KEYS:
+            assert type(row[key]) is type(expected[key]), key
+
+
+def test_batch_scorer_accepts_datetime64_columns_and_omitted_history():
+    import numpy as np
+
+    from crawl_scheduler.popularity import calculate_popularity_scores_batch
+
+    captured_at = datetime(2026, 6, 23, 10, 20, tzinfo=timezone.utc)
+    created_at = captured_at - timedelta(hours=2)
+
+    batch = calculate_popularity_scores_batch(
+        site=["dcinside", "ygosu"],
+        created_at=np.array([created_at.replace(tzinfo=None)] * 2, dtype="datetime64[us]"),
+        captured_at=np.array([captured_at.replace(tzinfo=None)] * 2, dtype="datetime64[us]"),
+        comment_count=np.array([10, 40]),
+        like_count=np.array([5, 20]),
+    )
+    expected = [
+        calculate_popularity_scores(
+            PopularityMetrics(
+                site=site,
+                created_at=created_at,
+                captured_at=captured_at,
+                comment_count=comments,
+                like_count=likes,
+            )
+        )
+        for site, comments, likes in (("dcinside", 10, 5), ("ygosu", 40, 20))
+    ]
+
+    assert batch.breakdown is None
+    assert batch.hot_score.tolist() == pytest.approx([score.hot_score for score in expected])
+    assert batch.daily_score.tolist() == pytest.approx([score.daily_score for score in expected])
+
+
+def test_next_metrics_crawl_at_polls_hot_young_posts_more_often():
+    from crawl_scheduler.popularity import (
+        MAX_METRIC_REPOLL_MINUTES,
+        MIN_METRIC_REPOLL_MINUTES,
+        next_metrics_crawl_at,
+    )
+
+    captured_at = datetime(2026, 6, 23, 10, 20, tzinfo=timezone.utc)
+
+    def minutes_until_next(hot_score, age):
+        next_at = next_metrics_crawl_at(
+            hot_score=hot_score,
+            created_at=captured_at - age,
+            captured_at=captured_at,
+        )
+        return (next_at - captured_at).total_seconds() / 60
+
+    hot_young = minutes_until_next(6.0, timedelta(hours=1))
+    cold_young = minutes_until_next(0.0, timedelta(hours=1))
+    cold_day_old = minutes_until_next(0.0, timedelta(hours=24))
+
+    assert MIN_METRIC_REPOLL_MINUTES <= hot_young < cold_young < cold_day_old
+    assert minutes_until_next(0.0, timedelta(hours=60)) == MAX_METRIC_REPOLL_MINUTES
+    assert minutes_until_next(float("nan"), timedelta(hours=1)) == cold_young
+    assert (
+        next_metrics_crawl_at(
+            hot_score=50.0,
+            created_at=captured_at - timedelta(hours=80),
+            captured_at=captured_at,
+        )
+        is None
+    )
+
+
+def test_ranking_key_orders_like_scores_decayed_to_any_instant():
+    import random
+
+    from crawl_scheduler.popularity import (
+        HOT_DECAY_HOURS,
+        ZERO_SCORE_RANK_KEY,
+        ranking_key,
+    )
+
+    rng = random.Random(10)
+    base = datetime(2026, 7, 1, tzinfo=timezone.utc)
+    boards = [
+        (rng.uniform(0.01, 50.0), base + timedelta(minutes=rng.randrange(0, 7 * 24 * 60)))
+        for _ in range(200)
+    ]
+
+    by_key = sorted(
+        boards,
+        key=lambda board: ranking_key(board[0], board[1], HOT_DECAY_HOURS),
+        reverse=True,
+    )
+    for as_of in (base + timedelta(days=7), base + timedelta(days=30)):
+        def decayed(board):
+            elapsed_hours = (as_of - board[1]).total_seconds() / 3600
+            return board[0] * math.exp(-elapsed_hours / HOT_DECAY_HOURS)
+
+        assert [decayed(board) for board in by_key] == sorted(
+            (decayed(board) for board in boards),
+            reverse=True,
+        )
+
+    assert ranking_key(None, base, HOT_DECAY_HOURS) == ZERO_SCORE_RANK_KEY
+    assert ranking_key(0.0, base, HOT_DECAY_HOURS) == ZERO_SCORE_RANK_KEY
+    assert ranking_key(1e-9, datetime(1970, 1, 2), HOT_DECAY_HOURS) > ZERO_SCORE_RANK_KEY
@@ -695,12 +695,156 @@ def test_refresh_native_metrics_keeps_last_known_values_when_parsing_is_partial(
     assert refreshed["source_rank"] == 4
 
 
-def test_metric_snapshots_are_indexed_and_pruned_after_retention_window(tmp_path):
+def test_ingest_feed_refreshes_stored_posts_and_returns_body_fetches(
+    monkeypatch, tmp_path
+):
+    from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    monkeypatch.setenv("CONTENT_REFRESH_COOLDOWN_SECONDS", "0")
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    created_at = datetime(2026, 6, 23, 9, tzinfo=timezone.utc)
+    controller.insert_many(
+        "Realtime",
+        [
+            {
+                "site": "theqoo",
+                "category": "hot",
+                "no": no,
+                "title": f"stored {no}",
+                "url": f"https://example.com/post/{no}",
+                "create_time": created_at,
+                "contents": contents,
+                "native_comment_count": 1,
+                "metrics_crawled_at": created_at,
+            }
+            for no, contents in (
+                (
+                    931,
+                    [
+                        {
+                            "type": "text",
+                            "text": "본문에는 요약에 필요한 배경과 맥락이 충분히 포함되어 있습니다.",
+                        }
+                    ],
+                ),
+                (932, []),
+            )
+        ],
+    )
+    entries = [
+        BoardListEntry(
+            url=f"https://example.com/post/{no}",
+            category="hot",
+            no=no,
+            title=f"feed {no}",
+            created_at=created_at,
+            native_comment_count=10 + no - 931,
+            native_like_count=None,
+            native_view_count=300,
+            source_rank=rank,
+            metrics_crawled_at=created_at + timedelta(minutes=5),
+        )
+        for rank, no in enumerate((931, 932, 933), start=1)
+    ]
+
+    result = controller.ingest_feed("theqoo", entries + [entries[2]])
+
+    assert result.existing_entries == entries[:2]
+    assert result.new_entries == [entries[2]]
+    assert result.content_refresh_entries == [entries[1]]
+    assert result.new_entry_ratio == pytest.approx(1 / 3)
+    assert result.metric_change_ratio == 1.0
+    assert result.churn == 1.0
+    stored = controller.find("Realtime", {"site": "theqoo", "category": "hot", "no": 932})
+    assert stored[0]["native_comment_count"] == 11
+    assert stored[0]["source_rank"] == 2
+    assert stored[0]["title"] == "stored 932"
+    assert controller.find("Realtime", {"site": "theqoo", "category": "hot", "no": 933}) == []
+
+
+def test_batched_metric_snapshots_match_per_board_scoring(tmp_path):
+    from sqlalchemy import event
+
+    from crawl_scheduler.community_website.board_list_entry import BoardListEntry
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    created_at = datetime(2026, 6, 23, 9, tzinfo=timezone.utc)
+    numbers = range(941, 946)
+    per_board = PostgresController(database_url=f"sqlite:///{tmp_path / 'single.db'}")
+    batched = PostgresController(database_url=f"sqlite:///{tmp_path / 'batch.db'}")
+    for controller in (per_board, batched):
+        for no in numbers:
+            controller.insert_one(
+                "Realtime",
+                {
+                    "site": "ygosu",
+                    "category": "yeobgi",
+                    "no": no,
+                    "title": f"post {no}",
+                    "url": f"https://example.com/post/{no}",
+                    "create_time": created_at,
+                    "native_comment_count": 1,
+                    "native_like_count": 1,
+                    "metrics_crawled_at": created_at,
+                },
+            )
+
+    statements = []
+    event.listen(
+        get_engine(batched.database_url),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    for step in range(1, 4):
+        entries = [
+            BoardListEntry(
+                url=f"https://example.com/post/{no}",
+                category="yeobgi",
+                no=no,
+                title=f"post {no}",
+                created_at=created_at,
+                native_comment_count=1 + step * (no - 940),
+                native_like_count=1 + step * step,
+                native_view_count=100 * step,
+                source_rank=no - 940,
+                metrics_crawled_at=created_at + timedelta(minutes=7 * step),
+            )
+            for no in numbers
+        ]
+        for entry in entries:
+            per_board.refresh_native_metrics(
+                "Realtime",
+                {"site": "ygosu", "category": "yeobgi", "no": entry.no},
+                entry.metrics_dict(),
+            )
+        batched.ingest_feed("ygosu", entries)
+
+    snapshot_statements = [
+        statement for statement in statements if "board_metric_snapshots" in statement
+    ]
+    assert len(snapshot_statements) == 3
+    assert all(
+        statement.lstrip().upper().startswith("INSERT")
+        for statement in snapshot_statements
+    )
+    for no in numbers:
+        query = {"site": "ygosu", "category": "yeobgi", "no": no}
+        expected = per_board.find("Realtime", query)[0]
+        actual = batched.find("Realtime", query)[0]
+        assert actual["hot_score"] == pytest.approx(expected["hot_score"])
+        assert actual["daily_score"] == pytest.approx(expected["daily_score"])
+        assert actual["score_breakdown"] == pytest.approx(expected["score_breakdown"])
+
+
+def test_metric_snapshots_are_indexed_and_expired_by_maintenance(tmp_path):
     from sqlalchemy import inspect
 
     from crawl_scheduler.db.models import BoardMetricSnapshot
     from crawl_scheduler.db.postgres import get_engine, get_session_factory
     from crawl_scheduler.db.postgres_controller import PostgresController
+    from crawl_scheduler.maintenance import MaintenanceWorker
 
     controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
     now = datetime.now(timezone.utc)
@@ -745,6 +889,17 @@ def test_metric_snapshots_are_indexed_and_pruned_after_retention_window(tmp_path
         and index["column_names"] == ["captured_at"]
         for index in indexes
     )
+    with get_session_factory(controller.database_url)() as session:
+        assert (
+            session.query(BoardMetricSnapshot)
+            .filter_by(board_id=stale_result.inserted_id)
+            .count()
+            == 1
+        )
+
+    worker = MaintenanceWorker(controller.database_url, batch_size=1)
+    assert worker.expire_snapshots(now) == 1
+
     with get_session_factory(controller.database_url)() as session:
         assert (
             session.query(BoardMetricSnapshot)
@@ -849,6 +1004,273 @@ def test_best_lists_apply_decay_after_the_last_score_update(tmp_path):
     assert daily[0]["daily_score"] > daily[1]["daily_score"]
 
 
+def test_best_lists_read_top_n_from_rank_key_indexes(tmp_path):
+    from sqlalchemy import event
+
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    engine = get_engine(controller.database_url)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    controller.get_realtime_best(0, 10)
+    controller.get_daily_best(0, 10)
+    event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as connection:
+        plans = [
+            " ".join(
+                str(row[-1])
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}",
+                    parameters,
+                )
+            )
+            for statement, parameters in statements
+        ]
+
+    assert "ix_boards_hot_rank_key" in plans[0]
+    assert "ix_boards_daily_rank_key" in plans[1]
+    assert all("TEMP B-TREE" not in plan for plan in plans)
+    assert all("exp(" not in statement for statement, _ in statements)
+
+
+def test_cursor_pages_cover_every_board_once_in_ranking_order(tmp_path):
+    from crawl_scheduler.db.models import Board
+    from crawl_scheduler.db.postgres import get_session_factory
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    created_at = datetime(2026, 7, 17, 9, tzinfo=timezone.utc)
+    with get_session_factory(controller.database_url)() as session:
+        session.add_all(
+            [
+                Board(
+                    id=f"board-{index:02d}",
+                    category="humor",
+                    no=index,
+                    site="dcinside",
+                    title=f"board {index}",
+                    url=f"https://example.com/{index}",
+                    created_at=created_at + timedelta(minutes=index % 3),
+                    like_count=index % 2,
+                    hot_score=float(index % 4) or None,
+                    daily_score=float(index % 5),
+                )
+                for index in range(23)
+            ]
+        )
+        session.commit()
+
+    for daily in (False, True):
+        expected = [
+            row["id"]
+            for row in (
+                controller.get_daily_best(0, 50)
+                if daily
+                else controller.get_realtime_best(0, 50)
+            )
+        ]
+        seen = []
+        cursor = None
+        while True:
+            page = controller.list_boards_after(cursor, 5, daily=daily)
+            seen.extend(row["id"] for row in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert seen == expected
+        assert len(set(seen)) == 23
+
+    first_page = controller.list_boards_after(None, 5)
+    with pytest.raises(ValueError):
+        controller.list_boards_after(first_page.next_cursor, 5, daily=True)
+    with pytest.raises(ValueError):
+        controller.list_boards_after("not-a-cursor", 5)
+
+
+def test_summary_listings_and_exists_never_select_heavy_columns(tmp_path):
+    from sqlalchemy import event
+
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    for no in (951, 952, 953):
+        controller.insert_one(
+            "Realtime",
+            {
+                "site": "dcinside",
+                "category": "dcbest",
+                "no": no,
+                "title": f"post {no}",
+                "url": f"https://example.com/post/{no}",
+                "contents": [{"type": "text", "content": "본문 " * 500}],
+                "native_comment_count": no - 950,
+                "native_like_count": no - 950,
+            },
+        )
+
+    statements = []
+    event.listen(
+        get_engine(controller.database_url),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    summaries = controller.get_realtime_best(0, 10, summary=True)
+    page = controller.list_boards_after(None, 2, summary=True)
+    next_page = controller.list_boards_after(page.next_cursor, 2, summary=True)
+    assert controller.exists("Realtime", {"site": "dcinside", "category": "dcbest", "no": 952})
+    assert not controller.exists("Realtime", {"site": "dcinside", "category": "dcbest", "no": 1})
+    assert not controller.exists("GPT", {"site": "dcinside"})
+
+    assert statements
+    assert not any(
+        column in statement
+        for statement in statements
+        for column in ("contents", "score_breakdown", "analysis_", "gpt_answer")
+    )
+    full = controller.get_realtime_best(0, 10)
+    assert [row["id"] for row in summaries] == [row["id"] for row in full]
+    assert [row["id"] for row in page.items + next_page.items] == [
+        row["id"] for row in full
+    ]
+    assert "contents" not in summaries[0]
+    assert summaries[0]["title"] == full[0]["title"]
+    assert summaries[0]["hot_score"] == pytest.approx(full[0]["hot_score"])
+
+
+def test_ranked_pages_are_cached_until_scores_are_written(tmp_path):
+    from sqlalchemy import event
+
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    for no in (961, 962):
+        controller.insert_one(
+            "Realtime",
+            {
+                "site": "dcinside",
+                "category": "dcbest",
+                "no": no,
+                "title": f"post {no}",
+                "url": f"https://example.com/post/{no}",
+                "contents": [{"type": "text", "content": "본문 " * 50}],
+                "native_comment_count": no - 960,
+                "native_like_count": no - 960,
+            },
+        )
+
+    statements = []
+    event.listen(
+        get_engine(controller.database_url),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    first = controller.get_realtime_best(0, 10)
+    queries_after_first = len(statements)
+    second = controller.get_realtime_best(0, 10)
+
+    assert len(statements) == queries_after_first
+    assert [row["id"] for row in second] == [row["id"] for row in first]
+    assert second[0]["hot_score"] <= first[0]["hot_score"]
+    uncached = controller.list_boards_after(None, 10)
+    assert second[1]["hot_score"] == pytest.approx(uncached.items[1]["hot_score"])
+
+    controller.refresh_native_metrics(
+        "Realtime",
+        {"site": "dcinside", "category": "dcbest", "no": 961},
+        {"native_comment_count": 500, "native_like_count": 300},
+    )
+    refreshed = controller.get_realtime_best(0, 10)
+
+    assert len(statements) > queries_after_first
+    assert refreshed[0]["id"] == uncached.items[1]["id"]
+    assert refreshed[0]["native_comment_count"] == 500
+
+
+def test_find_by_tags_requires_every_tag_and_respects_since(tmp_path):
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    from crawl_scheduler.db.models import Board
+    from crawl_scheduler.db.postgres import get_session_factory
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    created_at = datetime(2026, 7, 17, 9, tzinfo=timezone.utc)
+    with get_session_factory(controller.database_url)() as session:
+        session.add_all(
+            [
+                Board(
+                    id="both-old",
+                    category="humor",
+                    no=1,
+                    site="dcinside",
+                    title="old",
+                    url="https://example.com/1",
+                    tags=["게임", "유머"],
+                    hot_score=9.0,
+                    score_updated_at=created_at,
+                    created_at=created_at - timedelta(days=2),
+                ),
+                Board(
+                    id="both-new",
+                    category="humor",
+                    no=2,
+                    site="dcinside",
+                    title="new",
+                    url="https://example.com/2",
+                    tags=["유머", "게임", "축구"],
+                    hot_score=3.0,
+                    score_updated_at=created_at,
+                    created_at=created_at,
+                ),
+                Board(
+                    id="game-only",
+                    category="humor",
+                    no=3,
+                    site="dcinside",
+                    title="game",
+                    url="https://example.com/3",
+                    tags=["게임"],
+                    hot_score=5.0,
+                    score_updated_at=created_at,
+                    created_at=created_at,
+                ),
+            ]
+        )
+        session.commit()
+
+    assert [row["id"] for row in controller.find_by_tags("게임")] == [
+        "both-old",
+        "game-only",
+        "both-new",
+    ]
+    assert [row["id"] for row in controller.find_by_tags(["게임", "유머"])] == [
+        "both-old",
+        "both-new",
+    ]
+    assert [
+        row["id"]
+        for row in controller.find_by_tags(["게임", "유머"], since=created_at)
+    ] == ["both-new"]
+    assert controller.find_by_tags(["게임"], limit=1)[0]["tags"] == ["게임", "유머"]
+    assert controller.find_by_tags([]) == []
+
+    tags_index = next(index for index in Board.__table__.indexes if index.name == "ix_boards_tags")
+    assert str(CreateIndex(tags_index).compile(dialect=postgresql.dialect())) == (
+        "CREATE INDEX ix_boards_tags ON boards USING gin (tags jsonb_path_ops)"
+    )
+
+
 def test_daily_top10_snapshot_uses_seoul_date_and_rank_order(tmp_path):
     from sqlalchemy import inspect
 
@@ -990,3 +1412,68 @@ def test_daily_top10_snapshot_replaces_only_the_same_seoul_date(tmp_path, monkey
     assert snapshots[0].captured_at == second_capture.replace(tzinfo=None)
     assert snapshots[1].snapshot_date.isoformat() == "2026-07-21"
     assert snapshots[1].board_id == "second"
+
+
+def _video_document(no):
+    return {
+        "site": "ygosu",
+        "category": "humor",
+        "no": no,
+        "title": "영상 글",
+        "url": f"https://example.com/post/{no}",
+        "contents": [
+            {"type": "video", "source_url": f"https://example.com/{no}.mp4"},
+        ],
+    }
+
+
+def test_deferred_media_path_survives_a_failed_batch_insert(monkeypatch, tmp_path):
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    query = {"site": "ygosu", "category": "humor", "no": 901}
+    assert controller.attach_media_path(
+        "Realtime",
+        query,
+        "https://example.com/901.mp4",
+        "Ygosu/humor/901/clip.mp4",
+    ) == 0
+
+    record_metric_snapshots = controller._record_metric_snapshots
+
+    def fail_batch(session, board_documents):
+        if len(board_documents) > 1:
+            raise ValueError("batch rejected")
+        record_metric_snapshots(session, board_documents)
+
+    monkeypatch.setattr(controller, "_record_metric_snapshots", fail_batch)
+    with pytest.raises(ValueError):
+        controller.insert_many("Realtime", [_video_document(901), _video_document(902)])
+    controller.insert_one("Realtime", _video_document(901))
+
+    stored = controller.find("Realtime", query)[0]
+    assert stored["contents"][0]["media_path"] == "Ygosu/humor/901/clip.mp4"
+
+
+def test_media_path_registered_during_an_open_upsert_is_applied(monkeypatch, tmp_path):
+    from crawl_scheduler.db.pending_media import get_pending_media_paths
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    controller = PostgresController(database_url=f"sqlite:///{tmp_path / 'crawler.db'}")
+    record_metric_snapshots = controller._record_metric_snapshots
+
+    def download_finishes_before_commit(session, board_documents):
+        # The attach SELECT cannot see this uncommitted insert yet.
+        get_pending_media_paths().add(
+            "ygosu:humor:903",
+            "https://example.com/903.mp4",
+            "Ygosu/humor/903/clip.mp4",
+        )
+        record_metric_snapshots(session, board_documents)
+
+    monkeypatch.setattr(controller, "_record_metric_snapshots", download_finishes_before_commit)
+    controller.insert_one("Realtime", _video_document(903))
+
+    stored = controller.find("Realtime", {"site": "ygosu", "category": "humor", "no": 903})[0]
+    assert stored["contents"][0]["media_path"] == "Ygosu/humor/903/clip.mp4"
+    assert get_pending_media_paths().peek("ygosu:humor:903") == {}
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+def test_ranking_cache_expires_evicts_and_drops_stale_generations(monkeypatch):
+    from crawl_scheduler.db import ranking_cache
+    from crawl_scheduler.db.ranking_cache import RankingCache
+
+    clock = [100.0]
+    monkeypatch.setattr(ranking_cache.time, "monotonic", lambda: clock[0])
+    cache = RankingCache(ttl_seconds=30, max_pages=2)
+
+    cache.put("a", cache.generation, ["page a"])
+    cache.put("b", cache.generation, ["page b"])
+    assert cache.get("a") == ["page a"]
+    cache.put("c", cache.generation, ["page c"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["page a"]
+
+    clock[0] += 30
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("raced", generation, ["read before the write"])
+    assert cache.get("raced") is None
+    assert len(cache) == 0
+
+    disabled = RankingCache(ttl_seconds=0)
+    disabled.put("a", disabled.generation, ["page a"])
+    assert disabled.get("a") is None
@@ -0,0 +1,252 @@
+from datetime import datetime, timezone
+import sys
+from pathlib import Path
+
+from sqlalchemy import event, inspect, text
+
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_ROOT))
+
+
+def test_migrate_records_version_and_controller_construction_runs_no_ddl(tmp_path):
+    from crawl_scheduler.db import migrations
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.db.postgres_controller import PostgresController
+
+    database_url = f"sqlite:///{tmp_path / 'crawler.db'}"
+
+    assert migrations.migrate(database_url) == migrations.SCHEMA_VERSION
+    assert migrations.migrate(database_url) == migrations.SCHEMA_VERSION
+
+    engine = get_engine(database_url)
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT version, name FROM schema_migrations ORDER BY version")
+        ).all()
+    assert [tuple(row) for row in rows] == [
+        (migration.version, migration.name) for migration in migrations.MIGRATIONS
+    ]
+
+    PostgresController(database_url=database_url)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    PostgresController(database_url=database_url)
+    PostgresController(database_url=database_url)
+
+    assert statements == []
+
+
+def test_baseline_migration_upgrades_legacy_boards_table(tmp_path):
+    from crawl_scheduler.db import migrations
+    from crawl_scheduler.db.postgres import get_engine
+
+    database_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE boards ("
+                "id VARCHAR(36) PRIMARY KEY, source_id VARCHAR(255), "
+                "category VARCHAR(100) NOT NULL, no BIGINT NOT NULL, "
+                "site VARCHAR(100) NOT NULL, title VARCHAR(500) NOT NULL, "
+                "url VARCHAR(2048) NOT NULL, contents JSON, gpt_answer VARCHAR, "
+                "thumbnail VARCHAR(2048), comment_count INTEGER NOT NULL, "
+                "like_count INTEGER NOT NULL, created_at TIMESTAMP NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO boards VALUES ('board-1', 'dcinside:1', 'Realtime', 1, "
+                "'dcinside', 'title', 'https://example.com/1', NULL, 'old summary', "
+                "NULL, 0, 0, '2026-07-17 00:00:00')"
+            )
+        )
+
+    assert migrations.migrate(database_url) == migrations.SCHEMA_VERSION
+
+    inspector = inspect(engine)
+    board_columns = {column["name"] for column in inspector.get_columns("boards")}
+    snapshot_indexes = {
+        index["name"] for index in inspector.get_indexes("board_metric_snapshots")
+    }
+    with engine.connect() as connection:
+        status = connection.execute(
+            text("SELECT analysis_status FROM boards WHERE id = 'board-1'")
+        ).scalar_one()
+
+    assert {"llm_engagement_score", "hot_score", "score_breakdown"} <= board_columns
+    assert "ix_board_metric_snapshots_board_captured_at" in snapshot_indexes
+    assert status == "pending"
+
+
+def test_rank_key_migration_backfills_scored_boards(tmp_path):
+    from crawl_scheduler.db import migrations
+    from crawl_scheduler.db.postgres import get_engine
+    from crawl_scheduler.popularity import (
+        DAILY_DECAY_HOURS,
+        HOT_DECAY_HOURS,
+        ZERO_SCORE_RANK_KEY,
+        ranking_key,
+    )
+
+    database_url = f"sqlite:///{tmp_path / 'ranked.db'}"
+    migrations.migrate(database_url)
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO boards (id, category, no, site, title, url, "
+                "comment_count, like_count, analysis_status, analysis_priority, "
+                "analysis_retry_count, hot_score, daily_score, score_updated_at, "
+                "created_at) VALUES "
+                "('scored', 'humor', 1, 'dcinside', 'scored', 'https://example.com/1', "
+                "0, 0, 'pending', 0, 0, 4.0, 9.0, '2026-07-17 03:00:00', "
+                "'2026-07-17 00:00:00'), "
+                "('unscored', 'humor', 2, 'dcinside', 'unscored', "
+                "'https://example.com/2', 0, 0, 'pending', 0, 0, NULL, NULL, NULL, "
+                "'2026-07-17 00:00:00')"
+            )
+        )
+        connection.execute(text("DELETE FROM schema_migrations WHERE version >= 3"))
+
+    assert migrations.migrate(database_url) == migrations.SCHEMA_VERSION
+
+    with engine.connect() as connection:
+        rows = {
+            row.id: (row.hot_rank_key, row.daily_rank_key)
+            for row in connection.execute(
+                text("SELECT id, hot_rank_key, daily_rank_key FROM boards")
+            )
+        }
+    updated_at = datetime(2026, 7, 17, 3, tzinfo=timezone.utc)
+    assert rows["scored"] == (
+        ranking_key(4.0, updated_at, HOT_DECAY_HOURS),
+        ranking_key(9.0, updated_at, DAILY_DECAY_HOURS),
+    )
+    assert rows["unscored"] == (ZERO_SCORE_RANK_KEY, ZERO_SCORE_RANK_KEY)
+
+
+def test_snapshot_partitions_expire_whole_days_and_skip_sqlite(tmp_path):
+    from datetime import date
+
+    from crawl_scheduler.db import migrations, snapshot_partitions
+    from crawl_scheduler.db.postgres import get_engine
+
+    now = datetime(2026, 5, 10, 6, 30, tzinfo=timezone.utc)
+    cutoff = snapshot_partitions.retention_cutoff(now, retention_days=7)
+    names = [
+        snapshot_partitions.partition_name(date(2026, 5, day))
+        for day in (1, 2, 3, 4)
+    ] + [snapshot_partitions.DEFAULT_PARTITION]
+
+    assert names[0] == "board_metric_snapshots_p20260501"
+    assert snapshot_partitions.expired_partitions(names, cutoff) == [
+        "board_metric_snapshots_p20260501",
+        "board_metric_snapshots_p20260502",
+    ]
+
+    database_url = f"sqlite:///{tmp_path / 'crawler.db'}"
+    migrations.migrate(database_url)
+    result = snapshot_partitions.maintain_snapshot_partitions(database_url, now=now)
+
+    assert result == snapshot_partitions.PartitionMaintenanceResult(
+        created=[],
+        dropped=[],
+    )
+    assert inspect(get_engine(database_url)).has_table("board_metric_snapshots")
+
+
+def test_late_partition_takes_over_rows_stranded_in_the_default_partition():
+    from datetime import date
+    from types import SimpleNamespace
+
+    from crawl_scheduler.db import snapshot_partitions
+
+    class RecordingConnection:
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement, parameters=None):
+            sql = " ".join(str(statement).split())
+            self.statements.append(sql)
+            if "pg_inherits" in sql:
+                return SimpleNamespace(
+                    scalars=lambda: [snapshot_partitions.DEFAULT_PARTITION]
+                )
+            return SimpleNamespace(first=lambda: (1,), rowcount=4)
+
+    connection = RecordingConnection()
+
+    created = snapshot_partitions.create_partitions(connection, [date(2026, 5, 10)])
+
+    assert created == ["board_metric_snapshots_p20260510"]
+    expected_prefixes = [
+        "ALTER TABLE board_metric_snapshots DETACH PARTITION "
+        "board_metric_snapshots_default",
+        "CREATE TABLE IF NOT EXISTS board_metric_snapshots_p20260510 PARTITION OF",
+        "INSERT INTO board_metric_snapshots_p20260510",
+        "DELETE FROM board_metric_snapshots_default",
+        "ALTER TABLE board_metric_snapshots ATTACH PARTITION "
+        "board_metric_snapshots_default DEFAULT",
+    ]
+    moves = connection.statements[2:]
+    assert len(moves) == len(expected_prefixes)
+    assert all(sql.startswith(prefix) for sql, prefix in zip(moves, expected_prefixes))
+
+
+def test_rolling_metric_state_migration_backfills_two_latest_snapshots(tmp_path):
+    from crawl_scheduler.db import migrations
+    from crawl_scheduler.db.postgres import get_engine
+
+    database_url = f"sqlite:///{tmp_path / 'rolling.db'}"
+    migrations.migrate(database_url)
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO boards (id, category, no, site, title, url, "
+                "comment_count, like_count, analysis_status, analysis_priority, "
+                "analysis_retry_count, created_at) VALUES "
+                "('tracked', 'humor', 1, 'dcinside', 'tracked', "
+                "'https://example.com/1', 0, 0, 'pending', 0, 0, "
+                "'2026-07-17 00:00:00'), "
+                "('single', 'humor', 2, 'dcinside', 'single', "
+                "'https://example.com/2', 0, 0, 'pending', 0, 0, "
+                "'2026-07-17 00:00:00')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO board_metric_snapshots (id, board_id, captured_at, "
+                "comment_count, like_count, view_count, crawl_status) VALUES "
+                "('s1', 'tracked', '2026-07-17 01:00:00', 1, 1, 10, 'success'), "
+                "('s2', 'tracked', '2026-07-17 02:00:00', 4, 2, 20, 'success'), "
+                "('s3', 'tracked', '2026-07-17 03:00:00', 9, 5, NULL, 'success'), "
+                "('s4', 'single', '2026-07-17 01:30:00', 2, 3, 7, 'success')"
+            )
+        )
+        connection.execute(text("UPDATE boards SET last_snapshot_at = NULL"))
+        connection.execute(text("DELETE FROM schema_migrations WHERE version >= 7"))
+
+    assert migrations.migrate(database_url) == migrations.SCHEMA_VERSION
+
+    with engine.connect() as connection:
+        rows = {
+            row.id: tuple(row)[1:]
+            for row in connection.execute(
+                text(
+                    "SELECT id, last_snapshot_comment_count, last_snapshot_like_count, "
+                    "last_snapshot_view_count, prior_snapshot_comment_count, "
+                    "prior_snapshot_like_count, prior_snapshot_view_count "
+                    "FROM boards"
+                )
+            )
+        }
+    assert rows["tracked"] == (9, 5, None, 4, 2, 20)
+    assert rows["single"] == (2, 3, 7, None, None, None)